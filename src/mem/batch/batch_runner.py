@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from mem.messages.messages_manager import Messages
+from mem.messages.prompt_builder import PromptBuilder
+from mem.utils import tracing
+from mem.utils.builders import (
+    build_proxy_request,
+    build_request_manager,
+    build_tools_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+ORDERED = "ordered"
+AS_COMPLETED = "as-completed"
+
+
+def read_prompts(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lazily reads the prompts of a JSONL file as (index, item) pairs. A line is either a JSON string
+    or an object with "content" and optionally "id", "system" (a system prompt for this item) and
+    "messages" (earlier turns as {"role", "content"} objects). Blank lines are skipped; a line
+    that isn't valid JSON still gets its index, as an item carrying the parse error.
+    """
+    with open(path, "r") as f:
+        index = 0
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                item = {"_error": f"Invalid JSON on line {number}: {e}"}
+            if not isinstance(item, dict):
+                item = {"content": str(item)}
+            yield index, item
+            index += 1
+
+
+def load_checkpoint(path: str) -> Set[int]:
+    """
+    Reads an earlier run's output and returns the indexes that completed without an error.
+    The output is rewritten to hold only those results, which drops failed results (they are
+    run again) and a torn final line from a crash.
+    """
+    done: Dict[int, str] = {}
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                logger.warning("Ignoring torn result at the end of %s", path)
+                break
+            if not isinstance(result, dict) or not isinstance(result.get("index"), int):
+                logger.warning("Ignoring result without an index in %s", path)
+                continue
+            if result.get("error") is None:
+                done[result["index"]] = line if line.endswith("\n") else line + "\n"
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        f.writelines(done.values())
+    os.replace(temp_path, path)
+    return set(done)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        A token bucket spacing out request starts.
+        Args:
+            rate: Requests per second; 0 or less disables the limit.
+            burst: Requests that may start back to back after an idle period.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        config_manager,
+        chat_config,
+        concurrency: int = 8,
+        rate: float = 0.0,
+        order: str = ORDERED,
+    ):
+        """
+        Runs scripted prompts through RequestManager, each as a fresh single-turn conversation, with
+        up to `concurrency` turns in flight. The ToolsManager and the pooled LLM client are shared,
+        so throughput grows with concurrency until the provider or the rate limit caps it.
+        Args:
+            config_manager: Supplies the config sections the components are built from.
+            chat_config: The chat settings every prompt is answered with.
+            concurrency: Turns in flight at once.
+            rate: Optional. Turns started per second at most; 0 leaves it unlimited.
+            order: ORDERED writes results in input order; AS_COMPLETED writes each as it finishes.
+        """
+        self.config_manager = config_manager
+        self.chat_config = dict(chat_config)
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate)
+        self.order = order
+        self.prompt_builder = PromptBuilder(
+            config_manager.get_value_from_config("prompts")
+        )
+        self.tools_manager = build_tools_manager(config_manager)
+        self.proxy_request = build_proxy_request(config_manager, self.tools_manager)
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    async def _answer(self, index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        result = {
+            "index": index,
+            "id": item.get("id", index),
+            "response": None,
+            "error": None,
+        }
+        messages = Messages()
+        started = time.perf_counter()
+        try:
+            # A malformed item becomes an error result instead of ending the run.
+            if "_error" in item:
+                raise ValueError(item["_error"])
+            messages.add_system_message(
+                item.get("system") or self.prompt_builder.system_prompt(self.chat_config)
+            )
+            for earlier in item.get("messages", []):
+                messages.add_message(earlier["role"], earlier["content"])
+            request_manager = build_request_manager(
+                self.config_manager,
+                messages,
+                self.tools_manager,
+                self.proxy_request,
+                prompt_builder=self.prompt_builder,
+            )
+            await self.rate_limiter.acquire()
+            started = time.perf_counter()
+            with tracing.span("batch.prompt", id=str(result["id"])):
+                result["response"] = await request_manager.make_request(
+                    self.chat_config, item["content"]
+                )
+        except Exception as e:
+            logger.error("Prompt %s failed: %s", result["id"], e)
+            result["error"] = str(e) or type(e).__name__
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        result["tool_calls"] = sum(
+            len(message.tool_calls or []) for message in messages.messages
+        )
+        return result
+
+    async def run(
+        self, input_path: str, output_path: str, resume: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Answers every prompt in input_path and appends one JSON result per line to output_path,
+        flushed as it is written.
+        Args:
+            input_path: The prompts, as read by read_prompts.
+            output_path: The results file.
+            resume: Skip prompts that already have a successful result in output_path; failed
+                    ones are run again. Without it the output is overwritten.
+        Returns:
+            Counts of completed, failed and skipped prompts and the elapsed time.
+        """
+        done = load_checkpoint(output_path) if resume else set()
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        # In ordered mode a slow prompt holds back the results after it; the window bounds
+        # how many can pile up before reading more input waits.
+        window = asyncio.Semaphore(self.concurrency * 4)
+        held: Dict[int, Dict[str, Any]] = {}
+        pending = deque()
+        started = time.perf_counter()
+
+        with open(output_path, "a" if resume else "w") as output:
+
+            def write(result):
+                output.write(json.dumps(result, default=str) + "\n")
+                output.flush()
+                if result["error"] is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+            def collect(result):
+                if self.order == AS_COMPLETED:
+                    write(result)
+                    window.release()
+                    return
+                held[result["index"]] = result
+                while pending and pending[0] in held:
+                    write(held.pop(pending.popleft()))
+                    window.release()
+
+            async def produce():
+                for index, item in read_prompts(input_path):
+                    if index in done:
+                        self.skipped += 1
+                        continue
+                    await window.acquire()
+                    pending.append(index)
+                    await queue.put((index, item))
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+            async def work():
+                while True:
+                    job = await queue.get()
+                    if job is None:
+                        return
+                    collect(await self._answer(*job))
+
+            try:
+                await asyncio.gather(
+                    produce(), *(work() for _ in range(self.concurrency))
+                )
+            finally:
+                await self.tools_manager.aclose()
+                await self.proxy_request.aclose()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_s": elapsed,
+            "throughput_per_s": (
+                (self.completed + self.failed) / elapsed if elapsed else 0.0
+            ),
+        }
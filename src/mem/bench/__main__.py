@@ -0,0 +1,88 @@
+import click
+
+from mem.bench.suite import BENCHMARKS, compare, load_results, run, save_results
+
+
+@click.group(help="Offline performance benchmarks against a local stub server.")
+def bench():
+    pass
+
+
+@bench.command(name="run", help="Runs the benchmarks and writes the results as JSON.")
+@click.option("-o", "--output", default="bench-results.json", help="Results file.")
+@click.option("-n", "--iterations", default=50, help="Samples per benchmark.")
+@click.option(
+    "--only",
+    multiple=True,
+    type=click.Choice(sorted(BENCHMARKS)),
+    help="Run only this benchmark; repeatable.",
+)
+@click.option("--latency", default=0.0, help="Seconds the stub waits per response.")
+@click.option(
+    "--tokens-per-second", default=0.0, help="The stub's streaming rate; 0 is instant."
+)
+def run_command(output, iterations, only, latency, tokens_per_second):
+    from mem.utils.rich_setup import Table, console
+
+    document = run(
+        iterations=iterations,
+        only=list(only) or None,
+        latency=latency,
+        tokens_per_second=tokens_per_second,
+    )
+    save_results(output, document)
+    table = Table(title=f"Benchmarks ({iterations} iterations, ms)")
+    table.add_column("measurement")
+    for column in ("count", "mean", "p50", "p95", "p99"):
+        table.add_column(column, justify="right")
+    for name, summary in document["results"].items():
+        table.add_row(
+            name,
+            str(summary["count"]),
+            *(f"{summary[key]:.3f}" for key in ("mean", "p50", "p95", "p99")),
+        )
+    console.print(table)
+    console.print(f"Results written to {output}")
+
+
+@bench.command(name="compare", help="Flags regressions between two results files.")
+@click.argument("baseline", type=click.Path(exists=True))
+@click.argument("current", type=click.Path(exists=True))
+@click.option("--metric", default="p50", help="Summary field to compare, e.g. p95.")
+@click.option(
+    "--threshold", default=0.10, help="Relative growth that counts as a regression."
+)
+@click.option(
+    "--min-delta-ms", default=0.05, help="Ignore changes smaller than this many ms."
+)
+def compare_command(baseline, current, metric, threshold, min_delta_ms):
+    from mem.utils.rich_setup import Table, console
+
+    rows = compare(
+        load_results(baseline),
+        load_results(current),
+        metric=metric,
+        threshold=threshold,
+        min_delta_ms=min_delta_ms,
+    )
+    table = Table(title=f"{metric} ms: {baseline} -> {current}")
+    table.add_column("measurement")
+    for column in ("baseline", "current", "change", ""):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            row["name"],
+            f"{row['baseline']:.3f}",
+            f"{row['current']:.3f}",
+            f"{row['change']:+.1%}",
+            "REGRESSED" if row["regressed"] else "",
+        )
+    console.print(table)
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        console.print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    bench()
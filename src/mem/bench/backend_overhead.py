@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import click
+from aiohttp import ClientSession, web
+
+from mem.bench.stats import summarize
+from mem.bench.stub_server import StubServer
+from mem.llms.backends import Backends
+from mem.llms.request import ProxyRequest
+
+
+class _StubConfig:
+    """Just enough of ConfigManager for DirectBackend to route the `stub` service."""
+
+    def __init__(self, base_url):
+        self.settings = {
+            "base_url": base_url,
+            "default_model": "stub",
+            "aliases": {"stub": "openai/stub-model"},
+        }
+
+    def get_llm_settings(self, llm_name):
+        return self.settings if llm_name == "stub" else None
+
+    def get_aliases_for_models(self, llm_name):
+        return self.settings["aliases"] if llm_name == "stub" else None
+
+
+class ForwardingProxy:
+    def __init__(self, upstream: str, host: str = "127.0.0.1"):
+        """
+        Relays chat completion requests to the upstream unchanged. Stands in for the LiteLLM
+        proxy's extra hop when no real proxy is given.
+        """
+        self.upstream = upstream
+        self.host = host
+        self.port = 0
+        self._runner = None
+        self._session = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._session = ClientSession()
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._forward)
+        app.router.add_post("/chat/completions", self._forward)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._session.close()
+        await self._runner.cleanup()
+
+    async def _forward(self, request):
+        body = await request.read()
+        async with self._session.post(
+            f"{self.upstream}/chat/completions",
+            data=body,
+            headers={"Content-Type": "application/json"},
+        ) as upstream:
+            response = web.StreamResponse(
+                status=upstream.status,
+                headers={"Content-Type": upstream.headers.get("Content-Type", "")},
+            )
+            await response.prepare(request)
+            async for data in upstream.content.iter_any():
+                await response.write(data)
+            await response.write_eof()
+            return response
+
+
+async def _time_requests(proxy_request, chat_config, requests: int) -> List[float]:
+    messages = [{"role": "user", "content": "Hello"}]
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await proxy_request.llm_request(chat_config, messages, use_tools=False)
+        if response is None:
+            raise RuntimeError("Request failed; see the log for details")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def run_benchmark(
+    requests: int, warmup: int, latency: float, proxy_url: Optional[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Times the same request through the direct and proxy backends against a local stub server.
+    Args:
+        requests: Timed requests per backend.
+        warmup: Untimed requests per backend, so connection setup is not measured.
+        latency: Seconds the stub waits before replying.
+        proxy_url: Optional. A running LiteLLM proxy routed to the stub; a forwarding proxy is used otherwise.
+    Returns:
+        Mean, p50 and p95 milliseconds per backend.
+    """
+    stub = StubServer(latency=latency)
+    await stub.start()
+    forwarder = None
+    if proxy_url is None:
+        forwarder = ForwardingProxy(stub.base_url)
+        await forwarder.start()
+        proxy_url = forwarder.base_url
+
+    backends = Backends(_StubConfig(stub.base_url), proxy_url=proxy_url)
+    proxy_request = ProxyRequest(backends=backends)
+    results = {}
+    try:
+        for mode in ("direct", "proxy"):
+            chat_config = {"api_service": "stub", "model": "stub", "backend": mode}
+            await _time_requests(proxy_request, chat_config, warmup)
+            timings = await _time_requests(proxy_request, chat_config, requests)
+            results[mode] = summarize(timings)
+    finally:
+        await proxy_request.aclose()
+        if forwarder is not None:
+            await forwarder.stop()
+        await stub.stop()
+    return results
+
+
+@click.command()
+@click.option("-n", "--requests", default=200, help="Timed requests per backend.")
+@click.option("--warmup", default=10, help="Untimed requests per backend.")
+@click.option("--latency", default=0.0, help="Seconds the stub waits before replying.")
+@click.option(
+    "--proxy-url",
+    default=None,
+    help="A running LiteLLM proxy that routes the `stub` model to the stub server.",
+)
+def main(requests, warmup, latency, proxy_url):
+    """Compares the per-request overhead of the direct and proxy backends."""
+    from mem.utils.rich_setup import Table, console
+
+    results = asyncio.run(run_benchmark(requests, warmup, latency, proxy_url))
+    table = Table(title=f"Backend overhead ({requests} requests)")
+    table.add_column("backend")
+    for column in ("mean ms", "p50 ms", "p95 ms"):
+        table.add_column(column, justify="right")
+    for mode, summary in results.items():
+        table.add_row(
+            mode, *(f"{summary[key]:.2f}" for key in ("mean", "p50", "p95"))
+        )
+    console.print(table)
+    saved = results["proxy"]["mean"] - results["direct"]["mean"]
+    console.print(f"Direct mode saves {saved:.2f} ms per request on average.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import os
+import random
+import resource
+import time
+from typing import Any, Dict, List, Optional
+
+from mem.bench.stats import summarize
+from mem.bench.stub_server import StubServer
+from mem.bench.suite import (
+    CHAT_CONFIG,
+    ECHO_SCRIPT,
+    build_session,
+    build_tools_manager,
+)
+from mem.llms.backends import Backends
+
+DEFAULT_TURNS = [
+    "Hi, how are you today?",
+    "Can you tell me a bit about the weather where I am?",
+    "What should I cook for dinner tonight?",
+    "Summarize what we talked about so far.",
+]
+
+
+def load_turns(path: Optional[str]) -> List[str]:
+    """
+    Reads the scripted user turns from a JSON list, or a JSONL file, of strings or
+    {"content": ...} objects.
+    """
+    if not path:
+        return list(DEFAULT_TURNS)
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        items = json.loads(text)
+    except ValueError:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [item["content"] if isinstance(item, dict) else str(item) for item in items]
+
+
+def rss_bytes() -> int:
+    """The process's resident set size, or its peak where the current value isn't available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS; either way it's a peak.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01):
+        """
+        Measures how late the event loop wakes a sleeping task, which is how long every other
+        coroutine had to wait for the loop.
+        Args:
+            interval: Seconds between probes.
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadTest:
+    def __init__(
+        self,
+        sessions: int,
+        turns_per_session: int,
+        turns: List[str],
+        rate: float = 0.0,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+        tools: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """
+        Replays scripted turns through independent Messages/RequestManager sessions in one event
+        loop. The sessions share a ToolsManager and a pooled client, as they would in a server.
+        Args:
+            sessions: Number of concurrent conversations.
+            turns_per_session: Turns each conversation sends; the script is cycled.
+            turns: The scripted user messages.
+            rate: Target arrivals per second across all sessions, spaced as a Poisson process.
+                  0 runs closed-loop: each session sends its next turn as soon as the last one ends.
+            base_url: The OpenAI-compatible endpoint to load.
+            model: Optional. The model name sent to the endpoint.
+            stream: Use streaming requests.
+            tools: Offer the local `echo` tool (the stub plays a call to it every turn).
+            seed: Optional. Seed for the arrival schedule.
+        """
+        self.sessions = sessions
+        self.turns_per_session = turns_per_session
+        self.turns = turns
+        self.rate = rate
+        self.base_url = base_url
+        self.chat_config = dict(CHAT_CONFIG, model=model or CHAT_CONFIG["model"])
+        self.stream = stream
+        self.tools = tools
+        self.random = random.Random(seed)
+        self.latencies: List[float] = []
+        self.service_times: List[float] = []
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    async def _turn(self, request_manager, user_input: str, arrived: float):
+        started = time.perf_counter()
+        try:
+            if self.stream:
+                async for _ in request_manager.stream_request(
+                    self.chat_config, user_input
+                ):
+                    pass
+            else:
+                await request_manager.make_request(self.chat_config, user_input)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return
+        finished = time.perf_counter()
+        self.latencies.append(finished - arrived)
+        self.service_times.append(finished - started)
+
+    async def _closed_loop(self, request_manager):
+        for i in range(self.turns_per_session):
+            await self._turn(
+                request_manager, self.turns[i % len(self.turns)], time.perf_counter()
+            )
+
+    async def _session_worker(self, request_manager, inbox: asyncio.Queue):
+        for _ in range(self.turns_per_session):
+            user_input, arrived = await inbox.get()
+            await self._turn(request_manager, user_input, arrived)
+
+    async def _dispatch(self, inboxes: List[asyncio.Queue]):
+        """Spreads arrivals over the sessions round-robin at the target rate."""
+        next_arrival = time.perf_counter()
+        for i in range(self.turns_per_session):
+            for inbox in inboxes:
+                next_arrival += self.random.expovariate(self.rate)
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                inbox.put_nowait((self.turns[i % len(self.turns)], next_arrival))
+
+    async def run(self) -> Dict[str, Any]:
+        tools_manager = build_tools_manager(with_echo=self.tools)
+        backends = Backends(proxy_url=self.base_url)
+        monitor = LoopLagMonitor()
+        # One untimed turn first, so lazy imports and client setup don't count as
+        # per-session memory or as loop lag.
+        warmup = build_session(self.base_url, tools_manager, backends)[1]
+        await self._turn(warmup, self.turns[0], time.perf_counter())
+        self.latencies.clear()
+        self.service_times.clear()
+        self.errors = 0
+        self.last_error = None
+        rss_before = rss_bytes()
+        sessions = [
+            build_session(self.base_url, tools_manager, backends)[1]
+            for _ in range(self.sessions)
+        ]
+        monitor.start()
+        started = time.perf_counter()
+        try:
+            if self.rate > 0:
+                inboxes = [asyncio.Queue() for _ in sessions]
+                await asyncio.gather(
+                    self._dispatch(inboxes),
+                    *(
+                        self._session_worker(session, inbox)
+                        for session, inbox in zip(sessions, inboxes)
+                    ),
+                )
+            else:
+                await asyncio.gather(
+                    *(self._closed_loop(session) for session in sessions)
+                )
+            elapsed = time.perf_counter() - started
+            rss_after = rss_bytes()
+        finally:
+            await monitor.stop()
+            await backends.aclose()
+            await tools_manager.aclose()
+
+        completed = len(self.latencies)
+        return {
+            "sessions": self.sessions,
+            "turns": completed,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "elapsed_s": elapsed,
+            "throughput_turns_per_s": completed / elapsed if elapsed else 0.0,
+            "target_rate": self.rate,
+            "turn_latency_ms": summarize(self.latencies),
+            "service_time_ms": summarize(self.service_times),
+            "loop_lag_ms": summarize(monitor.samples),
+            "memory_per_session_kb": (rss_after - rss_before) / 1024 / self.sessions,
+        }
+
+
+async def run_loadtest(
+    sessions: int,
+    turns_per_session: int,
+    rate: float = 0.0,
+    base_url: Optional[str] = None,
+    model: Optional[str] = None,
+    script: Optional[str] = None,
+    stream: bool = False,
+    tools: bool = False,
+    latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs a load test against base_url, or against a local stub server started for the run
+    (with the given latency and streaming rate) when no base_url is given.
+    """
+    stub = None
+    if base_url is None:
+        stub = StubServer(
+            latency=latency,
+            tokens_per_second=tokens_per_second,
+            tool_script=ECHO_SCRIPT if tools else None,
+        )
+        await stub.start()
+        base_url = stub.base_url
+    try:
+        return await LoadTest(
+            sessions,
+            turns_per_session,
+            load_turns(script),
+            rate=rate,
+            base_url=base_url,
+            model=model,
+            stream=stream,
+            tools=tools,
+            seed=seed,
+        ).run()
+    finally:
+        if stub is not None:
+            await stub.stop()
@@ -0,0 +1,31 @@
+import math
+import statistics
+from typing import Dict, List
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """
+    Summarizes timings in seconds as milliseconds (or whatever scale is given).
+    Returns:
+        count, mean, min, max and the p50/p90/p95/p99 percentiles.
+    """
+    ordered = sorted(sample * scale for sample in samples)
+    summary = {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered) if ordered else 0.0,
+        "min": ordered[0] if ordered else 0.0,
+        "max": ordered[-1] if ordered else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(ordered, pct)
+    return summary
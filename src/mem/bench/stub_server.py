@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class StubServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        reply: str = "This is a canned reply from the stub server.",
+        tool_script: Optional[List[List[Dict[str, Any]]]] = None,
+    ):
+        """
+        A local OpenAI-compatible chat completions endpoint with deterministic replies, so request
+        overhead can be measured without a network or a model.
+        Args:
+            host: The interface to listen on.
+            port: The port to listen on; 0 picks a free one.
+            latency: Seconds to wait before the first byte of every response.
+            tokens_per_second: Streaming rate of the reply, one word per token; 0 sends it at once.
+            reply: The assistant text returned for every request.
+            tool_script: Optional. Tool call rounds played at the start of every turn, e.g.
+                         [[{"name": "echo", "arguments": {"text": "hi"}}]] calls `echo` once
+                         before replying. Which round is due is read from the request's own
+                         messages, so concurrent conversations don't interfere.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.tool_script = tool_script or []
+        self.requests = 0
+        self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        app.router.add_post("/chat/completions", self._chat_completions)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info("Stub server listening on %s", self.base_url)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _tokens(self):
+        words = self.reply.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _due_tool_calls(self, body) -> Optional[List[Dict[str, Any]]]:
+        """Returns the scripted tool calls for this request, or None when it's time to reply."""
+        if not body.get("tools"):
+            return None
+        rounds = 0
+        for message in reversed(body.get("messages", [])):
+            if message.get("role") == "user":
+                break
+            if message.get("role") == "assistant" and message.get("tool_calls"):
+                rounds += 1
+        if rounds >= len(self.tool_script):
+            return None
+        return [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {
+                    "name": call["name"],
+                    "arguments": json.dumps(call.get("arguments", {})),
+                },
+            }
+            for call in self.tool_script[rounds]
+        ]
+
+    async def _chat_completions(self, request):
+        body = await request.json()
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "stub")
+        tool_calls = self._due_tool_calls(body)
+        if body.get("stream"):
+            return await self._stream(request, completion_id, model, tool_calls)
+        if tool_calls:
+            message = {"role": "assistant", "content": None, "tool_calls": tool_calls}
+            finish_reason = "tool_calls"
+        else:
+            if self.tokens_per_second:
+                await asyncio.sleep(len(self._tokens()) / self.tokens_per_second)
+            message = {"role": "assistant", "content": self.reply}
+            finish_reason = "stop"
+        return web.json_response(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": message, "finish_reason": finish_reason}
+                ],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": len(self._tokens()),
+                    "total_tokens": len(self._tokens()),
+                },
+            }
+        )
+
+    async def _stream(self, request, completion_id, model, tool_calls=None):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(delta, finish_reason=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        await send({"role": "assistant", "content": ""})
+        if tool_calls:
+            await send(
+                {"tool_calls": [dict(call, index=i) for i, call in enumerate(tool_calls)]}
+            )
+            await send({}, "tool_calls")
+        else:
+            for token in self._tokens():
+                if self.tokens_per_second:
+                    await asyncio.sleep(1 / self.tokens_per_second)
+                await send({"content": token})
+            await send({}, "stop")
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from mem.bench.stats import summarize
+from mem.bench.stub_server import StubServer
+from mem.llms.backends import Backends
+from mem.llms.request import ProxyRequest
+from mem.llms.request_manager import RequestManager
+from mem.messages.context_window import ContextWindow
+from mem.messages.messages_manager import Messages
+from mem.toolkit.tools_manager import ToolsManager
+
+CHAT_CONFIG = {"api_service": "stub", "model": "stub", "temperature": 0}
+# Untimed turns before each request benchmark, so client creation and the one-off
+# tokenizer load are not counted.
+WARMUP = 2
+ECHO_SCRIPT = [[{"name": "echo", "arguments": {"text": "hello"}}]]
+
+
+async def _echo(text: str):
+    return {"text": text}
+
+
+def build_tools_manager(with_echo: bool = False) -> ToolsManager:
+    """A ToolsManager without network tools; optionally with a local `echo` tool."""
+    tools_manager = ToolsManager(enabled_tools=[])
+    if with_echo:
+        tools_manager.register_tool(
+            "echo",
+            _echo,
+            {
+                "description": "Echoes the text back",
+                "parameters": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+        )
+    return tools_manager
+
+
+def build_session(base_url: str, tools_manager: ToolsManager, backends=None):
+    """Returns a fresh (Messages, RequestManager) pair talking to the endpoint at base_url."""
+    messages = Messages()
+    messages.add_system_message()
+    request_manager = RequestManager(
+        messages,
+        tools_manager,
+        ProxyRequest(tools_manager, backends or Backends(proxy_url=base_url)),
+        context_window=ContextWindow(messages),
+    )
+    return messages, request_manager
+
+
+async def bench_make_request(stub, iterations: int) -> Dict[str, List[float]]:
+    """One non-streaming turn without tools, in a fresh conversation each time."""
+    tools_manager = build_tools_manager()
+    backends = Backends(proxy_url=stub.base_url)
+    samples = []
+    try:
+        for _ in range(WARMUP + iterations):
+            _, request_manager = build_session(stub.base_url, tools_manager, backends)
+            started = time.perf_counter()
+            await request_manager.make_request(CHAT_CONFIG, "Hello there")
+            samples.append(time.perf_counter() - started)
+    finally:
+        await backends.aclose()
+        await tools_manager.aclose()
+    return {"make_request": samples[WARMUP:]}
+
+
+async def bench_stream_request(stub, iterations: int) -> Dict[str, List[float]]:
+    """One streaming turn; records time to first token and time to the end of the stream."""
+    tools_manager = build_tools_manager()
+    backends = Backends(proxy_url=stub.base_url)
+    first_token, total = [], []
+    try:
+        for _ in range(WARMUP + iterations):
+            _, request_manager = build_session(stub.base_url, tools_manager, backends)
+            started = time.perf_counter()
+            first = None
+            async for _ in request_manager.stream_request(CHAT_CONFIG, "Hello there"):
+                if first is None:
+                    first = time.perf_counter() - started
+            total.append(time.perf_counter() - started)
+            first_token.append(first or total[-1])
+    finally:
+        await backends.aclose()
+        await tools_manager.aclose()
+    return {
+        "stream_first_token": first_token[WARMUP:],
+        "stream_total": total[WARMUP:],
+    }
+
+
+async def bench_tool_loop(stub, iterations: int) -> Dict[str, List[float]]:
+    """A turn in which the model calls the local `echo` tool once before replying."""
+    tools_manager = build_tools_manager(with_echo=True)
+    backends = Backends(proxy_url=stub.base_url)
+    samples = []
+    try:
+        for _ in range(WARMUP + iterations):
+            messages, request_manager = build_session(
+                stub.base_url, tools_manager, backends
+            )
+            started = time.perf_counter()
+            await request_manager.make_request(CHAT_CONFIG, "Echo hello")
+            samples.append(time.perf_counter() - started)
+            if not any(message.role == "tool" for message in messages.messages):
+                raise RuntimeError("The stub's tool script was not played")
+    finally:
+        await backends.aclose()
+        await tools_manager.aclose()
+    return {"tool_loop": samples[WARMUP:]}
+
+
+async def bench_messages_growth(stub, iterations: int) -> Dict[str, List[float]]:
+    """
+    Grows one conversation to iterations * 50 messages, timing every add_message and the
+    context assembly for the next request every 50 messages.
+    """
+    tools_manager = build_tools_manager()
+    messages, request_manager = build_session(stub.base_url, tools_manager)
+    adds, contexts = [], []
+    text = "A message of a typical length for a chat turn, give or take a few words. " * 3
+    try:
+        for step in range(iterations * 50):
+            role = "user" if step % 2 == 0 else "assistant"
+            started = time.perf_counter()
+            messages.add_message(role, text)
+            adds.append(time.perf_counter() - started)
+            if step % 50 == 49:
+                started = time.perf_counter()
+                request_manager.build_context(CHAT_CONFIG)
+                contexts.append(time.perf_counter() - started)
+    finally:
+        await tools_manager.aclose()
+    return {"messages_add": adds, "messages_context": contexts}
+
+
+async def bench_config_load(stub, iterations: int) -> Dict[str, List[float]]:
+    """ConfigManager construction with the parsed config cached (warm) and invalidated (cold)."""
+    from mem.config import config_cache
+    from mem.config.config_manager import ConfigManager
+
+    cold, warm = [], []
+    for _ in range(iterations):
+        config_path = ConfigManager().config_file
+        config_cache.invalidate(config_path)
+        started = time.perf_counter()
+        ConfigManager()
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        ConfigManager()
+        warm.append(time.perf_counter() - started)
+    return {"config_load_cold": cold, "config_load_warm": warm}
+
+
+async def bench_cli_startup(stub, iterations: int) -> Dict[str, List[float]]:
+    """Wall time of `mem --help` in a fresh interpreter: imports, config and click."""
+    import mem
+
+    # Run from the directory holding the package so it imports without being installed.
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(mem.__file__)))
+    samples = []
+    for _ in range(max(1, iterations // 10)):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "mem.main", "--help"],
+            cwd=package_root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append(time.perf_counter() - started)
+    return {"cli_startup": samples}
+
+
+BENCHMARKS = {
+    "make_request": bench_make_request,
+    "stream_request": bench_stream_request,
+    "tool_loop": bench_tool_loop,
+    "messages_growth": bench_messages_growth,
+    "config_load": bench_config_load,
+    "cli_startup": bench_cli_startup,
+}
+
+
+async def run_suite(
+    iterations: int = 50,
+    only: Optional[List[str]] = None,
+    latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Runs the benchmarks against a local stub server.
+    Args:
+        iterations: Samples per benchmark; CLI startup takes a tenth of it.
+        only: Optional. Names from BENCHMARKS to run; all of them by default.
+        latency: Seconds the stub waits before each response.
+        tokens_per_second: The stub's streaming rate; 0 sends each reply at once.
+    Returns:
+        The results document: run metadata plus a summary in milliseconds per measurement.
+    """
+    stub = StubServer(
+        latency=latency, tokens_per_second=tokens_per_second, tool_script=ECHO_SCRIPT
+    )
+    await stub.start()
+    results = {}
+    try:
+        for name, benchmark in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            for measurement, samples in (await benchmark(stub, iterations)).items():
+                results[measurement] = summarize(samples)
+    finally:
+        await stub.stop()
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "stub_latency": latency,
+            "stub_tokens_per_second": tokens_per_second,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metric: str = "p50",
+    threshold: float = 0.10,
+    min_delta_ms: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """
+    Compares two results documents measurement by measurement.
+    A measurement regresses when its metric grew by more than threshold (a fraction) and by
+    more than min_delta_ms, so sub-microsecond noise is not reported.
+    Returns:
+        One row per measurement present in both runs, with a `regressed` flag.
+    """
+    rows = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        delta = after[metric] - before[metric]
+        change = delta / before[metric] if before[metric] else 0.0
+        rows.append(
+            {
+                "name": name,
+                "baseline": before[metric],
+                "current": after[metric],
+                "change": change,
+                "regressed": change > threshold and delta > min_delta_ms,
+            }
+        )
+    return rows
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_results(path: str, document: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def run(**kwargs) -> Dict[str, Any]:
+    return asyncio.run(run_suite(**kwargs))
@@ -1,23 +1,97 @@
-from mem.speech.tts.text_to_speech_handler import TextToSpeechHandler
-from mem.utils.rich_setup import Prompt, console, rprint
+import asyncio
+import logging
+import os
+
+from mem.llms.request import is_streaming
+from mem.messages.context_window import ContextWindow
+from mem.messages.messages_manager import Messages
+from mem.messages.prompt_builder import PromptBuilder
+from mem.cli.input_multiplexer import SPEECH, InputMultiplexer
+from mem.utils.builders import (
+    build_long_term_memory,
+    build_memory_manager,
+    build_proxy_request,
+    build_request_manager,
+    build_session_store,
+    build_summarizer,
+    build_tools_manager,
+)
+from mem.utils import tracing
+from mem.utils.rich_setup import console, rprint
+from mem.utils.startup_profiler import mark_first_prompt
+
+# Speech pulls in heavy dependencies (coqui-tts, watchdog), so it is imported only when the
+# config enables it; mem.utils.builders does the same for vector memory and the summarizer.
 
 logger = logging.getLogger(__name__)
 
 
 class ChatLoop:
-    def __init__(self, config_manager, stt_handler=None, tts_handler=None):
+    def __init__(
+        self, config_manager, stt_handler=None, tts_handler=None, session_id=None
+    ):
         """
         Initializes the ChatLoop which manages the chat process.
         Args:
             config_manager: Manages configuration settings for the chat.
             stt_handler: Optional. Handles speech-to-text functionality if provided.
             tts_handler: Optional. Handles text-to-speech functionality if provided.
+            session_id: Optional. A stored session to resume instead of starting a new one.
         """
         self.config_manager = config_manager
         self.stt_handler = stt_handler
         self.tts_handler = tts_handler
-        self.request_manager = RequestManager()
-        self.queue = Queue()
+        self.messages = Messages(self._build_session_store(session_id))
+        self.prompt_builder = PromptBuilder(
+            config_manager.get_value_from_config("prompts")
+        )
+        self.context_window = ContextWindow(
+            self.messages, config_manager.get_value_from_config("messages")
+        )
+        self.long_term_memory = build_long_term_memory(config_manager)
+        self.memory_manager = build_memory_manager(
+            config_manager,
+            self.messages,
+            self.context_window,
+            summarizer=build_summarizer(config_manager),
+            long_term_memory=self.long_term_memory,
+        )
+        self.tools_manager = build_tools_manager(config_manager)
+        self.request_manager = build_request_manager(
+            config_manager,
+            self.messages,
+            self.tools_manager,
+            build_proxy_request(config_manager, self.tools_manager),
+            context_window=self.context_window,
+            long_term_memory=self.long_term_memory,
+            prompt_builder=self.prompt_builder,
+        )
+        self.queue = asyncio.Queue()
+
+    def _build_session_store(self, session_id):
+        """
+        Builds the SessionStore described by the [sessions] config.
+        """
+        store = build_session_store(self.config_manager, session_id)
+        if store is not None:
+            logger.info("Chat session id: %s", store.session_id)
+        return store
+
+    def _build_audio_cache(self, chat_config):
+        """
+        Builds the synthesized speech cache described by the [tts_cache] config, if enabled.
+        """
+        settings = self.config_manager.get_value_from_config("tts_cache") or {}
+        if not settings.get("dir"):
+            return None
+        from mem.speech.tts.audio_cache import AudioCache
+
+        return AudioCache(
+            settings["dir"],
+            chat_config["speech_model"],
+            voice=chat_config.get("voice"),
+            max_bytes=int(settings.get("max_mb", 200) * 1024 * 1024),
+        )
 
     async def run_loop(self, chat_config):
         """
@@ -25,44 +99,150 @@ class ChatLoop:
         Args:
             chat_config: A dictionary containing configuration settings such as whether to use STT or TTS.
         """
+        if not self.messages.messages:
+            self.messages.add_system_message(
+                self.prompt_builder.system_prompt(chat_config)
+            )
+
         if chat_config.get("speech_to_text"):
             if not self.stt_handler:
+                from mem.speech.stt.stt_handler import SpeechToTextHandler
+
+                settings = self.config_manager.get_value_from_config("speech") or {}
                 self.stt_handler = SpeechToTextHandler(
-                    os.path.expanduser("~/_path_to_media"), self.queue
+                    os.path.expanduser(settings.get("stt_dir", "~/_path_to_media")),
+                    self.queue,
+                    socket_path=settings.get("stt_socket"),
+                    settle_delay=settings.get("stt_settle_ms", 50) / 1000,
                 )
             rprint("Speech-to-text activated.")
-            self.stt_handler.start()
+            await self.stt_handler.start()
 
         if chat_config.get("text_to_speech") and not self.tts_handler:
-            self.tts_handler = TextToSpeechHandler(chat_config["speech_model"])
+            from mem.speech.tts.text_to_speech_handler import TextToSpeechHandler
+
+            self.tts_handler = TextToSpeechHandler(
+                chat_config["speech_model"],
+                voice=chat_config.get("voice"),
+                audio_cache=self._build_audio_cache(chat_config),
+            )
             self.tts_handler.load_model()
 
-        await self._process_chat(chat_config)
+        try:
+            await self._process_chat(chat_config)
+        finally:
+            await self.memory_manager.aclose()
+            await self.tools_manager.aclose()
+            await self.request_manager.proxy_request.aclose()
+            self.messages.close()
 
     async def _process_chat(self, chat_config):
         """
-        Processes each message received through the chat loop. Checks for exit commands.
+        Processes each message received through the chat loop. Keyboard and speech input are
+        awaited together and whichever arrives first is answered. Input that arrives while a reply
+        is still generating either interrupts it or waits for it, depending on [cli] on_new_input.
         Args:
             chat_config: Configuration used to set up the chat properties.
         """
-        exit_words = {"exit", "quit", "bye", "q", "x", "z"}
-        while True:
-            try:
-                user_input = self.queue.get(
-                    timeout=1
-                )  # Attempt to get user input from the queue.
-            except Empty:
-                user_input = Prompt.ask("Type your message: ")
+        settings = self.config_manager.get_value_from_config("cli") or {}
+        exit_words = {word.lower() for word in settings.get("exit_words", [])} or {
+            "exit",
+            "quit",
+            "bye",
+        }
+        interrupt = settings.get("on_new_input", "interrupt") == "interrupt"
+        inputs = InputMultiplexer(self.queue)
+        inputs.start()
+        mark_first_prompt()
+        try:
+            next_input = None
+            while True:
+                if next_input is None:
+                    console.print("Type your message: ", end="")
+                    next_input = await inputs.get()
+                source, user_input = next_input
+                next_input = None
+                if user_input is None or user_input.strip().lower() in exit_words:
+                    rprint("Chat session ending...")
+                    break
+                if not user_input.strip():
+                    continue
+                if source == SPEECH:
+                    rprint(f"You (speech): {user_input}")
 
-            if any(word in user_input.lower() for word in exit_words):
-                rprint("Chat session ending...")
-                break
+                reply = asyncio.create_task(
+                    self._respond(chat_config, user_input, source)
+                )
+                if not interrupt:
+                    await reply
+                    continue
+                waiting = asyncio.create_task(inputs.get())
+                done, _ = await asyncio.wait(
+                    {reply, waiting}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if waiting in done:
+                    next_input = waiting.result()
+                    if reply.done():
+                        reply.result()
+                    else:
+                        await self._cancel_reply(reply)
+                else:
+                    waiting.cancel()
+                    reply.result()
+        finally:
+            await inputs.stop()
+
+    async def _respond(self, chat_config, user_input, source=None):
+        """
+        Answers one input, printing and speaking the reply. A spoken input's turn continues
+        the trace the speech handler started when it picked up the transcript.
+        """
+        follows = tracing.take_handoff(tracing.SPEECH_CHANNEL) if source == SPEECH else None
+        with tracing.span("turn", follows=follows, source=source or "keyboard"):
+            if is_streaming(chat_config):
+                await self._stream_response(chat_config, user_input)
+                if self.tts_handler:
+                    await self.tts_handler.finish()
+                return
 
             response = await self.request_manager.make_request(chat_config, user_input)
-            if self.tts_handler:
+            rprint(f"Assistant: {response}")
+            if self.tts_handler and response:
                 await self.tts_handler.speak(response)
 
-            rprint(f"Assistant: {response}")
+    async def _cancel_reply(self, reply):
+        """
+        Cancels a reply that is still generating, along with anything it queued for speech.
+        """
+        reply.cancel()
+        if self.tts_handler:
+            self.tts_handler.interrupt()
+        try:
+            await reply
+        except asyncio.CancelledError:
+            pass
+        console.print()
+        logger.info("Reply interrupted by new input.")
+
+    async def _stream_response(self, chat_config, user_input):
+        """
+        Prints the assistant's reply token by token as it streams in, and hands it to the
+        text-to-speech handler so each sentence can be spoken as soon as it is complete.
+        Args:
+            chat_config: Configuration used to set up the chat properties.
+            user_input: The message to send.
+        Returns:
+            The full text of the reply once the stream has finished.
+        """
+        console.print("Assistant: ", end="")
+        parts = []
+        async for delta in self.request_manager.stream_request(chat_config, user_input):
+            console.print(delta, end="", markup=False, highlight=False)
+            if self.tts_handler:
+                self.tts_handler.feed(delta)
+            parts.append(delta)
+        console.print()
+        return "".join(parts)
 
     def stop(self):
         """
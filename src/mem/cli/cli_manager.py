@@ -1,13 +1,47 @@
+import asyncio
+import sys
+
 import click
+from mem.cli.chat_loop import ChatLoop
 from mem.config.config_manager import ConfigManager
-from mem.cli.cli_manager import CLIManager
+from mem.utils import tracing
+from mem.utils.helpers import convert_value
 from mem.utils.logging_setup import setup_logging, set_logger_levels
+from mem.utils.rich_setup import Prompt
 
 # Initialize logging at the time of module loading to capture all events right from startup.
 setup_logging()
 
 
-@click.group()
+class CLIManager:
+    def __init__(self, config_manager: ConfigManager, session_id=None):
+        """
+        Ties the config manager to the chat loop for the `chat` command.
+        Args:
+            config_manager: Manages configuration settings for the chat.
+            session_id: Optional. A stored session to resume.
+        """
+        self.config_manager = config_manager
+        self.chat_loop = ChatLoop(config_manager, session_id=session_id)
+
+    def update_config_interactively(self):
+        """
+        Prompts for each of the config choices, keeping the current value when the answer is left empty.
+        """
+        temp_config = self.config_manager.get_temp_config()
+        new_settings = {}
+        for key in self.config_manager.config_choices:
+            current = temp_config.get(key)
+            value = Prompt.ask(key, default="" if current is None else str(current))
+            if not value:
+                continue
+            new_settings[key] = (
+                value if current is None else convert_value(value, type(current))
+            )
+        self.config_manager.update_temp_config(new_settings)
+
+
+@click.group(invoke_without_command=True)
 @click.option(
     "-v",
     "--verbosity",
@@ -22,18 +56,61 @@ setup_logging()
     default=None,
     help="Specify a single module to log, or log all if not specified.",
 )
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    help="Report per-module import time and time to first prompt for the given command.",
+)
+@click.option(
+    "--startup-budget-ms",
+    type=float,
+    default=None,
+    help="With --profile-startup, exit with status 1 if the first prompt takes longer than this.",
+)
 @click.pass_context
-def cli(ctx, verbosity, module):
+def cli(ctx, verbosity, module, profile_startup, startup_budget_ms):
     """
     This is the main CLI group function that sets up the context for managing the chat application.
     It initializes logging levels based on user inputs.
     """
-    set_logger_levels(verbosity, module)
+    if profile_startup:
+        from mem.utils.startup_profiler import run_startup_profile
+
+        ctx.exit(
+            run_startup_profile(
+                _strip_profile_args(sys.argv[1:]), budget_ms=startup_budget_ms
+            )
+        )
+    if ctx.invoked_subcommand is None:
+        click.echo(ctx.get_help())
+        ctx.exit()
+
+    settings = ConfigManager().get_value_from_config("logging") or {}
+    setup_logging(
+        rich=settings.get("rich", True), json_path=settings.get("json_path") or None
+    )
+    set_logger_levels(verbosity, module, settings.get("levels"))
     ctx.ensure_object(dict)
     ctx.obj["LOG_VERBOSITY"] = verbosity
     ctx.obj["LOG_MODULE"] = module
 
 
+def _strip_profile_args(args):
+    """Removes the startup profiling options so the rest can be run in the profiled child."""
+    stripped = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg == "--profile-startup" or arg.startswith("--startup-budget-ms="):
+            continue
+        elif arg == "--startup-budget-ms":
+            skip_next = True
+        else:
+            stripped.append(arg)
+    return stripped
+
+
 @click.command(help="Starts the chat application with optional configuration.")
 @click.option(
     "-p", "--preset", type=str, default="", help="Name of the preset to load."
@@ -41,13 +118,26 @@ def cli(ctx, verbosity, module):
 @click.option(
     "-u", "--update", is_flag=True, help="Interactively update the config file."
 )
+@click.option(
+    "-s", "--session", type=str, default=None, help="Id of a stored session to resume."
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model, bypassing the response cache.",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Print a timing waterfall after every turn and latency histograms on exit.",
+)
 @click.pass_context
-def chat(ctx, preset, update):
+def chat(ctx, preset, update, session, no_cache, trace):
     """
     This command starts the chat application. It can load a preset configuration or update configurations interactively.
     """
     config_manager = ConfigManager()  # Assume instantiation details
-    cli_manager = CLIManager(config_manager)
+    cli_manager = CLIManager(config_manager, session_id=session)
 
     if preset:
         cli_manager.config_manager.load_preset(preset)
@@ -56,10 +146,222 @@ def chat(ctx, preset, update):
         cli_manager.update_config_interactively()
 
     chat_config = cli_manager.config_manager.get_temp_config()
-    cli_manager.chat_loop.run_loop(chat_config)
+    if no_cache:
+        chat_config["response_cache"] = False
+    tracing.configure(config_manager.get_value_from_config("tracing"), console=trace)
+    try:
+        asyncio.run(cli_manager.chat_loop.run_loop(chat_config))
+    finally:
+        cli_manager.chat_loop.stop()
+        tracing.shutdown()
+
+
+@click.command(help="Measures how many concurrent conversations one process can serve.")
+@click.option("-n", "--sessions", default=10, help="Concurrent conversations.")
+@click.option("-t", "--turns", default=5, help="Turns per conversation.")
+@click.option(
+    "-r",
+    "--rate",
+    default=0.0,
+    help="Target turns per second across all sessions; 0 sends each next turn immediately.",
+)
+@click.option(
+    "--base-url",
+    default=None,
+    help="OpenAI-compatible endpoint to load; a local stub server when not given.",
+)
+@click.option("--model", default=None, help="Model name sent to the endpoint.")
+@click.option("--script", default=None, help="JSON or JSONL file of user turns.")
+@click.option("--stream", is_flag=True, help="Use streaming requests.")
+@click.option("--tools", is_flag=True, help="Play one tool call per turn (stub only).")
+@click.option("--latency", default=0.0, help="Stub: seconds before each response.")
+@click.option(
+    "--tokens-per-second", default=0.0, help="Stub: streaming rate; 0 is instant."
+)
+@click.option("--seed", default=None, type=int, help="Seed for the arrival schedule.")
+@click.option("-o", "--output", default=None, help="Also write the report as JSON.")
+def loadtest(
+    sessions,
+    turns,
+    rate,
+    base_url,
+    model,
+    script,
+    stream,
+    tools,
+    latency,
+    tokens_per_second,
+    seed,
+    output,
+):
+    """
+    Replays scripted turns through independent sessions in one event loop and reports throughput,
+    turn latency percentiles, event-loop lag and memory per session.
+    """
+    import json
+
+    from mem.bench.loadtest import run_loadtest
+    from mem.utils.rich_setup import Table, console
+
+    report = asyncio.run(
+        run_loadtest(
+            sessions,
+            turns,
+            rate=rate,
+            base_url=base_url,
+            model=model,
+            script=script,
+            stream=stream,
+            tools=tools,
+            latency=latency,
+            tokens_per_second=tokens_per_second,
+            seed=seed,
+        )
+    )
+    table = Table(title=f"Load test: {sessions} sessions x {turns} turns")
+    table.add_column("ms")
+    for column in ("p50", "p95", "p99", "max"):
+        table.add_column(column, justify="right")
+    for label, key in (
+        ("turn latency", "turn_latency_ms"),
+        ("service time", "service_time_ms"),
+        ("event-loop lag", "loop_lag_ms"),
+    ):
+        table.add_row(
+            label, *(f"{report[key][p]:.2f}" for p in ("p50", "p95", "p99", "max"))
+        )
+    console.print(table)
+    console.print(
+        f"{report['turns']} turns in {report['elapsed_s']:.2f}s: "
+        f"{report['throughput_turns_per_s']:.1f} turns/s, {report['errors']} errors, "
+        f"~{report['memory_per_session_kb']:.0f} KB per session"
+    )
+    if report["last_error"]:
+        console.print(f"Last error: {report['last_error']}")
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+@click.command(help="Serves chat sessions over HTTP and WebSocket for other services.")
+@click.option(
+    "-p", "--preset", type=str, default="", help="Name of the preset sessions are answered with."
+)
+@click.option("--host", default=None, help="Interface to listen on; [server] host by default.")
+@click.option("--port", default=None, type=int, help="Port to listen on; [server] port by default.")
+@click.option(
+    "--max-turns-per-session",
+    default=None,
+    type=int,
+    help="Turns one session may have running or waiting at once.",
+)
+@click.option(
+    "--idle-timeout",
+    default=None,
+    type=float,
+    help="Seconds before an idle session is evicted from memory.",
+)
+def serve(preset, host, port, max_turns_per_session, idle_timeout):
+    """
+    Runs a headless server holding many conversations in one process. Each session has its own
+    messages and memory; the LLM client, tools and chat config are shared.
+    """
+    from mem.server.chat_server import ChatServer
+    from mem.server.session_manager import SessionManager
+
+    config_manager = ConfigManager()
+    if preset:
+        config_manager.load_preset(preset)
+    settings = config_manager.get_value_from_config("server") or {}
+    # Speech belongs to the terminal; a served session is text only.
+    chat_config = dict(
+        config_manager.get_temp_config(), speech_to_text=False, text_to_speech=False
+    )
+    session_manager = SessionManager(
+        config_manager,
+        chat_config,
+        max_turns_per_session=max_turns_per_session
+        or settings.get("max_turns_per_session", 2),
+        max_sessions=settings.get("max_sessions", 1000),
+        idle_timeout=idle_timeout or settings.get("idle_timeout", 300),
+    )
+    server = ChatServer(
+        session_manager,
+        host=host or settings.get("host", "127.0.0.1"),
+        port=settings.get("port", 8080) if port is None else port,
+    )
+    tracing.configure(config_manager.get_value_from_config("tracing"))
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tracing.shutdown()
+
+
+@click.command(help="Runs the prompts of a JSONL file through the chat model concurrently.")
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output", required=True, help="JSONL file the results are written to.")
+@click.option(
+    "-p", "--preset", type=str, default="", help="Name of the preset to answer with."
+)
+@click.option("-c", "--concurrency", default=8, help="Prompts in flight at once.")
+@click.option(
+    "-r", "--rate", default=0.0, help="Prompts started per second at most; 0 is unlimited."
+)
+@click.option(
+    "--order",
+    type=click.Choice(["ordered", "as-completed"]),
+    default="ordered",
+    help="Write results in input order, or each as soon as it finishes.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip prompts that already have a successful result in the output file.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model, bypassing the response cache.",
+)
+def batch(input_path, output, preset, concurrency, rate, order, resume, no_cache):
+    """
+    Answers each prompt as its own single-turn conversation, sharing one LLM client and one set
+    of tools, and streams the results to a JSONL file.
+    """
+    from mem.batch.batch_runner import BatchRunner
+    from mem.utils.rich_setup import console
+
+    config_manager = ConfigManager()
+    if preset:
+        config_manager.load_preset(preset)
+    chat_config = dict(
+        config_manager.get_temp_config(), speech_to_text=False, text_to_speech=False
+    )
+    if no_cache:
+        chat_config["response_cache"] = False
+    runner = BatchRunner(
+        config_manager, chat_config, concurrency=concurrency, rate=rate, order=order
+    )
+    tracing.configure(config_manager.get_value_from_config("tracing"))
+    try:
+        report = asyncio.run(runner.run(input_path, output, resume=resume))
+    finally:
+        tracing.shutdown()
+    console.print(
+        f"{report['completed']} completed, {report['failed']} failed, "
+        f"{report['skipped']} skipped in {report['elapsed_s']:.2f}s "
+        f"({report['throughput_per_s']:.1f} prompts/s). Results in {output}"
+    )
+    if report["failed"]:
+        raise SystemExit(1)
 
 
 cli.add_command(chat)
+cli.add_command(serve)
+cli.add_command(batch)
+cli.add_command(loadtest)
 
 if __name__ == "__main__":
     cli()
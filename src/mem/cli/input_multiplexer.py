@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import sys
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KEYBOARD = "keyboard"
+SPEECH = "speech"
+
+
+class InputMultiplexer:
+    def __init__(self, speech_queue: Optional[asyncio.Queue] = None, stdin=None):
+        """
+        Waits on the keyboard and speech-to-text at the same time and hands out whichever input
+        arrives first. The keyboard is read line by line on a daemon thread so the event loop
+        never blocks on stdin.
+        Args:
+            speech_queue: Optional. The queue the speech-to-text handler puts transcripts on.
+            stdin: Optional. The stream to read typed input from; sys.stdin by default.
+        """
+        self.speech_queue = speech_queue
+        self.stdin = stdin or sys.stdin
+        self.inputs: asyncio.Queue = asyncio.Queue()
+        self._keyboard_thread: Optional[threading.Thread] = None
+        self._speech_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Starts reading from every source."""
+        loop = asyncio.get_running_loop()
+        if self._keyboard_thread is None:
+            self._keyboard_thread = threading.Thread(
+                target=self._read_keyboard, args=(loop,), name="mem-keyboard", daemon=True
+            )
+            self._keyboard_thread.start()
+        if self.speech_queue is not None and self._speech_task is None:
+            self._speech_task = asyncio.create_task(self._forward_speech())
+
+    def _read_keyboard(self, loop):
+        for line in iter(self.stdin.readline, ""):
+            loop.call_soon_threadsafe(self.inputs.put_nowait, (KEYBOARD, line.rstrip("\n")))
+        # EOF (e.g. Ctrl-D or a closed pipe) ends the session.
+        loop.call_soon_threadsafe(self.inputs.put_nowait, (KEYBOARD, None))
+
+    async def _forward_speech(self):
+        while True:
+            transcript = await self.speech_queue.get()
+            self.inputs.put_nowait((SPEECH, transcript))
+
+    async def get(self) -> Tuple[str, Optional[str]]:
+        """
+        Returns the next (source, text) input. Text is None once the keyboard reaches end of file.
+        """
+        return await self.inputs.get()
+
+    async def stop(self):
+        """Stops forwarding speech. The keyboard thread is a daemon and ends with the process."""
+        if self._speech_task is not None:
+            self._speech_task.cancel()
+            try:
+                await self._speech_task
+            except asyncio.CancelledError:
+                pass
+            self._speech_task = None
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import tomllib
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parsed snapshots let a fresh process skip TOML parsing; set MEM_CONFIG_SNAPSHOT_DIR="" to disable.
+# They are plain JSON, so a tampered snapshot can at worst change settings, never run code.
+SNAPSHOT_DIR = os.environ.get("MEM_CONFIG_SNAPSHOT_DIR", "~/.cache/mem/config")
+
+# Process-wide cache: path -> ((mtime_ns, size), parsed config, flat dotted-key index)
+_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Any]]] = {}
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def build_index(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flattens nested tables into a {"a.b.c": value} index, including every intermediate table,
+    so a dotted lookup is a single dict access. Lists are indexed as a whole, not by item.
+    """
+    index: Dict[str, Any] = {}
+    stack = [("", config)]
+    while stack:
+        prefix, table = stack.pop()
+        for key, value in table.items():
+            path = f"{prefix}{key}"
+            index[path] = value
+            if isinstance(value, dict):
+                stack.append((f"{path}.", value))
+    return index
+
+
+def _snapshot_path(path: str) -> Optional[str]:
+    if not SNAPSHOT_DIR:
+        return None
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(os.path.expanduser(SNAPSHOT_DIR), f"{digest}.json")
+
+
+def _read_snapshot(path: str, signature: Tuple[int, int]):
+    snapshot_path = _snapshot_path(path)
+    if snapshot_path is None:
+        return None
+    try:
+        with open(snapshot_path, "r") as f:
+            snapshot = json.load(f)
+        snapshot_signature, config = tuple(snapshot["signature"]), snapshot["config"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug("Ignoring unreadable config snapshot: %s", e)
+        return None
+    if snapshot_signature != signature or not isinstance(config, dict):
+        return None
+    return config, build_index(config)
+
+
+def _write_snapshot(path: str, signature, config):
+    snapshot_path = _snapshot_path(path)
+    if snapshot_path is None:
+        return
+    try:
+        # TOML dates and times have no JSON form; such configs are simply parsed every time.
+        encoded = json.dumps({"signature": list(signature), "config": config})
+    except (TypeError, ValueError) as e:
+        logger.debug("Not snapshotting config: %s", e)
+        return
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(encoded)
+        os.replace(temp_path, snapshot_path)
+    except OSError as e:
+        logger.debug("Failed to write config snapshot: %s", e)
+
+
+def load_toml(path: str, snapshot: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Returns the parsed TOML file and its flat index, parsing only when the file's
+    (mtime, size) changed since the last load in this process.
+    Callers must treat the returned config as read-only; it is shared.
+    Args:
+        path: The TOML file to load.
+        snapshot: Whether to also keep a parsed snapshot on disk for the next process.
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    signature = _signature(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1], cached[2]
+
+    loaded = _read_snapshot(path, signature) if snapshot else None
+    if loaded is None:
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+        index = build_index(config)
+        if snapshot:
+            _write_snapshot(path, signature, config)
+    else:
+        config, index = loaded
+
+    _cache[path] = (signature, config, index)
+    return config, index
+
+
+def invalidate(path: str):
+    """Drops a file from the process-wide cache, e.g. right after writing it."""
+    _cache.pop(path, None)
@@ -7,8 +7,12 @@ import tomli_w
 import tomllib
 from rich.console import Console
 
+from mem.config import config_cache
+
 logger = logging.getLogger(__name__)
 
+TEMP_CONFIG_ENV = "MEM_TEMP_CONFIG"
+
 console = Console()
 
 
@@ -48,41 +52,55 @@ class ConfigManager:
         self.presets_dir = os.path.join(self.src_dir, "config", "_presets")
         self.config_file = os.path.join(self.src_dir, "config", "_app_config.toml")
         self.config = self._load_config()
-        self.temp_config_file = os.path.join(
+        # MEM_TEMP_CONFIG points the session settings elsewhere, e.g. for tests.
+        self.temp_config_file = os.environ.get(TEMP_CONFIG_ENV) or os.path.join(
             self.src_dir, "config", "_temp_config.toml"
         )
         self.temp_config = self._load_temp_config()
         self._copy_default_to_temp_config()
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load and return the configuration file."""
+        """Load and return the configuration file, served from the process-wide cache when unchanged."""
         try:
-            with open(self.config_file, "rb") as f:
-                return tomllib.load(f)
+            self.config, self._index = config_cache.load_toml(
+                self.config_file, snapshot=True
+            )
+            return self.config
         except FileNotFoundError:
-            logger.error(f"Error: Config file '{self.config_file}' not found.")
+            logger.error("Error: Config file '%s' not found.", self.config_file)
+            self._index = {}
             return {}
 
     def _load_temp_config(self) -> Dict[str, Any]:
-        """Load and return the temporary configuration file."""
-        with open(self.temp_config_file, "rb") as f:
-            return tomllib.load(f)
+        """Load and return a copy of the temporary configuration file."""
+        try:
+            temp_config, _ = config_cache.load_toml(self.temp_config_file)
+        except FileNotFoundError:
+            return {}
+        return dict(temp_config)
+
+    def _write_temp_config(self, settings: Dict[str, Any]):
+        with open(self.temp_config_file, "wb") as f:
+            tomli_w.dump(settings, f)
+        config_cache.invalidate(self.temp_config_file)
 
     def _copy_default_to_temp_config(self):
-        """Copy the default settings to the temporary configuration file."""
+        """Copy the default settings to the temporary configuration file, unless it already holds them."""
         try:
             default_settings = self.config.get("cli", {}).get("default", {})
-            with open(self.temp_config_file, "wb") as f:
-                tomli_w.dump(default_settings, f)
-                logger.info("Default settings copied to temporary configuration.")
+            if self.temp_config == default_settings:
+                return
+            self._write_temp_config(default_settings)
+            self.temp_config = dict(default_settings)
+            logger.info("Default settings copied to temporary configuration.")
         except Exception as e:
-            logger.error(f"Failed to initialize temporary settings: {e}")
+            logger.error("Failed to initialize temporary settings: %s", e)
             raise e
 
     def get_temp_config(self) -> Optional[Dict]:
         """Public method to get the temp config, ensuring it's always fresh."""
-        self.temp_config = self._load_temp_config()  # Reload from file
-        logger.info(f"Here is the current temp config {self.temp_config}")
+        self.temp_config = self._load_temp_config()  # Re-parsed only if the file changed
+        logger.debug("Here is the current temp config %s", self.temp_config)
         return self.temp_config
 
     def update_temp_config(self, new_settings: Dict):
@@ -91,16 +109,18 @@ class ConfigManager:
             # Update in-memory config first
             self.temp_config.update(new_settings)
             # Write updated config to file
-            with open(self.temp_config_file, "wb") as f:
-                tomli_w.dump(self.temp_config, f)
+            self._write_temp_config(self.temp_config)
             console.log("Temporary settings updated.")
             # Ensure in-memory config is reloaded to reflect the file's current state
             self.temp_config = self._load_temp_config()
         except Exception as e:
-            logger.error(f"Error updating temporary settings: {e}")
+            logger.error("Error updating temporary settings: %s", e)
 
     def get_value_from_config(self, key_path: str) -> Optional[Any]:
         """Get a single setting value using a dot-notation key path."""
+        if key_path in self._index:
+            return self._index[key_path]
+        # Paths that go through a list of tables aren't in the flat index.
         current = self.config
         try:
             for key in key_path.split("."):
@@ -135,9 +155,14 @@ class ConfigManager:
             llms = self.get_list_values_from_config("llms", llm_name)
             return llms[0].get("aliases", {})
         except Exception as e:
-            logger.error(f"Failed to get aliases for model '{llms}': {e}")
+            logger.error("Failed to get aliases for model '%s': %s", llms, e)
         return None
 
+    def get_llm_settings(self, llm_name: str) -> Optional[Dict[str, Any]]:
+        """Get the provider table (base_url, api_key_env, aliases...) for the given LLM."""
+        llms = self.get_list_values_from_config("llms", llm_name)
+        return llms[0] if llms else None
+
     def save_as_preset(self, preset_name: str):
         """Save the temp config as a new preset."""
         temp_config = self.temp_config
@@ -149,7 +174,7 @@ class ConfigManager:
                 tomli_w.dump(temp_config, f)
                 console.log(f"Preset '{preset_name}' saved.")
         except Exception as e:
-            logger.error(f"Failed to save preset '{preset_name}': {e}")
+            logger.error("Failed to save preset '%s': %s", preset_name, e)
 
     def list_presets(self):
         """List all the available presets."""
@@ -159,7 +184,7 @@ class ConfigManager:
             presets = [preset.replace("_preset.toml", "") for preset in presets]
             return presets
         except Exception as e:
-            logger.error(f"Failed to list presets: {e}")
+            logger.error("Failed to list presets: %s", e)
         return []
 
     def load_preset(self, preset_name: str):
@@ -170,12 +195,11 @@ class ConfigManager:
             )
             with open(preset_file_path, "rb") as f:
                 preset = tomllib.load(f)
-            with open(self.temp_config_file, "wb") as f:
-                tomli_w.dump(preset, f)
-                logger.info(f"Configuration replaced with preset '{preset_name}'.")
+            self._write_temp_config(preset)
+            logger.info("Configuration replaced with preset '%s'.", preset_name)
         except Exception as e:
             logger.error(
-                f"Failed to replace configuration with preset '{preset_name}': {e}"
+                "Failed to replace configuration with preset '%s': %s", preset_name, e
             )
 
     def remove_preset(self, preset_name: str):
@@ -185,9 +209,9 @@ class ConfigManager:
                 self.presets_dir, f"{preset_name}_preset.toml"
             )
             os.remove(preset_file_path)
-            logger.info(f"Preset '{preset_name}' removed.")
+            logger.info("Preset '%s' removed.", preset_name)
         except Exception as e:
-            logger.error(f"Failed to remove preset '{preset_name}': {e}")
+            logger.error("Failed to remove preset '%s': %s", preset_name, e)
 
 
 # if __name__ == "__main__":
@@ -0,0 +1,132 @@
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROXY_URL = "http://0.0.0.0:4000"
+
+
+class ClientPool:
+    def __init__(self):
+        """
+        Keeps one AsyncOpenAI client per (base_url, api_key), so every request to the same endpoint
+        reuses the client's connection pool instead of opening new connections.
+        """
+        self._clients: Dict[Tuple[str, str], object] = {}
+
+    def get(self, base_url: str, api_key: Optional[str] = None):
+        """Returns the client for the endpoint, creating it on first use."""
+        key = (base_url, api_key or "anything")
+        client = self._clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=key[1], base_url=base_url)
+            self._clients[key] = client
+            logger.debug("Created LLM client for %s", base_url)
+        return client
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+
+
+class ProxyBackend:
+    def __init__(self, pool: ClientPool, proxy_url: str = DEFAULT_PROXY_URL):
+        """
+        Sends every request to the LiteLLM proxy, which resolves the model itself.
+        Args:
+            pool: The shared client pool.
+            proxy_url: The proxy's OpenAI-compatible base URL.
+        """
+        self.pool = pool
+        self.proxy_url = proxy_url
+
+    def resolve(self, chat_config) -> Tuple[object, str]:
+        """Returns the client and the model name to send for the chat config."""
+        return self.pool.get(self.proxy_url), chat_config.get("model")
+
+
+class DirectBackend:
+    def __init__(self, config_manager, pool: ClientPool):
+        """
+        Sends requests straight to the provider's OpenAI-compatible endpoint, skipping the proxy hop.
+        The preset's `api_service` picks the [[llms]] table and its `model` is looked up in that
+        table's aliases; models that are not aliases are sent as they are.
+        Args:
+            config_manager: Reads the [[llms]] tables.
+            pool: The shared client pool.
+        """
+        self.config_manager = config_manager
+        self.pool = pool
+        self._routes: Dict[Tuple[str, str], Tuple[str, Optional[str], str]] = {}
+
+    def _route(self, api_service: str, model: str) -> Tuple[str, Optional[str], str]:
+        settings = self.config_manager.get_llm_settings(api_service)
+        if not settings:
+            raise ValueError(f"No [[llms]] table for api_service '{api_service}'")
+        aliases = dict(self.config_manager.get_aliases_for_models(api_service) or {})
+        # Older configs put base_url after the aliases header, which makes it an alias.
+        base_url = settings.get("base_url") or aliases.pop("base_url", None)
+        if not base_url:
+            raise ValueError(f"No base_url configured for '{api_service}'")
+        model = model or settings.get("default_model")
+        target = aliases.get(model, model)
+        # Aliases carry LiteLLM's provider prefix ("openai/gpt-4-turbo-preview"); the provider
+        # itself only knows the part after it. Models that are not aliases are sent unchanged.
+        provider_model = target.split("/", 1)[-1] if target != model else target
+        api_key_env = settings.get("api_key_env")
+        api_key = os.environ.get(api_key_env) if api_key_env else None
+        return base_url, api_key, provider_model
+
+    def resolve(self, chat_config) -> Tuple[object, str]:
+        """Returns the client and the provider's model name for the chat config."""
+        key = (chat_config.get("api_service"), chat_config.get("model"))
+        route = self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = self._route(*key)
+        base_url, api_key, model = route
+        return self.pool.get(base_url, api_key), model
+
+
+class Backends:
+    def __init__(
+        self,
+        config_manager=None,
+        default_mode: str = "proxy",
+        proxy_url: str = DEFAULT_PROXY_URL,
+    ):
+        """
+        Picks the proxy or the direct backend per request, sharing one client pool between them.
+        Args:
+            config_manager: Optional. Needed for direct mode.
+            default_mode: "proxy" or "direct"; a preset's `backend` key overrides it.
+            proxy_url: The LiteLLM proxy's base URL.
+        """
+        self.default_mode = default_mode
+        self.pool = ClientPool()
+        self.proxy = ProxyBackend(self.pool, proxy_url)
+        self.direct = DirectBackend(config_manager, self.pool) if config_manager else None
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Builds the backends described by the [backend] config."""
+        settings = config_manager.get_value_from_config("backend") or {}
+        return cls(
+            config_manager,
+            default_mode=settings.get("mode", "proxy"),
+            proxy_url=settings.get("proxy_url", DEFAULT_PROXY_URL),
+        )
+
+    def resolve(self, chat_config) -> Tuple[object, str]:
+        mode = chat_config.get("backend", self.default_mode)
+        if mode == "direct":
+            if self.direct is None:
+                raise ValueError("Direct backend needs a config manager")
+            return self.direct.resolve(chat_config)
+        return self.proxy.resolve(chat_config)
+
+    async def aclose(self):
+        await self.pool.aclose()
@@ -1,34 +1,138 @@
+import asyncio
 import logging
+from typing import Optional
 
-from openai import AsyncOpenAI
-
+from mem.llms.backends import Backends
+from mem.llms.response_cache import ResponseCache, canonical_key
 from mem.toolkit.tools_manager import ToolsManager
+from mem.utils import tracing
+from mem.utils.helpers import convert_value
 
 logger = logging.getLogger(__name__)
 
-client = AsyncOpenAI(api_key="anything", base_url="http://0.0.0.0:4000")
+
+def is_streaming(chat_config) -> bool:
+    """Presets store `stream` either as a bool or as a string ("false")."""
+    stream = chat_config.get("stream", False)
+    if isinstance(stream, str):
+        return convert_value(stream, bool)
+    return bool(stream)
 
 
 class ProxyRequest:
     tools: ToolsManager
 
-    def __init__(self):
-        self.tools = ToolsManager()
+    def __init__(
+        self,
+        tools: Optional[ToolsManager] = None,
+        backends: Optional[Backends] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        """
+        Sends chat completion requests through the configured backend.
+        Args:
+            tools: Optional. The tools offered to the model.
+            backends: Optional. Resolves each request to a client and model; the LiteLLM proxy by default.
+            response_cache: Optional. Serves identical non-streaming requests without calling the model.
+        """
+        self.tools = tools or ToolsManager()
+        self.backends = backends or Backends()
+        self.response_cache = response_cache
+
+    def _request_args(self, chat_config, messages, use_tools=True):
+        client, model = self.backends.resolve(chat_config)
+        args = {
+            "model": model,
+            "messages": messages,
+            "temperature": chat_config.get("temperature"),
+        }
+        tools = self.tools.available_tools() if use_tools else None
+        if tools:
+            args["tools"] = tools
+            args["tool_choice"] = "auto"
+        return client, args
+
+    def _cache_key(self, chat_config, args) -> Optional[str]:
+        """
+        Returns the response cache key for the request, or None when it must not be cached:
+        no cache is configured, the preset sets `response_cache = false`, or it samples too hot.
+        """
+        if self.response_cache is None or chat_config.get("response_cache") is False:
+            return None
+        if not self.response_cache.accepts(args["temperature"]):
+            return None
+        return canonical_key(
+            f"{chat_config.get('api_service')}:{chat_config.get('model')}",
+            args["messages"],
+            args["temperature"],
+            self.tools.tools_digest if "tools" in args else None,
+        )
 
-    try:
+    async def llm_request(self, chat_config, messages, use_tools=True):
+        """
+        Sends the messages to the backend and waits for the complete response.
+        Returns None if the request fails.
+        """
+        with tracing.span(
+            "llm.request", model=chat_config.get("model"), messages=len(messages)
+        ) as span:
+            try:
+                client, args = self._request_args(chat_config, messages, use_tools)
+                cache_key = self._cache_key(chat_config, args)
+                if cache_key is not None:
+                    cached = self.response_cache.get(cache_key)
+                    span.set("cache", "miss" if cached is None else "hit")
+                    if cached is not None:
+                        from openai.types.chat import ChatCompletion
 
-        async def llm_request(self, chat_config, messages):
-            alias = chat_config.get("model")
+                        return ChatCompletion.model_validate_json(cached)
+                response = await client.chat.completions.create(**args)
+                if cache_key is not None:
+                    self.response_cache.set(cache_key, response.model_dump_json())
+                if response.usage is not None:
+                    span.set("prompt_tokens", response.usage.prompt_tokens)
+                    span.set("completion_tokens", response.usage.completion_tokens)
+                return response
+            except Exception as e:
+                logger.error("Error making request: %s", e)
+                span.record_error(e)
+                return None
 
-            response = await client.chat.completions.create(
-                model=alias,
-                messages=messages,
-                temperature=chat_config.get("temperature"),
-                tools=self.tools.available_tools(),
-                tool_choice="auto",
-            )
+    async def stream_request(self, chat_config, messages, use_tools=True):
+        """
+        Sends the messages to the backend with streaming enabled and yields each
+        completion chunk as it arrives. Yields nothing if the request fails.
+        """
+        # Started rather than entered: it must not stay current while the caller runs
+        # between chunks.
+        span = tracing.start_span(
+            "llm.stream", model=chat_config.get("model"), messages=len(messages)
+        )
+        try:
+            client, args = self._request_args(chat_config, messages, use_tools)
+            stream = await client.chat.completions.create(**args, stream=True)
+        except Exception as e:
+            logger.error("Error making streaming request: %s", e)
+            span.end(e)
+            return
 
-            return response
+        chunks = 0
+        error = None
+        try:
+            async for chunk in stream:
+                if not chunks:
+                    span.set("first_chunk_ms", round(span.elapsed_ms(), 3))
+                chunks += 1
+                yield chunk
+        except (Exception, asyncio.CancelledError) as e:
+            error = e
+            raise
+        finally:
+            span.set("chunks", chunks)
+            span.end(error)
 
-    except Exception as e:
-        logger.error(f"Error making request: {e}")
+    async def aclose(self):
+        await self.backends.aclose()
+        if self.response_cache is not None:
+            logger.info("LLM response cache: %s", self.response_cache.stats())
+            self.response_cache.close()
@@ -1,8 +1,14 @@
+import asyncio
 import json
 import logging
 from mem.llms.request import ProxyRequest
+from mem.llms.streaming import StreamAccumulator
+from mem.memory.long_term_memory import LongTermMemory
+from mem.messages.context_window import ContextWindow
 from mem.messages.messages_manager import Messages
+from mem.messages.prompt_builder import PrefixTracker, PromptBuilder
 from mem.toolkit.tools_manager import ToolsManager
+from mem.utils import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +19,11 @@ class RequestManager:
         messages: Messages,
         tools_manager: ToolsManager,
         proxy_request: ProxyRequest,
+        max_tool_rounds: int = 5,
+        tool_timeout: float = 15.0,
+        context_window: ContextWindow = None,
+        long_term_memory: LongTermMemory = None,
+        prompt_builder: PromptBuilder = None,
     ):
         """
         Manages requests to the backend API using the current chat configuration and user input.
@@ -20,60 +31,219 @@ class RequestManager:
             messages: Handles the collection of chat messages for context.
             tools_manager: Manages tool functions that can be called within the chat.
             proxy_request: Handles the actual API requests to the language model.
+            max_tool_rounds: How many rounds of tool calls the model may make before it must answer.
+            tool_timeout: Seconds each tool call may run, unless the tool's metadata sets its own timeout.
+            context_window: Optional. Selects the messages sent with each request; the full history is sent without it.
+            long_term_memory: Optional. Recalls chunks of earlier conversations related to the user's input.
+            prompt_builder: Optional. Supplies the time segment placed after the newest user message.
         """
         self.messages = messages
         self.tools_manager = tools_manager
         self.proxy_request = proxy_request
+        self.max_tool_rounds = max_tool_rounds
+        self.tool_timeout = tool_timeout
+        self.context_window = context_window
+        self.long_term_memory = long_term_memory
+        self.prompt_builder = prompt_builder
+        self.prefix_tracker = PrefixTracker()
 
     async def make_request(self, chat_config, user_input):
         """
-        Sends a request to the backend API and processes the response.
+        Sends a request to the backend API and processes the response. Tool calls are executed
+        and their results sent back to the model until it stops, or until the round limit is
+        reached, after which a final request is made with tools disabled.
         Args:
             chat_config: Configuration settings for the chat.
             user_input: The input message from the user.
         """
+        recalled = await self._recall(user_input)
         self.messages.add_message("user", user_input)
 
-        while True:
+        max_rounds = chat_config.get("max_tool_rounds", self.max_tool_rounds)
+        for round_number in range(max_rounds + 1):
             response = await self.proxy_request.llm_request(
-                chat_config, self.messages.messages
+                chat_config,
+                self.build_context(chat_config, recalled),
+                use_tools=round_number < max_rounds,
             )
-            if response:
-                return self._handle_response(response)
-            else:
+            if not response:
                 logger.error("Failed to receive a valid response from the API.")
                 raise ValueError("API request failed")
 
-    def _handle_response(self, response):
+            choice = response.choices[0]
+            message = choice.message.model_dump(exclude_none=True)
+            if choice.finish_reason == "tool_calls":
+                await self._execute_tool_calls(message)
+                continue
+            return self._handle_response(choice.finish_reason, message)
+
+        logger.error("Model kept calling tools after %s rounds.", max_rounds)
+        raise ValueError("Tool call round limit reached")
+
+    async def stream_request(self, chat_config, user_input):
         """
-        Handles responses from the API, depending on the response type.
+        Sends a streaming request to the backend API, yielding text deltas as they arrive.
+        The full assistant message, including any tool calls, is rebuilt from the chunks
+        and tool calls are executed between rounds exactly as in make_request.
         Args:
-            response: The received response from the API.
+            chat_config: Configuration settings for the chat.
+            user_input: The input message from the user.
         """
-        finish_reason = response.choices[0].finish_reason
-        message = response.choices[0].message
+        recalled = await self._recall(user_input)
+        self.messages.add_message("user", user_input)
 
-        if finish_reason == "tool_calls":
-            return self._execute_tool_call(message)
-        elif finish_reason == "stop":
-            self.messages.add_message("assistant", message.content)
-            return response
-        else:
-            logger.error(f"Unknown finish reason: {finish_reason}")
+        max_rounds = chat_config.get("max_tool_rounds", self.max_tool_rounds)
+        for round_number in range(max_rounds + 1):
+            accumulator = StreamAccumulator()
+            async for chunk in self.proxy_request.stream_request(
+                chat_config,
+                self.build_context(chat_config, recalled),
+                use_tools=round_number < max_rounds,
+            ):
+                delta = accumulator.add_chunk(chunk)
+                if delta:
+                    yield delta
+
+            if accumulator.finish_reason is None:
+                logger.error("Stream ended without a finish reason.")
+                raise ValueError("API request failed")
+
+            message = accumulator.to_message()
+            if accumulator.finish_reason == "tool_calls":
+                await self._execute_tool_calls(message)
+                continue
+            self._handle_response(accumulator.finish_reason, message)
+            return
+
+        logger.error("Model kept calling tools after %s rounds.", max_rounds)
+        raise ValueError("Tool call round limit reached")
+
+    async def _recall(self, user_input):
+        """
+        Looks up chunks of earlier conversations related to the input.
+        Returns a system message holding them, or None when nothing was recalled.
+        """
+        if self.long_term_memory is None:
+            return None
+        chunks = await self.long_term_memory.recall(user_input)
+        if not chunks:
             return None
+        return {
+            "role": "system",
+            "content": "Relevant parts of earlier conversations:\n\n"
+            + "\n\n".join(chunk["text"] for chunk in chunks),
+        }
+
+    def build_context(self, chat_config, recalled=None):
+        """
+        Returns the messages to send with the next request. Volatile segments (recalled chunks and
+        the current time) go right after the newest user message, so everything before it is
+        byte-identical to the previous request and can be served from the provider's prefix cache.
+        Args:
+            chat_config: The chat settings of the request; they pick the context window budget.
+            recalled: Optional. A system message with the chunks recalled from long-term memory.
+        """
+        if self.context_window is None:
+            context = [message.payload() for message in self.messages.messages]
+        else:
+            context = self.context_window.select(chat_config)
+        volatile = [recalled]
+        if self.prompt_builder is not None:
+            volatile.append(self.prompt_builder.session_context())
+        volatile = [message for message in volatile if message is not None]
+        if volatile:
+            position = next(
+                (
+                    i + 1
+                    for i in range(len(context) - 1, -1, -1)
+                    if context[i]["role"] == "user"
+                ),
+                len(context),
+            )
+            context[position:position] = volatile
 
-    def _execute_tool_call(self, message):
+        reused, total = self.prefix_tracker.observe(context)
+        logger.debug("Prompt prefix reused: %s of %s bytes", reused, total)
+        return context
+
+    def _handle_response(self, finish_reason, message):
         """
-        Executes a specific tool call as requested by the backend API.
+        Handles the final response of a turn, depending on the response type. Whatever text the
+        model produced is added to the conversation, since a streamed reply has already been shown.
+        A reply cut off at max_tokens is kept and returned with a warning; any other stop raises.
         Args:
-            message: The message object containing the tool call information.
+            finish_reason: The reason the model stopped generating.
+            message: The assistant message as a dict.
         """
-        function_name = message.tool_calls[0].function.name
-        function_args = json.loads(message.tool_calls[0].function.arguments)
-        function_to_call = self.tools_manager.toolkit[function_name]
-        function_response = await function_to_call(**function_args)
+        content = message.get("content")
+        if finish_reason in ("stop", "length") or content:
+            self.messages.add_message("assistant", content)
+        if finish_reason == "stop":
+            return content
+        if finish_reason == "length":
+            logger.warning("Response was cut off at the max_tokens limit.")
+            return content
+        logger.error("Response ended with finish reason: %s", finish_reason)
+        raise ValueError(f"Response ended with finish reason: {finish_reason}")
 
+    async def _execute_tool_calls(self, message):
+        """
+        Runs every tool call in the message concurrently and adds the results to the
+        conversation as `tool` messages linked to their calls by id.
+        Args:
+            message: The assistant message dict containing the tool calls.
+        """
+        tool_calls = message.get("tool_calls", [])
         self.messages.add_message(
-            "function", f"The result of {function_name} was: {function_response}"
+            "assistant", message.get("content"), tool_calls=tool_calls
         )
-        return function_response
+
+        try:
+            results = await asyncio.gather(
+                *(self._execute_tool_call(tool_call) for tool_call in tool_calls)
+            )
+        except asyncio.CancelledError:
+            # Every tool call needs an answer or the next request is rejected.
+            for tool_call in tool_calls:
+                self.messages.add_message(
+                    "tool",
+                    json.dumps({"error": "cancelled"}),
+                    tool_call_id=tool_call["id"],
+                )
+            raise
+        for tool_call, result in zip(tool_calls, results):
+            self.messages.add_message("tool", result, tool_call_id=tool_call["id"])
+        return results
+
+    async def _execute_tool_call(self, tool_call):
+        """
+        Executes a single tool call under its timeout. Failures are returned to the model
+        as an error payload instead of aborting the other calls of the turn.
+        Args:
+            tool_call: The tool call dict from the assistant message.
+        Returns:
+            The tool result serialized as a string.
+        """
+        function_name = tool_call["function"]["name"]
+        timeout = (
+            self.tools_manager.toolkit.get(function_name, {})
+            .get("metadata", {})
+            .get("timeout", self.tool_timeout)
+        )
+        with tracing.span(f"tool.{function_name}") as span:
+            try:
+                function_args = json.loads(tool_call["function"]["arguments"] or "{}")
+                function_response = await asyncio.wait_for(
+                    self.tools_manager.execute_tool(function_name, **function_args),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError as e:
+                logger.error("Tool %s timed out after %ss.", function_name, timeout)
+                span.record_error(e)
+                function_response = {"error": f"{function_name} timed out"}
+            except Exception as e:
+                logger.error("Tool %s failed: %s", function_name, e)
+                span.record_error(e)
+                function_response = {"error": str(e)}
+
+        return json.dumps(function_response, default=str)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only what the provider actually sees decides a hit; timestamps and other
+# bookkeeping keys on stored messages are left out of the key.
+_MESSAGE_KEYS = ("role", "content", "name", "tool_calls", "tool_call_id")
+
+
+def canonical_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float],
+    tools: Any = None,
+) -> str:
+    """
+    Hashes (model alias, messages, temperature, tool schema) into a stable cache key.
+    Dict key order and whitespace don't change the key. The tool schema may be passed
+    as the schemas themselves or as a digest of them.
+    """
+    payload = {
+        "model": model,
+        "messages": [
+            {key: message[key] for key in _MESSAGE_KEYS if message.get(key) is not None}
+            for message in messages
+        ],
+        "temperature": temperature,
+        "tools": tools,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400,
+        max_entries: int = 5000,
+        max_temperature: Optional[float] = None,
+    ):
+        """
+        An exact-match cache of LLM responses in SQLite, so replaying an identical prompt is a
+        local lookup instead of an API call. Entries expire after ttl seconds and the least
+        recently used ones are evicted beyond max_entries.
+        Args:
+            path: The SQLite database file.
+            ttl: Seconds a response stays valid.
+            max_entries: How many responses are kept.
+            max_temperature: Optional. Requests sampled hotter than this are never cached.
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(self.path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+
+    def accepts(self, temperature: Optional[float]) -> bool:
+        """Whether a request at this temperature may be served from or stored in the cache."""
+        if self.max_temperature is None or temperature is None:
+            return True
+        if temperature > self.max_temperature:
+            self.bypassed += 1
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the stored response JSON for the key, or None on a miss."""
+        now = time.time()
+        row = self.db.execute(
+            "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+        self.db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, response: str):
+        """Stores a response JSON and evicts expired and least recently used entries."""
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+            (key, response, now + self.ttl, now),
+        )
+        self.db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self.db.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+            "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        self.db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        (entries,) = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "entries": entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.db.close()
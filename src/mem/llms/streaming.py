@@ -0,0 +1,64 @@
+from typing import Any, Dict, List, Optional
+
+
+class StreamAccumulator:
+    def __init__(self):
+        """
+        Rebuilds a complete assistant message from streamed chat completion chunks.
+        Content deltas are concatenated, and tool call deltas are merged by their index
+        since the id and function name only arrive on the first delta of each call.
+        """
+        self.content_parts: List[str] = []
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason: Optional[str] = None
+
+    def add_chunk(self, chunk) -> Optional[str]:
+        """
+        Merges a single chunk into the message being rebuilt.
+        Args:
+            chunk: A ChatCompletionChunk received from the stream.
+        Returns:
+            The text delta carried by the chunk, if any.
+        """
+        if not chunk.choices:
+            return None
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+        delta = choice.delta
+        if delta is None:
+            return None
+
+        for tool_call in delta.tool_calls or []:
+            entry = self.tool_calls.setdefault(
+                tool_call.index,
+                {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tool_call.id:
+                entry["id"] = tool_call.id
+            if tool_call.function:
+                if tool_call.function.name:
+                    entry["function"]["name"] += tool_call.function.name
+                if tool_call.function.arguments:
+                    entry["function"]["arguments"] += tool_call.function.arguments
+
+        if delta.content:
+            self.content_parts.append(delta.content)
+            return delta.content
+        return None
+
+    @property
+    def content(self) -> str:
+        return "".join(self.content_parts)
+
+    def to_message(self) -> Dict[str, Any]:
+        """
+        Returns the rebuilt assistant message in the same shape as a non-streamed response message.
+        """
+        message: Dict[str, Any] = {"role": "assistant", "content": self.content or None}
+        if self.tool_calls:
+            message["tool_calls"] = [
+                self.tool_calls[index] for index in sorted(self.tool_calls)
+            ]
+        return message
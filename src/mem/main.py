@@ -6,11 +6,14 @@ from mem.utils.logging_setup import setup_logging
 
 def setup_initial_configurations():
     """Load or initialize configuration settings that are critical for the app."""
-    config_manager = ConfigManager()
     try:
-        config_manager.load_global_config()  # Assuming a method to load global configs
+        # Parses the app config once; later ConfigManager instances in this process
+        # (and the next startup, through the on-disk snapshot) reuse the parsed result.
+        config_manager = ConfigManager()
     except Exception as e:
-        logging.error(f"Failed to load configurations: {e}")
+        logging.error("Failed to load configurations: %s", e)
+        raise SystemExit("Could not load initial configurations. Exiting.")
+    if not config_manager.config:
         raise SystemExit("Could not load initial configurations. Exiting.")
 
 
@@ -22,7 +25,7 @@ def main():
     try:
         cli()  # Start the CLI interface
     except Exception as e:
-        logging.critical(f"Unhandled exception in the CLI: {e}", exc_info=True)
+        logging.critical("Unhandled exception in the CLI: %s", e, exc_info=True)
         raise SystemExit(f"Exiting due to an unhandled exception: {e}")
 
 
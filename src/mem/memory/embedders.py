@@ -0,0 +1,76 @@
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row so a dot product is the cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 256):
+        """
+        A deterministic bag-of-words embedder using the hashing trick. It needs no model or
+        network, so it is meant for offline use and tests; similar wording gives similar vectors.
+        Args:
+            dim: Number of dimensions of the produced vectors.
+        """
+        self.dim = dim
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_PATTERN.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return normalize_rows(vectors)
+
+
+class OpenAIEmbedder:
+    def __init__(self, model: str, base_url: str, dim: int, api_key: str = "anything"):
+        """
+        Embeds text through an OpenAI-compatible embeddings endpoint, e.g. ollama's.
+        Args:
+            model: The embedding model name, e.g. "nomic-embed-text".
+            base_url: The OpenAI-compatible endpoint.
+            dim: Number of dimensions the model produces.
+            api_key: Optional. Local endpoints ignore it but the client requires one.
+        """
+        self.model = model
+        self.dim = dim
+        self.base_url = base_url
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        response = await self.client.embeddings.create(model=self.model, input=texts)
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        return normalize_rows(vectors)
+
+
+def build_embedder(settings):
+    """
+    Builds the embedder named by the [vector] config table. Falls back to the hashing embedder.
+    """
+    if settings.get("embedding_api", "hashing") == "hashing":
+        return HashingEmbedder(settings.get("dim", 256))
+    return OpenAIEmbedder(
+        settings["embedding_model"], settings["embedding_base_url"], settings["dim"]
+    )
@@ -0,0 +1,96 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from mem.memory.vector_store import VectorStore
+from mem.messages.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_messages(messages: List[Message], chunk_size: int) -> List[str]:
+    """
+    Joins messages into "role: content" lines and packs them into chunks of roughly
+    chunk_size characters, never splitting a message unless it is longer than a chunk.
+    """
+    chunks: List[str] = []
+    current = ""
+    for message in messages:
+        if not message.content or message.role not in ("user", "assistant"):
+            continue
+        line = f"{message.role}: {message.content}"
+        while len(line) > chunk_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:chunk_size])
+            line = line[chunk_size:]
+        if current and len(current) + len(line) + 1 > chunk_size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class LongTermMemory:
+    def __init__(
+        self,
+        store: VectorStore,
+        embedder,
+        chunk_size: int = 1000,
+        top_k: int = 3,
+        scope: Optional[str] = None,
+    ):
+        """
+        Archives conversation chunks in a VectorStore and recalls the ones most related to new input.
+        Args:
+            store: The VectorStore holding the chunks.
+            embedder: Any object with an async embed(texts) method returning an (n, dim) array.
+            chunk_size: Approximate number of characters per stored chunk.
+            top_k: Number of chunks recalled per query.
+            scope: Optional. Tags archived chunks and limits recall to chunks with the same tag;
+                   without it every chunk in the store can be recalled.
+        """
+        self.store = store
+        self.embedder = embedder
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.scope = scope
+
+    def scoped(self, scope: str) -> "LongTermMemory":
+        """
+        Returns a LongTermMemory over the same store and embedder that only archives to and
+        recalls from the given scope, e.g. one server session.
+        """
+        return LongTermMemory(
+            self.store, self.embedder, self.chunk_size, self.top_k, scope=scope
+        )
+
+    async def remember(self, messages: List[Message]) -> List[str]:
+        """
+        Chunks, embeds and appends the messages to the store.
+        Returns:
+            The ids of the stored chunks.
+        """
+        chunks = chunk_messages(messages, self.chunk_size)
+        if not chunks:
+            return []
+        vectors = await self.embedder.embed(chunks)
+        metadata = None
+        if self.scope is not None:
+            metadata = [{"scope": self.scope} for _ in chunks]
+        return self.store.add(vectors, chunks, metadata)
+
+    async def recall(self, query: str, k: int = None) -> List[Dict[str, Any]]:
+        """
+        Returns the stored chunks most similar to the query, best first.
+        """
+        if not query or not len(self.store):
+            return []
+        try:
+            vector = (await self.embedder.embed([query]))[0]
+        except Exception as e:
+            logger.error("Failed to embed recall query: %s", e)
+            return []
+        return self.store.search(vector, k or self.top_k, scope=self.scope)
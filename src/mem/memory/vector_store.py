@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+METADATA_FILE = "metadata.jsonl"
+HEADER_FILE = "store.json"
+
+
+class VectorStore:
+    def __init__(self, directory: str, dim: int):
+        """
+        An append-only store of embedded text chunks. Vectors live in a raw float32 file that is
+        memory-mapped for search; ids, text and metadata live in a JSONL sidecar with one line per row.
+        Args:
+            directory: Directory holding the store's files; created if missing.
+            dim: Dimension of the stored vectors. Must match the dimension the store was created with.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.dim = dim
+        self.vectors_path = os.path.join(self.directory, VECTORS_FILE)
+        self.metadata_path = os.path.join(self.directory, METADATA_FILE)
+        self.records: List[Dict[str, Any]] = []
+        # Row indexes of the chunks stored under each scope, so a scoped search only scores its rows.
+        self._scopes: Dict[str, List[int]] = {}
+        self._matrix: Optional[np.memmap] = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._check_header()
+        self._load()
+
+    def __len__(self):
+        return len(self.records)
+
+    def _check_header(self):
+        header_path = os.path.join(self.directory, HEADER_FILE)
+        if os.path.exists(header_path):
+            with open(header_path, "r") as f:
+                stored_dim = json.load(f)["dim"]
+            if stored_dim != self.dim:
+                raise ValueError(
+                    f"Vector store at {self.directory} has dim {stored_dim}, expected {self.dim}."
+                )
+        else:
+            with open(header_path, "w") as f:
+                json.dump({"dim": self.dim}, f)
+
+    def _load(self):
+        """
+        Reads the sidecar and maps the vectors. A partially written append (after a crash) is
+        trimmed so rows and metadata lines always line up.
+        """
+        if os.path.exists(self.metadata_path):
+            with open(self.metadata_path, "r") as f:
+                for line in f:
+                    try:
+                        self.records.append(json.loads(line))
+                    except ValueError:
+                        break
+
+        row_bytes = self.dim * 4
+        vector_rows = (
+            os.path.getsize(self.vectors_path) // row_bytes
+            if os.path.exists(self.vectors_path)
+            else 0
+        )
+        rows = min(vector_rows, len(self.records))
+        if rows != vector_rows or rows != len(self.records):
+            logger.warning(
+                "Trimming vector store at %s to %s rows.", self.directory, rows
+            )
+            self.records = self.records[:rows]
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+            with open(self.metadata_path, "w") as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.records)
+        self._index_scopes(0)
+        self._remap()
+
+    def _index_scopes(self, start: int):
+        for row in range(start, len(self.records)):
+            scope = self.records[row]["metadata"].get("scope")
+            if scope is not None:
+                self._scopes.setdefault(scope, []).append(row)
+
+    def _remap(self):
+        rows = len(self.records)
+        self._matrix = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            if rows
+            else None
+        )
+
+    def add(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        Appends vectors and their text to the store without rewriting existing rows.
+        Args:
+            vectors: An (n, dim) array of L2-normalized vectors.
+            texts: The n chunks of text the vectors were computed from.
+            metadata: Optional. One dict of extra metadata per chunk.
+        Returns:
+            The ids assigned to the new chunks.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}.")
+        metadata = metadata or [{} for _ in texts]
+        records = [
+            {"id": uuid.uuid4().hex, "text": text, "metadata": meta}
+            for text, meta in zip(texts, metadata)
+        ]
+
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.metadata_path, "a") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+        start = len(self.records)
+        self.records.extend(records)
+        self._index_scopes(start)
+        self._remap()
+        return [record["id"] for record in records]
+
+    def search(
+        self, query: np.ndarray, k: int = 3, scope: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the k chunks most similar to the query vector, best first.
+        Args:
+            query: A (dim,) L2-normalized query vector.
+            k: Number of results to return.
+            scope: Optional. Only search the chunks added with this "scope" metadata.
+        """
+        if self._matrix is None or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        if scope is None:
+            rows = np.arange(len(self.records))
+            scores = self._matrix @ query
+        else:
+            rows = np.asarray(self._scopes.get(scope, []), dtype=np.intp)
+            if not len(rows):
+                return []
+            scores = self._matrix[rows] @ query
+        k = min(k, scores.shape[0])
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [{**self.records[rows[i]], "score": float(scores[i])} for i in top]
@@ -0,0 +1,180 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough per-message overhead of the chat format (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_TOKEN_BUDGET = 6000
+DEFAULT_RESPONSE_TOKENS = 1000
+
+# Encoders (and failures to load one) are shared by every ContextWindow in the process,
+# so a second session neither reloads an encoding nor retries an unreachable download.
+_encoders: Dict[Optional[str], Any] = {}
+
+
+def _load_encoder(model: Optional[str]):
+    """
+    Returns a tiktoken encoder for the model, or None if tiktoken isn't installed or its
+    encoding files can't be fetched, in which case token counts are estimated from the
+    character count.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model((model or "").split("/")[-1])
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("Falling back to estimated token counts: %s", e)
+        return None
+
+
+class ContextWindow:
+    def __init__(self, message_manager, settings: Optional[Dict[str, Any]] = None):
+        """
+        Picks which messages to send with each request so the prompt stays inside a per-model
+        token budget. System messages and the current turn are always kept, the rest of the budget
+        is filled with the most recent whole turns, so tool calls are never separated from their results.
+        Token counts are memoized per message and dropped when Messages reports a change; messages
+        that leave the window release their cached payloads.
+        Args:
+            message_manager: The Messages instance to select from.
+            settings: Optional. The [messages] config table (n_number, token_budget, model_budgets).
+        """
+        settings = settings or {}
+        self.message_manager = message_manager
+        self.max_turns = settings.get("n_number")
+        self.token_budget = settings.get("token_budget", DEFAULT_TOKEN_BUDGET)
+        self.model_budgets = settings.get("model_budgets", {})
+        self.response_tokens = settings.get("response_tokens", DEFAULT_RESPONSE_TOKENS)
+        self.dropped_count = 0
+        self.window_start = 0
+        self.summary: Optional[str] = None
+        self._token_counts: Dict[int, int] = {}
+        self.message_manager.subscribe(self)
+
+    def update(self, event_type, message, index=None):
+        """
+        Invalidates the memoized token count of a modified or deleted message, and keeps
+        window_start on the same message when one before it is deleted.
+        """
+        if event_type in ("modify", "delete"):
+            self._token_counts.pop(id(message), None)
+        if event_type == "delete" and index is not None and index < self.window_start:
+            self.window_start -= 1
+
+    def set_summary(self, summary: Optional[str]):
+        """
+        Sets the running summary of the messages that no longer fit in the window.
+        It is sent as a system message whenever older messages are left out.
+        """
+        self.summary = summary
+
+    def budget_for(self, chat_config) -> int:
+        """Returns the prompt token budget for the configured model."""
+        model = chat_config.get("model")
+        budget = self.model_budgets.get(model, self.token_budget)
+        return budget - (chat_config.get("max_tokens") or self.response_tokens)
+
+    def count_tokens(self, message, model=None) -> int:
+        """Returns the token count of a message, computing it only the first time."""
+        key = id(message)
+        count = self._token_counts.get(key)
+        if count is None:
+            count = MESSAGE_OVERHEAD_TOKENS + self._count_text(
+                message.content or "", model
+            )
+            if message.tool_calls:
+                count += self._count_text(json.dumps(message.tool_calls), model)
+            self._token_counts[key] = count
+        return count
+
+    def select(self, chat_config) -> List[Dict[str, Any]]:
+        """
+        Returns the payloads of the messages to send for the next request, in their original order.
+        Args:
+            chat_config: Configuration settings for the chat, used for the model and max_tokens.
+        """
+        messages = self.message_manager.messages
+        model = chat_config.get("model")
+        budget = self.budget_for(chat_config)
+
+        system = [i for i, message in enumerate(messages) if message.role == "system"]
+        units = self._group_units(messages)
+
+        selected = list(system)
+        used = sum(self.count_tokens(messages[i], model) for i in system)
+        summary_message = self._summary_message()
+        if summary_message is not None:
+            used += MESSAGE_OVERHEAD_TOKENS + self._count_text(
+                summary_message["content"], model
+            )
+        turns = 0
+        for unit in reversed(units):
+            cost = sum(self.count_tokens(messages[i], model) for i in unit)
+            # The latest turn is always sent, whatever it costs.
+            if turns > 0:
+                if used + cost > budget:
+                    break
+                if self.max_turns and turns >= self.max_turns:
+                    break
+            selected.extend(unit)
+            used += cost
+            turns += 1
+
+        selected.sort()
+        self.dropped_count = len(messages) - len(selected)
+        window_start = next(
+            (i for i in selected if messages[i].role != "system"), len(messages)
+        )
+        for message in messages[self.window_start : window_start]:
+            if message.role != "system":
+                message.release_payload()
+        self.window_start = window_start
+        context = [messages[i].payload() for i in selected]
+        if self.dropped_count:
+            logger.debug(
+                "Context window: sending %s of %s messages, ~%s tokens.",
+                len(selected),
+                len(messages),
+                used,
+            )
+            if summary_message is not None:
+                context.insert(len(system), summary_message)
+        return context
+
+    def _summary_message(self) -> Optional[Dict[str, Any]]:
+        if not self.summary:
+            return None
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation: {self.summary}",
+        }
+
+    def _group_units(self, messages) -> List[List[int]]:
+        """
+        Groups non-system message indexes into turns, each starting at a user message, which are
+        kept or dropped as a whole so tool calls are never separated from their results.
+        """
+        units: List[List[int]] = []
+        for i, message in enumerate(messages):
+            if message.role == "system":
+                continue
+            if message.role == "user" or not units:
+                units.append([i])
+            else:
+                units[-1].append(i)
+        return units
+
+    def _count_text(self, text: str, model) -> int:
+        if model not in _encoders:
+            _encoders[model] = _load_encoder(model)
+        encoder = _encoders[model]
+        if encoder is None:
+            return len(text) // 4 + 1
+        return len(encoder.encode(text))
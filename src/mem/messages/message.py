@@ -0,0 +1,97 @@
+import sys
+import time
+from datetime import datetime as dt
+from typing import Any, Dict, List, Optional
+
+# Every message of a role shares one string object, including messages loaded from a session log.
+ROLES = {role: sys.intern(role) for role in ("system", "user", "assistant", "tool")}
+
+
+class Message:
+    __slots__ = (
+        "role",
+        "content",
+        "timestamp",
+        "name",
+        "tool_calls",
+        "tool_call_id",
+        "_payload",
+    )
+
+    def __init__(
+        self,
+        role: str,
+        content: Optional[str],
+        timestamp: Optional[float] = None,
+        name: Optional[str] = None,
+        tool_calls: Optional[List[Dict[str, Any]]] = None,
+        tool_call_id: Optional[str] = None,
+    ):
+        """
+        One stored chat message. Slots instead of a dict per message keep long conversations small,
+        and payload() builds the dict the provider is sent only once, not on every request.
+        Args:
+            role: 'system', 'user', 'assistant' or 'tool'.
+            content: The text content of the message.
+            timestamp: Optional. Seconds since the epoch; the current time when not given.
+            name: Optional. A name associated with the message.
+            tool_calls: Optional. The tool calls requested by an assistant message.
+            tool_call_id: Optional. The id of the tool call a 'tool' message answers.
+        """
+        self.role = ROLES.get(role) or sys.intern(role)
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.name = name
+        self.tool_calls = tool_calls or None
+        self.tool_call_id = tool_call_id or None
+        self._payload: Optional[Dict[str, Any]] = None
+
+    def set_content(self, content: Optional[str]):
+        """Replaces the content and drops the cached payload."""
+        self.content = content
+        self._payload = None
+
+    def payload(self) -> Dict[str, Any]:
+        """
+        Returns the message as the provider expects it, without the timestamp or unset fields.
+        The dict is cached and shared between requests, so callers must not modify it.
+        """
+        payload = self._payload
+        if payload is None:
+            payload = {"role": self.role, "content": self.content}
+            if self.name:
+                payload["name"] = self.name
+            if self.tool_calls:
+                payload["tool_calls"] = self.tool_calls
+            if self.tool_call_id:
+                payload["tool_call_id"] = self.tool_call_id
+            self._payload = payload
+        return payload
+
+    def release_payload(self):
+        """Drops the cached payload of a message that is no longer being sent."""
+        self._payload = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the message with its timestamp, as stored in session logs."""
+        data = dict(self.payload())
+        data["timestamp"] = self.timestamp
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """Rebuilds a stored message. ISO timestamps written by older versions are converted."""
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = dt.fromisoformat(timestamp).timestamp()
+        return cls(
+            data["role"],
+            data.get("content"),
+            timestamp=timestamp,
+            name=data.get("name"),
+            tool_calls=data.get("tool_calls"),
+            tool_call_id=data.get("tool_call_id"),
+        )
+
+    def __repr__(self):
+        return f"Message(role={self.role!r}, content={self.content!r})"
@@ -1,58 +1,61 @@
+import asyncio
 import logging
-from datetime import datetime as dt
 import json
 
-from jinja2 import Template
+from mem.messages.message import Message
+from mem.messages.prompt_builder import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
-Default_System_Template = Template(
-    """
-    You are a helpful assistant named Em. Please address the user as: Jacob.
-    You have access to some tools. Please use them if you need to look up
-    something like Jacob's current Location or the Weather. The current date/time
-    is: {{ timestamp }}.
-"""
-)
-
 
 class Messages:
-    def __init__(self):
+    def __init__(self, store=None):
         """
         Manages a list of messages within the chat application, providing capabilities for real-time updates and modifications.
+        Args:
+            store: Optional. A SessionStore the messages are resumed from and every change is appended to.
         """
-        self.messages = []
+        self.store = store
+        self.messages = store.load() if store is not None else []
 
         self.subscribers = []
 
-    def add_system_message(self):
+    def _persist(self, op, *args):
+        """
+        Appends a change record to the session store, compacting the log when it has grown too long.
+        """
+        if self.store is None:
+            return
+        getattr(self.store, f"record_{op}")(*args)
+        if self.store.needs_compaction():
+            self.store.compact(self.messages)
+
+    def add_system_message(self, content=None):
         """
         Adds a system message to the list with metadata and notifies subscribers of the addition.
+        Args:
+            content: Optional. The system prompt; the default persona with tool instructions when not given.
         """
-        system_message = {
-            "role": "system",
-            "content": Default_System_Template.render(
-                timestamp=dt.now().isoformat()
-            ).strip(),
-        }
+        system_message = Message("system", content or PromptBuilder().system_prompt())
         self.messages.append(system_message)
+        self._persist("add", system_message)
 
-    def add_message(self, role, content, name=None):
+    def add_message(self, role, content, name=None, tool_calls=None, tool_call_id=None):
         """
         Adds a message to the list with metadata and notifies subscribers of the addition.
         Args:
-            role: The role of the message sender ('user' or 'assistant').
+            role: The role of the message sender ('user', 'assistant' or 'tool').
             content: The text content of the message.
             name: Optional. A name associated with the message.
+            tool_calls: Optional. The tool calls requested by an assistant message.
+            tool_call_id: Optional. The id of the tool call a 'tool' message answers.
         """
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "name": name,
-        }
+        message = Message(
+            role, content, name=name, tool_calls=tool_calls, tool_call_id=tool_call_id
+        )
         self.messages.append(message)
-        self.notify_subscribers("add", message)
+        self._persist("add", message)
+        self.notify_subscribers("add", message, len(self.messages) - 1)
 
     def modify_message(self, index, new_content):
         """
@@ -62,8 +65,9 @@ class Messages:
             new_content: The new content to replace the existing message content.
         """
         if 0 <= index < len(self.messages):
-            self.messages[index]["content"] = new_content
-            self.notify_subscribers("modify", self.messages[index])
+            self.messages[index].set_content(new_content)
+            self._persist("modify", index, new_content)
+            self.notify_subscribers("modify", self.messages[index], index)
 
     def delete_message(self, index):
         """
@@ -73,23 +77,43 @@ class Messages:
         """
         if 0 <= index < len(self.messages):
             removed_message = self.messages.pop(index)
-            self.notify_subscribers("delete", removed_message)
+            self._persist("delete", index)
+            self.notify_subscribers("delete", removed_message, index)
+
+    def save_summary(self, summary, summarized_upto):
+        """
+        Stores the running summary, and how many leading messages it covers, with the session.
+        Args:
+            summary: The running summary of the messages that left the context window.
+            summarized_upto: The index of the first message not yet summarized or archived.
+        """
+        self._persist("summary", summarized_upto, summary)
+
+    def saved_summary(self):
+        """
+        Returns the (summary, summarized_upto) stored with the session, or (None, 0) without one.
+        """
+        if self.store is None:
+            return None, 0
+        return self.store.summary, self.store.summarized_upto
 
     def get_messages(self):
         """
-        Returns a JSON string of all messages, typically used for saving or logging purposes.
+        Returns a JSON string of all messages, typically used for logging purposes.
+        Sessions are persisted incrementally through the store, not through this dump.
         """
-        return json.dumps(self.messages, indent=2)
+        return json.dumps([message.to_dict() for message in self.messages], indent=2)
 
-    def notify_subscribers(self, event_type, message):
+    def notify_subscribers(self, event_type, message, index=None):
         """
         Notifies all subscribed observers about message events.
         Args:
             event_type: The type of event ('add', 'modify', 'delete').
             message: The message associated with the event.
+            index: Optional. The message's position; for 'delete', where it was before removal.
         """
         for subscriber in self.subscribers:
-            subscriber.update(event_type, message)
+            subscriber.update(event_type, message, index)
 
     def subscribe(self, observer):
         """
@@ -107,31 +131,120 @@ class Messages:
         """
         self.subscribers.remove(observer)
 
+    def close(self):
+        """
+        Syncs and closes the session store, if there is one.
+        """
+        if self.store is not None:
+            self.store.close()
+
 
 class MemoryManager:
-    def __init__(self, message_manager):
+    def __init__(
+        self,
+        message_manager,
+        context_window=None,
+        summarizer=None,
+        long_term_memory=None,
+        debounce: float = 2.0,
+        batch_size: int = 6,
+    ):
         """
         Initializes a MemoryManager that works closely with Messages to manage and process message data.
+        Messages that have been pushed out of the context window are folded into a running summary
+        and archived in long-term memory by a background task, so the user's turn never waits on either.
+        The summary and how far it reaches are stored with the session, so a resumed session neither
+        loses the summary nor archives the same messages again.
         Args:
             message_manager: The associated Messages instance.
+            context_window: Optional. The ContextWindow whose dropped messages get summarized.
+            summarizer: Optional. The Summarizer used to fold messages into the summary.
+            long_term_memory: Optional. The LongTermMemory dropped messages are archived in for later recall.
+            debounce: Seconds to wait after a new message before summarizing, so bursts are batched.
+            batch_size: Minimum number of dropped messages worth a summarizer call.
         """
         self.message_manager = message_manager
         self.message_manager.subscribe(self)
-
-    def update(self, event_type, message):
+        self.context_window = context_window
+        self.summarizer = summarizer
+        self.long_term_memory = long_term_memory
+        self.debounce = debounce
+        self.batch_size = batch_size
+        self.summary, self.summarized_upto = message_manager.saved_summary()
+        if self.summary and context_window is not None:
+            context_window.set_summary(self.summary)
+        self._task = None
+
+    def update(self, event_type, message, index=None):
         """
         Handles updates from the Messages instance, processing new, modified, or deleted messages.
         Args:
             event_type: The type of message event ('add', 'modify', 'delete').
             message: The message involved in the event.
+            index: Optional. The message's position; for 'delete', where it was before removal.
         """
         if event_type == "add":
             self.process_new_message(message)
+        elif event_type == "delete" and index is not None and index < self.summarized_upto:
+            # The messages after a deleted summarized one move down by one.
+            self.summarized_upto -= 1
 
     def process_new_message(self, message):
         """
-        Processes a new message, typically involves analyzing or storing message data.
+        Processes a new message by scheduling a background summarization pass, if one isn't already pending.
         Args:
             message: The new message to process.
         """
-        pass
+        if self.context_window is None:
+            return
+        if self.summarizer is None and self.long_term_memory is None:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._summarize_dropped())
+
+    def _dropped_messages(self):
+        """
+        Returns the messages that are out of the context window but not yet in the summary.
+        """
+        window_start = self.context_window.window_start
+        return [
+            message
+            for message in self.message_manager.messages[self.summarized_upto : window_start]
+            if message.role != "system"
+        ], window_start
+
+    async def _summarize_dropped(self):
+        await asyncio.sleep(self.debounce)
+        dropped, window_start = self._dropped_messages()
+        if len(dropped) < self.batch_size:
+            return
+        try:
+            if self.long_term_memory is not None:
+                await self.long_term_memory.remember(dropped)
+            if self.summarizer is not None:
+                self.summary = await self.summarizer.summarize(self.summary, dropped)
+                self.context_window.set_summary(self.summary)
+        except Exception as e:
+            logger.error("Background summarization failed: %s", e)
+            return
+        self.summarized_upto = window_start
+        self.message_manager.save_summary(self.summary, window_start)
+        logger.debug(
+            "Processed %s messages that left the context window.", len(dropped)
+        )
+
+    async def aclose(self):
+        """
+        Cancels any pending summarization pass.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
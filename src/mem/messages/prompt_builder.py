@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+from datetime import datetime as dt
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+# Templates are compiled once at import. Everything in the system prompt is static for a
+# session so providers can reuse the cached prefix; the current time is rendered into a
+# separate segment that is placed after the newest user message instead.
+Default_Persona_Template = Template(
+    "You are a helpful assistant named {{ assistant_name }}. "
+    "Please address the user as: {{ user_name }}."
+)
+
+Tools_Template = Template(
+    "You have access to some tools. Please use them if you need to look up "
+    "something like {{ user_name }}'s current Location or the Weather."
+)
+
+Session_Context_Template = Template("The current date/time is: {{ now }}.")
+
+_TIME_FORMATS = {
+    "minute": "%A, %d %B %Y %H:%M",
+    "hour": "%A, %d %B %Y %H:00",
+    "day": "%A, %d %B %Y",
+}
+
+
+class PromptBuilder:
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        """
+        Assembles the system prompt once per session and the time segment at coarse granularity,
+        so the bytes at the start of every request stay identical from turn to turn.
+        Args:
+            settings: Optional. The [prompts] config table: assistant_name, user_name and
+                      time_granularity ("minute", "hour", "day" or "none").
+        """
+        settings = settings or {}
+        self.assistant_name = settings.get("assistant_name", "Em")
+        self.user_name = settings.get("user_name", "Jacob")
+        self.time_format = _TIME_FORMATS.get(settings.get("time_granularity", "hour"))
+        self._system_prompts: Dict[Tuple[Optional[str], bool], str] = {}
+        self._now: Optional[str] = None
+        self._context: Optional[str] = None
+
+    def system_prompt(
+        self, chat_config: Optional[Dict[str, Any]] = None, tools: bool = True
+    ) -> str:
+        """
+        Returns the static system prompt: the preset's `system_prompt`, or the default persona,
+        followed by the tool instructions. Rendered once per preset and reused afterwards.
+        """
+        preset_prompt = (chat_config or {}).get("system_prompt")
+        key = (preset_prompt, bool(tools))
+        prompt = self._system_prompts.get(key)
+        if prompt is None:
+            names = {"assistant_name": self.assistant_name, "user_name": self.user_name}
+            segments = [preset_prompt or Default_Persona_Template.render(**names)]
+            if tools:
+                segments.append(Tools_Template.render(**names))
+            prompt = "\n\n".join(segment.strip() for segment in segments)
+            self._system_prompts[key] = prompt
+        return prompt
+
+    def session_context(self) -> Optional[Dict[str, str]]:
+        """
+        Returns the system message holding the current time at the configured granularity.
+        It is only re-rendered when that rounded time changes.
+        """
+        if self.time_format is None:
+            return None
+        now = dt.now().strftime(self.time_format)
+        if now != self._now:
+            self._now = now
+            self._context = Session_Context_Template.render(now=now).strip()
+        return {"role": "system", "content": self._context}
+
+
+class PrefixTracker:
+    def __init__(self):
+        """
+        Measures how many bytes at the start of each request are identical to the previous
+        request, i.e. how much of the prompt a provider-side prefix cache can reuse.
+        """
+        self._previous: List[Tuple[Dict[str, Any], bytes]] = []
+        self.last_reused = 0
+        self.last_total = 0
+
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> bytes:
+        return json.dumps(message, sort_keys=True, default=str).encode("utf-8")
+
+    def observe(self, messages: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Records a request's messages.
+        Returns:
+            A (reused bytes, total bytes) tuple.
+        """
+        # Stored messages are sent as the same cached payload dicts every time. The previous
+        # request's dicts are still referenced here, so a matching id is the very same dict.
+        known = {id(message): data for message, data in self._previous}
+        current = [
+            (message, known.get(id(message)) or self._encode(message))
+            for message in messages
+        ]
+        reused = 0
+        for (_, previous), (_, data) in zip(self._previous, current):
+            if previous == data:
+                reused += len(data)
+                continue
+            reused += len(os.path.commonprefix([previous, data]))
+            break
+        self._previous = current
+        self.last_reused = reused
+        self.last_total = sum(len(data) for _, data in current)
+        return reused, self.last_total
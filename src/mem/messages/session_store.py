@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from mem.messages.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    def __init__(
+        self,
+        directory: str,
+        session_id: Optional[str] = None,
+        fsync_every: int = 20,
+        fsync_interval: float = 1.0,
+        compact_ratio: float = 2.0,
+    ):
+        """
+        Persists a conversation as an append-only JSONL log of change records, so saving
+        costs one small write per change instead of re-serializing the whole history.
+        Writes are flushed right away and fsynced in batches; the log is compacted into a
+        plain snapshot once it holds many more records than the conversation has messages.
+        Args:
+            directory: Directory holding one <session_id>.jsonl file per session.
+            session_id: Optional. The session to resume; a new id is generated when not given.
+            fsync_every: Number of records after which the log is fsynced.
+            fsync_interval: Seconds after which the log is fsynced, whichever comes first.
+            compact_ratio: Compact once records exceed this multiple of the message count.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.session_id = session_id or uuid.uuid4().hex
+        self.path = self.log_path(self.directory, self.session_id)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_ratio = compact_ratio
+        self.record_count = 0
+        self.message_count = 0
+        # The running summary and how many leading messages it (and long-term memory) covers.
+        self.summary: Optional[str] = None
+        self.summarized_upto = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = None
+
+    @staticmethod
+    def log_path(directory: str, session_id: str) -> str:
+        """Returns the path of a session's log file."""
+        return os.path.join(os.path.expanduser(directory), f"{session_id}.jsonl")
+
+    def load(self) -> List[Message]:
+        """
+        Replays the session's log and returns its messages. Returns an empty list for a new session.
+        A torn final line from a crash is cut off, so records appended after resuming are read back.
+        """
+        messages: List[Message] = []
+        # A crash can also leave a whole record without its newline; the next append would run into it.
+        needs_newline = False
+        if os.path.exists(self.path):
+            end = 0
+            torn = False
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        torn = True
+                        break
+                    self._apply(record, messages)
+                    self.record_count += 1
+                    end += len(line)
+                    needs_newline = not line.endswith(b"\n")
+            if torn:
+                logger.warning("Cutting off a torn record at the end of %s", self.path)
+                os.truncate(self.path, end)
+        self.message_count = len(messages)
+        self._file = open(self.path, "a")
+        if needs_newline:
+            self._file.write("\n")
+        return messages
+
+    def _apply(self, record: Dict[str, Any], messages: List[Message]):
+        op = record["op"]
+        if op == "add":
+            messages.append(Message.from_dict(record["message"]))
+        elif op == "modify":
+            messages[record["index"]].set_content(record["content"])
+        elif op == "delete":
+            messages.pop(record["index"])
+            if record["index"] < self.summarized_upto:
+                self.summarized_upto -= 1
+        elif op == "summary":
+            self.summary = record["summary"]
+            self.summarized_upto = record["upto"]
+
+    def record_add(self, message: Message):
+        self.message_count += 1
+        self._append({"op": "add", "message": message.to_dict()})
+
+    def record_modify(self, index: int, content: Any):
+        self._append({"op": "modify", "index": index, "content": content})
+
+    def record_delete(self, index: int):
+        self.message_count -= 1
+        self._append({"op": "delete", "index": index})
+
+    def record_summary(self, upto: int, summary: Optional[str]):
+        self.summary = summary
+        self.summarized_upto = upto
+        self._append({"op": "summary", "upto": upto, "summary": summary})
+
+    def _append(self, record: Dict[str, Any]):
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        self.record_count += 1
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self):
+        """Forces buffered records to disk."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def needs_compaction(self) -> bool:
+        return self.record_count > self.compact_ratio * max(self.message_count, 16)
+
+    def compact(self, messages: List[Message]):
+        """
+        Rewrites the log as one add record per current message, plus the summary record if there is
+        one, and atomically replaces the old log.
+        Args:
+            messages: The current messages, as held by Messages.
+        """
+        records = [{"op": "add", "message": message.to_dict()} for message in messages]
+        if self.summarized_upto:
+            records.append(
+                {"op": "summary", "upto": self.summarized_upto, "summary": self.summary}
+            )
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.writelines(json.dumps(record, default=str) + "\n" for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a")
+        self.record_count = len(records)
+        self.message_count = len(messages)
+        self._unsynced = 0
+        logger.debug(
+            "Compacted session log %s to %s records.", self.path, len(messages)
+        )
+
+    def close(self):
+        """Syncs and closes the log."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
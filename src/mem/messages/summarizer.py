@@ -0,0 +1,71 @@
+import logging
+from typing import List, Optional
+
+from jinja2 import Template
+
+from mem.messages.message import Message
+
+logger = logging.getLogger(__name__)
+
+Summary_Template = Template(
+    """
+    You maintain a running summary of a conversation between a user and an assistant.
+    Fold the new messages into the summary. Keep facts, names, decisions and open
+    questions; drop small talk. Reply with the updated summary only.
+
+    Current summary:
+    {{ summary or "(empty)" }}
+
+    New messages:
+    {% for message in messages -%}
+    {{ message.role }}: {{ message.content }}
+    {% endfor %}
+"""
+)
+
+
+class Summarizer:
+    def __init__(self, model: str, base_url: str, api_key: str = "anything"):
+        """
+        Folds batches of old messages into a running summary using a cheap, usually local, model.
+        Args:
+            model: The model name as the endpoint expects it, e.g. "qwen:7b" for ollama.
+            base_url: The OpenAI-compatible endpoint of the summary model.
+            api_key: Optional. Local endpoints ignore it but the client requires one.
+        """
+        self.model = model
+        self.base_url = base_url
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    async def summarize(
+        self, summary: Optional[str], messages: List[Message]
+    ) -> Optional[str]:
+        """
+        Returns the summary updated with the given messages, or the previous summary if the request fails.
+        Args:
+            summary: The running summary so far, if any.
+            messages: The messages to fold in, oldest first.
+        """
+        prompt = Summary_Template.render(
+            summary=summary,
+            messages=[message for message in messages if message.content],
+        ).strip()
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+            )
+        except Exception as e:
+            logger.error("Error summarizing messages: %s", e)
+            return summary
+        return (response.choices[0].message.content or "").strip() or summary
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from aiohttp import WSMsgType, web
+
+from mem.server.session_manager import SessionManager
+from mem.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class ChatServer:
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+    ):
+        """
+        Serves the conversations held by a SessionManager over HTTP and WebSocket.
+
+        HTTP:
+            POST   /sessions                   starts a session, returns {"session_id"}
+            GET    /sessions/{id}/messages     the stored messages
+            POST   /sessions/{id}/messages     {"content", "stream"}; a JSON reply, or
+                                               server-sent events when stream is true
+            Only POST /sessions starts a session; the other routes answer 404 for an id that is
+            neither in memory nor in the session store.
+            DELETE /sessions/{id}              evicts the session from memory; it stays stored
+            GET    /health                     session counts
+        WebSocket /sessions/{id}/ws: send {"content"} (or plain text) per turn; the reply comes
+        back as {"type": "delta"} frames followed by one {"type": "done"} frame.
+
+        A turn beyond the per-session limit is refused with 429, or an {"type": "error"} frame.
+        Args:
+            session_manager: Holds the sessions and the components they share.
+            host: The interface to listen on.
+            port: The port to listen on; 0 picks a free one.
+        """
+        self.session_manager = session_manager
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_post("/sessions", self._create_session)
+        app.router.add_get("/sessions/{session_id}/messages", self._get_messages)
+        app.router.add_post("/sessions/{session_id}/messages", self._post_message)
+        app.router.add_delete("/sessions/{session_id}", self._delete_session)
+        app.router.add_get("/sessions/{session_id}/ws", self._websocket)
+        return app
+
+    async def start(self):
+        self.session_manager.start()
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info("Chat server listening on http://%s:%s", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+        await self.session_manager.aclose()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    def _session_id(self, request) -> str:
+        session_id = request.match_info["session_id"]
+        if not self.session_manager.valid_session_id(session_id):
+            raise web.HTTPBadRequest(reason="Invalid session id")
+        return session_id
+
+    async def _health(self, request):
+        return web.json_response({"status": "ok", **self.session_manager.stats()})
+
+    async def _create_session(self, request):
+        session_id = self.session_manager.new_session_id()
+        await self.session_manager.get(session_id)
+        return web.json_response({"session_id": session_id}, status=201)
+
+    async def _existing_session(self, session_id: str):
+        session = await self.session_manager.get(session_id, create=False)
+        if session is None:
+            raise web.HTTPNotFound(reason="Unknown session")
+        return session
+
+    async def _acquire(self, session_id: str):
+        try:
+            return await self.session_manager.acquire(session_id)
+        except KeyError:
+            raise web.HTTPNotFound(reason="Unknown session")
+
+    async def _get_messages(self, request):
+        session = await self._existing_session(self._session_id(request))
+        return web.json_response(
+            {"messages": [message.to_dict() for message in session.messages.messages]}
+        )
+
+    async def _delete_session(self, request):
+        session_id = self._session_id(request)
+        evicted = await self.session_manager.evict(session_id)
+        if not evicted and session_id in self.session_manager.sessions:
+            raise web.HTTPConflict(reason="Session has a turn in progress")
+        return web.json_response({"evicted": evicted})
+
+    async def _post_message(self, request):
+        session_id = self._session_id(request)
+        try:
+            body = await request.json()
+            content = body["content"]
+        except (ValueError, KeyError, TypeError):
+            raise web.HTTPBadRequest(reason='Expected a JSON body with "content"')
+
+        session = await self._acquire(session_id)
+        if session is None:
+            raise web.HTTPTooManyRequests(reason="Session is busy")
+        try:
+            async with session.lock:
+                with tracing.span("server.turn", session=session_id):
+                    if body.get("stream"):
+                        return await self._stream_reply(request, session, content)
+                    try:
+                        reply = await session.request_manager.make_request(
+                            self.session_manager.chat_config, content
+                        )
+                    except Exception as e:
+                        logger.error("Turn failed in session %s: %s", session_id, e)
+                        raise web.HTTPBadGateway(reason="The model request failed")
+                    return web.json_response(
+                        {"session_id": session_id, "content": reply}
+                    )
+        finally:
+            self.session_manager.release(session)
+
+    async def _stream_reply(self, request, session, content):
+        """Streams one reply as server-sent events: delta events, then a done or error event."""
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+        events = self._reply_events(session, content)
+        try:
+            async for event in events:
+                await response.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        except ConnectionResetError:
+            logger.debug("Client left during a reply in session %s", session.session_id)
+            return response
+        finally:
+            await events.aclose()
+        await response.write_eof()
+        return response
+
+    async def _reply_events(self, session, content):
+        """Yields the delta events of one streamed turn, then its done or error event."""
+        parts = []
+        stream = session.request_manager.stream_request(
+            self.session_manager.chat_config, content
+        )
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                yield {"type": "delta", "content": delta}
+        except Exception as e:
+            logger.error("Turn failed in session %s: %s", session.session_id, e)
+            yield {"type": "error", "error": "The model request failed"}
+            return
+        finally:
+            await stream.aclose()
+        yield {"type": "done", "content": "".join(parts)}
+
+    async def _websocket(self, request):
+        session_id = self._session_id(request)
+        await self._existing_session(session_id)
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        async for frame in ws:
+            if frame.type != WSMsgType.TEXT:
+                break
+            try:
+                content = json.loads(frame.data)["content"]
+            except (ValueError, KeyError, TypeError):
+                content = frame.data
+            try:
+                session = await self.session_manager.acquire(session_id)
+            except KeyError:
+                # Evicted without a session store to reload it from.
+                await ws.send_json({"type": "error", "error": "Unknown session"})
+                break
+            if session is None:
+                await ws.send_json({"type": "error", "error": "Session is busy"})
+                continue
+            events = self._reply_events(session, content)
+            try:
+                async with session.lock:
+                    with tracing.span("server.turn", session=session_id):
+                        async for event in events:
+                            await ws.send_json(event)
+            except ConnectionResetError:
+                break
+            finally:
+                await events.aclose()
+                self.session_manager.release(session)
+        return ws
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Dict, Optional
+
+from mem.messages.context_window import ContextWindow
+from mem.messages.messages_manager import Messages
+from mem.messages.prompt_builder import PromptBuilder
+from mem.messages.session_store import SessionStore
+from mem.utils.builders import (
+    build_long_term_memory,
+    build_memory_manager,
+    build_proxy_request,
+    build_request_manager,
+    build_session_store,
+    build_summarizer,
+    build_tools_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+# Session ids name files in the session store, so only plain ids are accepted.
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ChatSession:
+    def __init__(self, session_id, messages, memory_manager, request_manager):
+        """
+        One conversation held in memory by the SessionManager.
+        Args:
+            session_id: The id the session is stored and addressed under.
+            messages: The conversation's Messages.
+            memory_manager: The conversation's MemoryManager.
+            request_manager: The RequestManager answering the conversation's turns.
+        """
+        self.session_id = session_id
+        self.messages = messages
+        self.memory_manager = memory_manager
+        self.request_manager = request_manager
+        # Turns of one conversation run one at a time, in arrival order.
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.last_used = time.monotonic()
+
+    async def close(self):
+        await self.memory_manager.aclose()
+        self.messages.close()
+
+
+class SessionManager:
+    def __init__(
+        self,
+        config_manager,
+        chat_config,
+        max_turns_per_session: int = 2,
+        max_sessions: int = 1000,
+        idle_timeout: float = 300.0,
+    ):
+        """
+        Holds the conversations of a server process. Every session gets its own Messages,
+        ContextWindow and MemoryManager, while the pooled LLM client, the ToolsManager, long-term
+        memory and the chat config are built once and shared; each session archives to and recalls
+        from only its own part of long-term memory. Idle sessions are evicted from
+        memory; their messages stay in the session store and are reloaded on the next turn.
+        Args:
+            config_manager: Supplies the config sections the components are built from.
+            chat_config: The chat settings snapshot every session is answered with.
+            max_turns_per_session: Turns one session may have running or waiting at once;
+                                   further turns are refused until one finishes.
+            max_sessions: Sessions held in memory before the least recently used idle one is evicted.
+            idle_timeout: Seconds after which a session without turns is evicted.
+        """
+        self.config_manager = config_manager
+        self.chat_config = dict(chat_config)
+        self.max_turns_per_session = max_turns_per_session
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.prompt_builder = PromptBuilder(
+            config_manager.get_value_from_config("prompts")
+        )
+        self.context_settings = config_manager.get_value_from_config("messages")
+        self.long_term_memory = build_long_term_memory(config_manager)
+        self.summarizer = build_summarizer(config_manager)
+        self.tools_manager = build_tools_manager(config_manager)
+        self.proxy_request = build_proxy_request(config_manager, self.tools_manager)
+        self.sessions: Dict[str, ChatSession] = {}
+        self.evictions = 0
+        self._reaper: Optional[asyncio.Task] = None
+        sessions = config_manager.get_value_from_config("sessions") or {}
+        self.sessions_dir = sessions.get("dir")
+        if not self.sessions_dir:
+            logger.warning(
+                "No [sessions] dir is configured; evicted sessions will be lost."
+            )
+
+    @staticmethod
+    def new_session_id() -> str:
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def valid_session_id(session_id: str) -> bool:
+        return bool(_SESSION_ID.match(session_id))
+
+    def stored(self, session_id: str) -> bool:
+        """Returns whether the session store holds a log for the session."""
+        return bool(self.sessions_dir) and os.path.exists(
+            SessionStore.log_path(self.sessions_dir, session_id)
+        )
+
+    def _open(self, session_id: str) -> ChatSession:
+        """Builds the per-session components, resuming the session's stored messages."""
+        messages = Messages(build_session_store(self.config_manager, session_id))
+        if not messages.messages:
+            messages.add_system_message(
+                self.prompt_builder.system_prompt(self.chat_config)
+            )
+        context_window = ContextWindow(messages, self.context_settings)
+        long_term_memory = (
+            self.long_term_memory.scoped(session_id)
+            if self.long_term_memory is not None
+            else None
+        )
+        memory_manager = build_memory_manager(
+            self.config_manager,
+            messages,
+            context_window,
+            summarizer=self.summarizer,
+            long_term_memory=long_term_memory,
+        )
+        request_manager = build_request_manager(
+            self.config_manager,
+            messages,
+            self.tools_manager,
+            self.proxy_request,
+            context_window=context_window,
+            long_term_memory=long_term_memory,
+            prompt_builder=self.prompt_builder,
+        )
+        return ChatSession(session_id, messages, memory_manager, request_manager)
+
+    async def get(self, session_id: str, create: bool = True) -> Optional[ChatSession]:
+        """
+        Returns the session, loading it from the session store if it isn't in memory.
+        Args:
+            session_id: The session to return.
+            create: Start the session if it is neither in memory nor stored; without it,
+                    an unknown session returns None.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            if not create and not self.stored(session_id):
+                return None
+            # Registered before any await, so concurrent turns can't open it twice.
+            session = self._open(session_id)
+            self.sessions[session_id] = session
+            logger.debug(
+                "Opened session %s (%s in memory)", session_id, len(self.sessions)
+            )
+        session.last_used = time.monotonic()
+        if len(self.sessions) > self.max_sessions:
+            await self._evict_least_recent()
+        return session
+
+    async def acquire(self, session_id: str) -> Optional[ChatSession]:
+        """
+        Reserves a turn on an existing session. Returns None when the session already has
+        max_turns_per_session turns running or waiting. Every reserved turn must be
+        given back with release().
+        Raises:
+            KeyError: The session is neither in memory nor stored.
+        """
+        session = await self.get(session_id, create=False)
+        if session is None:
+            raise KeyError(session_id)
+        if session.pending >= self.max_turns_per_session:
+            return None
+        session.pending += 1
+        return session
+
+    def release(self, session: ChatSession):
+        session.pending -= 1
+        session.last_used = time.monotonic()
+
+    async def evict(self, session_id: str) -> bool:
+        """
+        Drops an idle session from memory, leaving its messages in the session store.
+        Returns False if the session isn't in memory or has turns in progress.
+        """
+        session = self.sessions.get(session_id)
+        if session is None or session.pending:
+            return False
+        del self.sessions[session_id]
+        await session.close()
+        self.evictions += 1
+        logger.debug("Evicted session %s", session_id)
+        return True
+
+    async def _evict_least_recent(self):
+        idle = [session for session in self.sessions.values() if not session.pending]
+        if idle:
+            await self.evict(min(idle, key=lambda s: s.last_used).session_id)
+
+    async def evict_idle(self):
+        """Evicts every session that has had no turns for idle_timeout seconds."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for session in list(self.sessions.values()):
+            if not session.pending and session.last_used < cutoff:
+                await self.evict(session.session_id)
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            await self.evict_idle()
+
+    def start(self):
+        self._reaper = asyncio.create_task(self._reap())
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "active_turns": sum(s.pending for s in self.sessions.values()),
+            "evictions": self.evictions,
+        }
+
+    async def aclose(self):
+        """Stops eviction, closes every session and releases the shared clients."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+        for session in list(self.sessions.values()):
+            await session.close()
+        self.sessions.clear()
+        await self.tools_manager.aclose()
+        await self.proxy_request.aclose()
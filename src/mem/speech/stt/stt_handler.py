@@ -1,23 +1,42 @@
+import asyncio
 import logging
 import os
-from queue import Queue
+import time
+from typing import Dict, Optional
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from mem.utils import tracing
+
 logger = logging.getLogger(__name__)
 
 
 class SpeechToTextHandler:
-    def __init__(self, directory, queue: Queue):
+    def __init__(
+        self,
+        directory,
+        queue: asyncio.Queue,
+        socket_path: Optional[str] = None,
+        settle_delay: float = 0.05,
+    ):
         """
-        Initializes the handler for managing speech-to-text files. Sets up a directory watcher to handle incoming files.
+        Initializes the handler that feeds speech-to-text transcripts into the chat. Transcripts arrive
+        either as lines on a Unix domain socket, or as .txt files dropped into a watched directory.
         Args:
             directory: The directory to watch for new .txt files containing transcribed speech.
-            queue: The queue where transcriptions will be put for processing by the chat system.
+            queue: The asyncio queue where transcriptions will be put for processing by the chat system.
+            socket_path: Optional. Path of a Unix domain socket that accepts newline-delimited transcripts.
+            settle_delay: Seconds a file must go without new events before it is read, so a file
+                          that is written in several steps is read once, after the last write.
         """
         self.directory = directory
         self.queue = queue
+        self.socket_path = socket_path
+        self.settle_delay = settle_delay
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server = None
+        self._pending: Dict[str, asyncio.TimerHandle] = {}
         self._setup_directory()
         self.observer = Observer()
         self.event_handler = self._create_event_handler()
@@ -27,26 +46,50 @@ class SpeechToTextHandler:
         Cleans up the specified directory upon initialization. This ensures that any leftover files
         do not interfere with the operation of the application.
         """
+        os.makedirs(self.directory, exist_ok=True)
         for filename in os.listdir(self.directory):
             file_path = os.path.join(self.directory, filename)
             if os.path.isfile(file_path):
                 os.remove(file_path)
-                logger.debug(f"Deleted old file: {filename}")
+                logger.debug("Deleted old file: %s", filename)
 
     def _create_event_handler(self):
         """
-        Creates a file system event handler that triggers on file modifications.
-        Specifically looks for modifications to .txt files as indicators that new
-        transcription data is available.
+        Creates a file system event handler for .txt files. Creations, modifications and renames
+        (the atomic "write a temp file, then rename it" pattern) all hand the path to the event
+        loop, which reads it once the file has settled.
         """
+        handler = self
 
         class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                handler._on_file_event(event.src_path)
+
             def on_modified(self, event):
-                if event.src_path.endswith(".txt"):
-                    self._process_file(event.src_path)
+                handler._on_file_event(event.src_path)
+
+            def on_moved(self, event):
+                handler._on_file_event(event.dest_path)
 
         return Handler()
 
+    def _on_file_event(self, file_path):
+        """Runs on the watchdog thread; hands the path over to the event loop."""
+        if file_path.endswith(".txt") and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._schedule_file, file_path)
+
+    def _schedule_file(self, file_path):
+        """
+        (Re)starts the settle timer for a file, so a burst of events for the same file
+        results in a single read.
+        """
+        pending = self._pending.pop(file_path, None)
+        if pending is not None:
+            pending.cancel()
+        self._pending[file_path] = self.loop.call_later(
+            self.settle_delay, self._process_file, file_path
+        )
+
     def _process_file(self, file_path):
         """
         Processes the specified .txt file, extracts its content, and enqueues it for chat processing.
@@ -54,29 +97,74 @@ class SpeechToTextHandler:
         Args:
             file_path: The path to the .txt file to be processed.
         """
-        with open(file_path, "r") as file:
-            contents = file.read().strip()
-            self.queue.put(contents)
-            logger.info(f"Processed and queued speech-to-text content from {file_path}")
-        os.remove(file_path)
-        logger.debug(f"Deleted processed file: {file_path}")
+        self._pending.pop(file_path, None)
+        with tracing.span("stt.process_file", path=file_path) as span:
+            try:
+                # How long the transcript sat on disk before we picked it up.
+                waited = time.time() - os.path.getmtime(file_path)
+                span.set("pickup_ms", round(waited * 1000, 3))
+                with open(file_path, "r") as file:
+                    contents = file.read().strip()
+                os.remove(file_path)
+            except FileNotFoundError:
+                # Already processed through an earlier event for the same file.
+                return
+            if contents:
+                self.queue.put_nowait(contents)
+                tracing.hand_off(tracing.SPEECH_CHANNEL, span)
+                logger.info(
+                    "Processed and queued speech-to-text content from %s", file_path
+                )
+        logger.debug("Deleted processed file: %s", file_path)
+
+    async def _handle_client(self, reader, writer):
+        """
+        Reads newline-delimited transcripts from a socket client until it disconnects.
+        """
+        try:
+            while line := await reader.readline():
+                with tracing.span("stt.socket_line") as span:
+                    transcript = line.decode("utf-8", errors="replace").strip()
+                    if transcript:
+                        self.queue.put_nowait(transcript)
+                        tracing.hand_off(tracing.SPEECH_CHANNEL, span)
+                        logger.info("Queued speech-to-text content from socket")
+        finally:
+            writer.close()
 
-    def start(self):
+    async def start(self):
         """
-        Starts the directory observer, beginning continuous monitoring for changes to .txt files.
+        Starts the socket listener, if configured, and the directory observer.
         This method should be called after all setup is complete and the system is ready to start processing.
         """
+        self.loop = asyncio.get_running_loop()
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = await asyncio.start_unix_server(
+                self._handle_client, path=self.socket_path
+            )
+            logger.info("Speech-to-text handler listening on %s", self.socket_path)
         self.observer.schedule(self.event_handler, self.directory, recursive=False)
         self.observer.start()
         logger.info(
-            "Speech-to-text handler started, watching directory: " + self.directory
+            "Speech-to-text handler started, watching directory: %s", self.directory
         )
 
     def stop(self):
         """
-        Stops the directory observer and waits for it to finish, effectively halting the monitoring process.
+        Stops the socket listener and the directory observer, effectively halting the monitoring process.
         This should be called when the application is closing or no longer needs to process incoming transcriptions.
         """
-        self.observer.stop()
-        self.observer.join()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        for pending in self._pending.values():
+            pending.cancel()
+        self._pending.clear()
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
         logger.info("Speech-to-text handler stopped.")
@@ -0,0 +1,91 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioClip:
+    """Mono 16-bit PCM audio. `pcm` may be a memoryview over a memory-mapped cache file."""
+
+    pcm: Union[bytes, memoryview]
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+
+class NullAudioSink:
+    def __init__(self, realtime: bool = False):
+        """
+        An audio sink that discards audio, for tests and headless runs.
+        Args:
+            realtime: Whether play() should block for the clip's duration like a real device.
+        """
+        self.realtime = realtime
+        self.played = []
+        self._stopped = threading.Event()
+
+    def play(self, clip: AudioClip):
+        self._stopped.clear()
+        self.played.append(clip)
+        if self.realtime:
+            self._stopped.wait(clip.duration)
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        pass
+
+
+class PyAudioSink:
+    # Frames written per call, so stop() takes effect within ~50ms.
+    chunk_frames = 1024
+
+    def __init__(self):
+        """
+        Plays audio on the default output device through PyAudio. play() blocks until the clip
+        has been played or stop() is called from another thread.
+        """
+        self._audio = None
+        self._stream = None
+        self._sample_rate = None
+        self._stopped = threading.Event()
+
+    def _open(self, sample_rate: int):
+        if self._stream is not None and self._sample_rate == sample_rate:
+            return
+        import pyaudio
+
+        if self._audio is None:
+            self._audio = pyaudio.PyAudio()
+        if self._stream is not None:
+            self._stream.close()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16, channels=1, rate=sample_rate, output=True
+        )
+        self._sample_rate = sample_rate
+
+    def play(self, clip: AudioClip):
+        self._stopped.clear()
+        self._open(clip.sample_rate)
+        step = self.chunk_frames * 2
+        for offset in range(0, len(clip.pcm), step):
+            if self._stopped.is_set():
+                break
+            self._stream.write(clip.pcm[offset : offset + step])
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
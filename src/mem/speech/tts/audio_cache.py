@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import unicodedata
+import wave
+from typing import Dict, Optional
+
+from mem.speech.tts.audio import AudioClip
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and unicode variants so trivially different strings share an entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class AudioCache:
+    def __init__(
+        self,
+        directory: str,
+        speech_model: str,
+        voice: Optional[str] = None,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        """
+        A content-addressed cache of synthesized speech. Each entry is a WAV file named by the hash of
+        (normalized text, speech model, voice); hits are memory-mapped so playback reads the file
+        without copying it. The directory is capped at max_bytes, evicting the least recently used files.
+        Args:
+            directory: Where the WAV files are kept; shared across models and voices.
+            speech_model: The speech model the audio was synthesized with.
+            voice: Optional. The speaker id the audio was synthesized with.
+            max_bytes: Size cap of the directory.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.speech_model = speech_model
+        self.voice = voice or ""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.total_bytes = sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".wav")
+        )
+
+    def _path(self, text: str) -> str:
+        key = "\0".join((normalize_text(text), self.speech_model, self.voice))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.wav")
+
+    def get(self, text: str) -> Optional[AudioClip]:
+        """
+        Returns the cached audio for the text, backed by a read-only memory map, or None on a miss.
+        """
+        path = self._path(text)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            sample_rate, offset, length = self._parse_wav(mapped)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        # Bump the mtime, which is what LRU eviction goes by.
+        os.utime(path)
+        self.hits += 1
+        return AudioClip(memoryview(mapped)[offset : offset + length], sample_rate)
+
+    def put(self, text: str, clip: AudioClip):
+        """Stores synthesized audio for the text and evicts old entries if the cap is exceeded."""
+        path = self._path(text)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with wave.open(temp_path, "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(clip.sample_rate)
+                f.writeframes(clip.pcm)
+            size = os.path.getsize(temp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning("Failed to cache synthesized audio: %s", e)
+            return
+        self.total_bytes += size - replaced
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".wav")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        self.total_bytes = sum(entry.stat().st_size for entry in entries)
+        # Evict down to 90% of the cap so we don't evict on every put.
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self.total_bytes <= target:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+
+    @staticmethod
+    def _parse_wav(data) -> tuple:
+        """Returns (sample_rate, data offset, data length) of a mono 16-bit PCM WAV."""
+        if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+            raise ValueError("Not a WAV file")
+        offset = 12
+        sample_rate = None
+        while offset + 8 <= len(data):
+            chunk_id = data[offset : offset + 4]
+            (chunk_size,) = struct.unpack("<I", data[offset + 4 : offset + 8])
+            if chunk_id == b"fmt ":
+                (sample_rate,) = struct.unpack("<I", data[offset + 12 : offset + 16])
+            elif chunk_id == b"data":
+                if sample_rate is None:
+                    raise ValueError("WAV data before fmt chunk")
+                return sample_rate, offset + 8, chunk_size
+            offset += 8 + chunk_size + (chunk_size & 1)
+        raise ValueError("WAV file without data chunk")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.total_bytes,
+        }
@@ -0,0 +1,47 @@
+import re
+from typing import List, Optional
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes/brackets) and whitespace,
+# or at a blank line.
+_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n\s*\n")
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "st.", "e.g.", "i.e.", "vs.", "etc."}
+
+
+class SentenceSplitter:
+    def __init__(self, min_length: int = 20):
+        """
+        Splits streamed text into sentences as soon as each one is complete.
+        Args:
+            min_length: Sentences shorter than this are merged into the next one, so
+                        "Hi." doesn't become its own synthesis call.
+        """
+        self.min_length = min_length
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Adds streamed text and returns the sentences it completed, if any.
+        """
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self.buffer):
+            candidate = self.buffer[start : match.end()].strip()
+            if not candidate:
+                # Only whitespace since the last sentence; drop it.
+                start = match.end()
+                continue
+            last_word = candidate.rsplit(None, 1)[-1].lower()
+            if len(candidate) < self.min_length or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        Returns whatever text is left once the stream has ended.
+        """
+        remainder, self.buffer = self.buffer.strip(), ""
+        return remainder or None
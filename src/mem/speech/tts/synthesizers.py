@@ -0,0 +1,54 @@
+import logging
+from typing import Optional
+
+from mem.speech.tts.audio import AudioClip
+
+logger = logging.getLogger(__name__)
+
+
+class CoquiSynthesizer:
+    def __init__(self, speech_model: str, voice: Optional[str] = None):
+        """
+        Synthesizes speech with a coqui-tts model. The model is loaded by load(), not on construction.
+        Args:
+            speech_model: A full coqui model name, or a short VCTK model name such as "vits".
+            voice: Optional. The speaker id for multi-speaker models, e.g. "p230".
+        """
+        self.model_name = (
+            speech_model if "/" in speech_model else f"tts_models/en/vctk/{speech_model}"
+        )
+        self.voice = voice
+        self.tts = None
+
+    def load(self):
+        from TTS.api import TTS
+
+        self.tts = TTS(self.model_name)
+        logger.info("Loaded TTS model %s", self.model_name)
+
+    def synthesize(self, text: str) -> AudioClip:
+        """Renders text to audio. Blocking and CPU-bound, so callers run it off the event loop."""
+        import numpy as np
+
+        if self.tts is None:
+            self.load()
+        kwargs = {"speaker": self.voice} if self.voice and self.tts.is_multi_speaker else {}
+        samples = np.asarray(self.tts.tts(text=text, **kwargs), dtype=np.float32)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        return AudioClip(pcm, self.tts.synthesizer.output_sample_rate)
+
+
+class SilentSynthesizer:
+    def __init__(self, sample_rate: int = 22050, seconds_per_char: float = 0.06):
+        """
+        Produces silence as long as the text would take to say, for tests and machines without coqui-tts.
+        """
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+
+    def load(self):
+        pass
+
+    def synthesize(self, text: str) -> AudioClip:
+        frames = int(len(text) * self.seconds_per_char * self.sample_rate)
+        return AudioClip(bytes(frames * 2), self.sample_rate)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from mem.speech.tts.sentence_splitter import SentenceSplitter
+from mem.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class TextToSpeechHandler:
+    def __init__(
+        self,
+        speech_model: str,
+        voice: Optional[str] = None,
+        synthesizer=None,
+        sink=None,
+        max_queued_audio: int = 2,
+        audio_cache=None,
+    ):
+        """
+        Speaks assistant text sentence by sentence. Text is split as it streams in, one worker
+        synthesizes the next sentence while another plays the current one, and a bounded queue
+        between them keeps synthesis from running too far ahead of playback.
+        Args:
+            speech_model: The coqui model to use, e.g. "vits".
+            voice: Optional. The speaker id for multi-speaker models.
+            synthesizer: Optional. Anything with load() and synthesize(text) -> AudioClip; coqui by default.
+            sink: Optional. Anything with play(clip), stop() and close(); the default output device by default.
+            max_queued_audio: How many synthesized sentences may wait for playback.
+            audio_cache: Optional. An AudioCache consulted before synthesizing a sentence.
+        """
+        if synthesizer is None:
+            from mem.speech.tts.synthesizers import CoquiSynthesizer
+
+            synthesizer = CoquiSynthesizer(speech_model, voice)
+        if sink is None:
+            from mem.speech.tts.audio import PyAudioSink
+
+            sink = PyAudioSink()
+        self.synthesizer = synthesizer
+        self.sink = sink
+        self.audio_cache = audio_cache
+        self.splitter = SentenceSplitter()
+        self.max_queued_audio = max_queued_audio
+        # One thread each, so synthesis of sentence N+1 overlaps playback of sentence N.
+        self._synth_executor = ThreadPoolExecutor(1, thread_name_prefix="mem-tts-synth")
+        self._play_executor = ThreadPoolExecutor(1, thread_name_prefix="mem-tts-play")
+        self._sentences: Optional[asyncio.Queue] = None
+        self._audio: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._generation = 0
+
+    def load_model(self):
+        """Loads the synthesis model up front so the first sentence doesn't pay for it."""
+        self.synthesizer.load()
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        self._sentences = asyncio.Queue()
+        self._audio = asyncio.Queue(maxsize=self.max_queued_audio)
+        self._workers = [
+            asyncio.create_task(self._synthesize_worker()),
+            asyncio.create_task(self._playback_worker()),
+        ]
+
+    def feed(self, text: str):
+        """
+        Adds streamed assistant text; every sentence it completes is queued for synthesis right away.
+        """
+        self._ensure_workers()
+        # The workers outlive the turn, so each sentence carries the span it belongs to.
+        parent = tracing.current()
+        for sentence in self.splitter.feed(text):
+            self._sentences.put_nowait((self._generation, sentence, parent))
+
+    async def finish(self):
+        """
+        Queues whatever text is left and waits until everything queued has been played.
+        """
+        self._ensure_workers()
+        remainder = self.splitter.flush()
+        if remainder:
+            self._sentences.put_nowait(
+                (self._generation, remainder, tracing.current())
+            )
+        await self._sentences.join()
+        await self._audio.join()
+
+    async def speak(self, text: str):
+        """
+        Speaks a complete text. The first sentence starts playing as soon as it is synthesized.
+        """
+        with tracing.span("tts.speak", chars=len(text)):
+            self.feed(text)
+            await self.finish()
+
+    def interrupt(self):
+        """
+        Drops everything queued, stops the current sentence and discards sentences still being
+        synthesized, e.g. when the user starts speaking.
+        """
+        self._generation += 1
+        self.splitter.flush()
+        for queue in (self._sentences, self._audio):
+            while queue is not None and not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+        self.sink.stop()
+
+    def _render(self, sentence):
+        """Returns the audio for a sentence from the cache, synthesizing and caching it on a miss."""
+        if self.audio_cache is None:
+            return self.synthesizer.synthesize(sentence)
+        clip = self.audio_cache.get(sentence)
+        if clip is None:
+            clip = self.synthesizer.synthesize(sentence)
+            self.audio_cache.put(sentence, clip)
+        return clip
+
+    async def _synthesize_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            generation, sentence, parent = await self._sentences.get()
+            try:
+                if generation != self._generation:
+                    continue
+                with tracing.span(
+                    "tts.synthesize", parent=parent, chars=len(sentence)
+                ):
+                    clip = await loop.run_in_executor(
+                        self._synth_executor, self._render, sentence
+                    )
+                if generation == self._generation:
+                    await self._audio.put((generation, clip, parent))
+            except Exception as e:
+                logger.error("Failed to synthesize sentence: %s", e)
+            finally:
+                self._sentences.task_done()
+
+    async def _playback_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            generation, clip, parent = await self._audio.get()
+            try:
+                if generation == self._generation:
+                    with tracing.span("tts.play", parent=parent):
+                        await loop.run_in_executor(
+                            self._play_executor, self.sink.play, clip
+                        )
+            except Exception as e:
+                logger.error("Failed to play audio: %s", e)
+            finally:
+                self._audio.task_done()
+
+    def stop(self):
+        """
+        Stops playback, cancels the workers and releases the audio device.
+        """
+        self.interrupt()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._synth_executor.shutdown(wait=False)
+        self._play_executor.shutdown(wait=False)
+        self.sink.close()
+        if self.audio_cache is not None:
+            logger.info("TTS audio cache: %s", self.audio_cache.stats())
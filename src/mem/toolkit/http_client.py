@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# weather.gov rejects requests without a User-Agent.
+DEFAULT_HEADERS = {"User-Agent": "mem-assistant (https://github.com/JacobGoldenArt/memmm)"}
+
+
+class ToolsHttpClient:
+    def __init__(
+        self,
+        limit: int = 20,
+        limit_per_host: int = 4,
+        timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        max_workers: int = 4,
+    ):
+        """
+        A shared, pooled async HTTP session for tools, plus a bounded thread pool for
+        third-party SDKs that only offer blocking calls. The session is created lazily
+        because it has to be bound to the running event loop.
+        Args:
+            limit: Maximum number of open connections across all hosts.
+            limit_per_host: Maximum number of open connections to a single host.
+            timeout: Total seconds allowed for a single request.
+            keepalive_timeout: Seconds an idle connection is kept open for reuse.
+            max_workers: Size of the thread pool used by run_blocking.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_workers = max_workers
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=DEFAULT_HEADERS,
+            )
+        return self._session
+
+    async def get_json(self, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        GETs a URL and decodes the JSON body.
+        Returns None for non-200 responses.
+        """
+        async with self.session.get(url, **kwargs) as response:
+            if response.status != 200:
+                logger.warning("GET %s returned %s", url, response.status)
+                return None
+            return await response.json(content_type=None)
+
+    async def run_blocking(self, function, *args, **kwargs):
+        """
+        Runs a blocking call on the bounded thread pool so it doesn't stall the event loop.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mem-tools"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
+
+    async def close(self):
+        """Closes the pooled session and shuts the thread pool down."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
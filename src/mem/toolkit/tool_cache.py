@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def round_coordinates(precision: int = 2) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Returns a key normalizer that rounds `latitude`/`longitude` arguments, so nearby
+    positions (and the same position passed as a string or a float) share a cache entry.
+    Two decimal places is roughly 1km, well inside a weather.gov forecast grid cell.
+    """
+
+    def normalize(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        normalized = dict(kwargs)
+        for key in ("latitude", "longitude"):
+            if key in normalized:
+                try:
+                    normalized[key] = round(float(normalized[key]), precision)
+                except (TypeError, ValueError):
+                    pass
+        return normalized
+
+    return normalize
+
+
+class ToolCache:
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 128,
+        key_normalizer: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 1024,
+    ):
+        """
+        A TTL cache for the results of a single tool, with an in-memory LRU tier and an
+        optional on-disk tier that survives restarts. The disk tier is swept of expired
+        entries on start and every so many writes, and capped at max_disk_entries files.
+        Args:
+            ttl: Seconds a result stays valid.
+            max_entries: How many results the in-memory tier keeps before evicting the least recently used.
+            key_normalizer: Optional. Maps the call's keyword arguments to the values used for the key.
+            disk_dir: Optional. Directory for the on-disk tier; disabled when not set.
+            max_disk_entries: How many results the disk tier keeps before removing the oldest.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.key_normalizer = key_normalizer
+        self.disk_dir = os.path.expanduser(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._writes_until_sweep = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self.sweep_disk()
+
+    def make_key(self, kwargs: Dict[str, Any]) -> str:
+        """Builds a stable key from the call's keyword arguments."""
+        if self.key_normalizer:
+            kwargs = self.key_normalizer(kwargs)
+        return json.dumps(kwargs, sort_keys=True, default=str)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks a key up in memory, then on disk.
+        Returns:
+            A (found, value) tuple.
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+
+        if self.disk_dir:
+            entry = self._read_disk(key)
+            if entry is not None and entry[0] > now:
+                self._remember(key, *entry)
+                self.disk_hits += 1
+                return True, entry[1]
+
+        self.misses += 1
+        return False, None
+
+    def set(self, key: str, value: Any):
+        """Stores a value in every enabled tier."""
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, value)
+        if self.disk_dir:
+            self._write_disk(key, expires_at, value)
+
+    def clear(self):
+        """Drops every in-memory entry. Disk entries expire on their own."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            with open(self._disk_path(key), "r") as f:
+                entry = json.load(f)
+            return entry["expires_at"], entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Ignoring unreadable tool cache entry: %s", e)
+            return None
+
+    def _write_disk(self, key: str, expires_at: float, value: Any):
+        path = self._disk_path(key)
+        # A temp file of its own, so concurrent writers of one key never share a half-written file.
+        fd, temp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f, default=str)
+            os.replace(temp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning("Failed to write tool cache entry: %s", e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self._writes_until_sweep -= 1
+        if self._writes_until_sweep <= 0:
+            self.sweep_disk()
+
+    def sweep_disk(self):
+        """
+        Removes expired disk entries (and temp files left by a crash), then the oldest entries
+        beyond max_disk_entries. A file's mtime is when it was written, so nothing is read.
+        """
+        self._writes_until_sweep = max(16, self.max_disk_entries // 4)
+        cutoff = time.time() - self.ttl
+        entries = []
+        try:
+            with os.scandir(self.disk_dir) as scan:
+                for entry in scan:
+                    if not entry.name.endswith((".json", ".tmp")):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    if mtime <= cutoff:
+                        self._remove(entry.path)
+                    elif entry.name.endswith(".json"):
+                        entries.append((mtime, entry.path))
+        except OSError as e:
+            logger.warning("Failed to sweep tool cache directory: %s", e)
+            return
+        if len(entries) > self.max_disk_entries:
+            entries.sort()
+            for _, path in entries[: len(entries) - self.max_disk_entries]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug("Failed to remove tool cache file %s: %s", path, e)
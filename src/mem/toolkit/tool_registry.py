@@ -0,0 +1,196 @@
+import importlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import typing
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "mem.tools"
+
+# Parameters the ToolsManager fills in itself; they never appear in a tool's schema.
+INJECTED_PARAMETERS = ("http",)
+
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+
+def tool(
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    params: Optional[Dict[str, str]] = None,
+    **metadata,
+):
+    """
+    Declares an async function as a tool the model can call. Its JSON schema is generated from
+    the signature and type hints; parameters listed in INJECTED_PARAMETERS are left out.
+    Args:
+        name: Optional. The tool name the model sees; the function name by default.
+        description: Optional. What the tool does; the first docstring line by default.
+        params: Optional. A description for each parameter.
+        **metadata: Extra settings read by the ToolsManager, e.g. timeout, cache or key_normalizer.
+    """
+
+    def decorate(function):
+        function.__tool__ = {
+            "name": name or function.__name__,
+            "description": description,
+            "params": params or {},
+            "metadata": metadata,
+        }
+        return function
+
+    return decorate
+
+
+def _json_type(annotation) -> Dict[str, Any]:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        # Optional[X] is sent as X; the model may simply leave it out.
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _json_type(args[0]) if len(args) == 1 else {}
+    if origin in (list, tuple):
+        return {"type": "array"}
+    if origin is dict:
+        return {"type": "object"}
+    json_type = _JSON_TYPES.get(annotation)
+    return {"type": json_type} if json_type else {}
+
+
+def build_spec(function: Callable) -> Dict[str, Any]:
+    """
+    Builds the OpenAI tool schema and ToolsManager metadata of a function declared with @tool.
+    Returns:
+        A JSON-serializable dict with "name", "schema" and "metadata".
+    """
+    declared = getattr(function, "__tool__", None)
+    if declared is None:
+        raise ValueError(f"{function.__qualname__} is not declared with @tool")
+    hints = typing.get_type_hints(function)
+    properties = {}
+    required = []
+    for parameter in inspect.signature(function).parameters.values():
+        if parameter.name in INJECTED_PARAMETERS or parameter.kind in (
+            parameter.VAR_POSITIONAL,
+            parameter.VAR_KEYWORD,
+        ):
+            continue
+        prop = _json_type(hints.get(parameter.name))
+        if parameter.name in declared["params"]:
+            prop["description"] = declared["params"][parameter.name]
+        if parameter.default is parameter.empty:
+            required.append(parameter.name)
+        else:
+            prop["default"] = parameter.default
+        properties[parameter.name] = prop
+
+    docstring = inspect.getdoc(function) or ""
+    description = declared["description"] or docstring.split("\n")[0]
+    return {
+        "name": declared["name"],
+        "schema": {
+            "type": "function",
+            "function": {
+                "name": declared["name"],
+                "description": description or "No description available",
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required,
+                },
+            },
+        },
+        "metadata": declared["metadata"],
+    }
+
+
+def load_target(target: str) -> Callable:
+    """Imports "package.module:function" and returns the function."""
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def source_signature(target: str) -> Optional[list]:
+    """
+    Returns the (mtime, size) of the module file behind a target without importing it,
+    or None if it can't be located.
+    """
+    try:
+        spec = importlib.util.find_spec(target.partition(":")[0])
+        stat = os.stat(spec.origin)
+    except (ImportError, AttributeError, TypeError, ValueError, OSError):
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def discover_tools(builtin: Dict[str, str]) -> Dict[str, str]:
+    """
+    Returns every known tool as name -> "module:function": the built-in ones plus any
+    installed package that declares a `mem.tools` entry point.
+    """
+    targets = dict(builtin)
+    try:
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            targets[entry_point.name] = entry_point.value
+    except Exception as e:
+        logger.warning("Failed to read tool entry points: %s", e)
+    return targets
+
+
+class ToolSchemaCache:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Keeps generated tool specs on disk, keyed by target and module file signature, so later
+        runs can offer a tool to the model without importing its module.
+        Args:
+            path: Optional. The JSON file; specs are only kept in memory when not set.
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if self.path:
+            try:
+                with open(self.path, "r") as f:
+                    self.entries = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    "Ignoring unreadable tool schema cache %s: %s", self.path, e
+                )
+
+    def get(self, target: str, signature: Optional[list]) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(target)
+        if signature is None or entry is None or entry["signature"] != signature:
+            return None
+        return entry["spec"]
+
+    def set(self, target: str, signature: Optional[list], spec: Dict[str, Any]):
+        if signature is None:
+            return
+        self.entries[target] = {"signature": signature, "spec": spec}
+        self.dirty = True
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning("Failed to save tool schema cache: %s", e)
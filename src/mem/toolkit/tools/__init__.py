@@ -1,2 +1,8 @@
-from .get_location import get_location_data as get_location_tool  # noqa: F401
-from .get_weather import get_weather_data as get_weather_tool  # noqa: F401
+# Tool modules are imported only when the model first calls them; the ToolsManager
+# reads their schemas from the schema cache. Third-party tools register through
+# the `mem.tools` entry point group with the same "module:function" targets.
+BUILTIN_TOOLS = {
+    "get_location": "mem.toolkit.tools.get_location:get_location_data",
+    "get_weather": "mem.toolkit.tools.get_weather:get_weather_data",
+    "web_search": "mem.toolkit.tools.tavily_search:web_search",
+}
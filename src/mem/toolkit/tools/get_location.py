@@ -1,10 +1,21 @@
-import ipapi
+import asyncio
 
+from mem.toolkit.http_client import ToolsHttpClient
+from mem.toolkit.tool_registry import tool
 
-async def get_location_data(**args):
+IPAPI_URL = "https://ipapi.co/json/"
+
+
+# Location barely changes within a session.
+@tool(
+    name="get_location",
+    description="Get the location of the user based on their IP address",
+    cache={"ttl": 3600, "max_entries": 4},
+)
+async def get_location_data(http: ToolsHttpClient, **args):
     """Get the user's location based on their IP address."""
-    location = ipapi.location()
-    if location:
+    location = await http.get_json(IPAPI_URL)
+    if location and "latitude" in location:
         return {
             "latitude": location["latitude"],
             "longitude": location["longitude"],
@@ -13,5 +24,12 @@ async def get_location_data(**args):
 
 
 if __name__ == "__main__":
-    loco = get_location_data()
-    print(f"Location: {loco}")
+
+    async def _main():
+        http = ToolsHttpClient()
+        try:
+            print(f"Location: {await get_location_data(http)}")
+        finally:
+            await http.close()
+
+    asyncio.run(_main())
@@ -1,15 +1,31 @@
-import requests
+import asyncio
 
+from mem.toolkit.http_client import ToolsHttpClient
+from mem.toolkit.tool_registry import tool
 
-async def get_weather_data(is_forecast, latitude, longitude):
+
+# weather.gov forecasts update hourly.
+@tool(
+    name="get_weather",
+    description="Get the current weather in a given location",
+    params={
+        "latitude": "The latitude of the location",
+        "longitude": "The longitude of the location",
+        "is_forecast": "true: returns seven day forecast, false: returns today's weather.",
+    },
+    cache={"ttl": 900, "max_entries": 64},
+    key_normalizer="coordinates",
+)
+async def get_weather_data(
+    http: ToolsHttpClient, latitude: str, longitude: str, is_forecast: bool = False
+):
     url = f"https://api.weather.gov/points/{latitude},{longitude}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        forecast_url = response.json().get("properties").get("forecast")
+    points = await http.get_json(url)
+    if points:
+        forecast_url = points.get("properties", {}).get("forecast")
         if forecast_url:
-            data = requests.get(forecast_url)
-            if data.status_code == 200:
-                forecast = data.json()
+            forecast = await http.get_json(forecast_url)
+            if forecast:
                 today = forecast["properties"]["periods"][0]
                 todays_weather = {
                     "temperature": today.get("temperature"),
@@ -24,8 +40,7 @@ async def get_weather_data(is_forecast, latitude, longitude):
                             "shortForecast": weather["shortForecast"],
                         }
                         seven_day_forecast.append(daily_forecast)
-                print(is_forecast)
-                if str(is_forecast).lower() == "true" or is_forecast:
+                if str(is_forecast).lower() == "true":
                     return {"seven_day_forecast": seven_day_forecast}
                 else:
                     return {
@@ -36,6 +51,16 @@ async def get_weather_data(is_forecast, latitude, longitude):
 
 
 if __name__ == "__main__":
-    print(
-        get_weather_data(is_forecast="true", latitude="37.7749", longitude="-122.4194")
-    )
+
+    async def _main():
+        http = ToolsHttpClient()
+        try:
+            print(
+                await get_weather_data(
+                    http, is_forecast="true", latitude="37.7749", longitude="-122.4194"
+                )
+            )
+        finally:
+            await http.close()
+
+    asyncio.run(_main())
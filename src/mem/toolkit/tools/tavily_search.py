@@ -1,33 +1,64 @@
 import asyncio
 import os
+import weakref
 
 from dotenv import load_dotenv
 from tavily import TavilyClient
 
+from mem.toolkit.http_client import ToolsHttpClient
+from mem.toolkit.tool_registry import tool
+
 load_dotenv()
 
+# One TavilyClient per ToolsManager HTTP client, dropped along with it. The value must not
+# reference the key, or the entry would never be collected.
+_clients: "weakref.WeakKeyDictionary[ToolsHttpClient, TavilyClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class TavilySearchTool:
-    def __init__(self):
-        self.client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    def __init__(self, http: ToolsHttpClient, client: TavilyClient = None):
+        self.client = client or TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        self.http = http
 
     async def agent_search(self, query, **args):
-        """Get the user's location based on their IP address."""
-        response = await self.client.search(query=query, **args)
+        """Search the web and return the results as context for an LLM."""
+        # TavilyClient is blocking, so it runs on the shared tools thread pool.
+        response = await self.http.run_blocking(self.client.search, query=query, **args)
         # Get the search results as context to pass an LLM:
         context = [
-            {"url": obj["url"], "content": obj["content"]} for obj in response.results
+            {"url": obj["url"], "content": obj["content"]}
+            for obj in response.get("results", [])
         ]
         return context
 
     async def get_answer(self, query):
-        response = await self.client.qna_search(query=query)
+        response = await self.http.run_blocking(self.client.qna_search, query=query)
         return response
 
 
+@tool(
+    name="web_search",
+    description="Search the web and return the most relevant pages",
+    params={"query": "What to search for"},
+    cache={"ttl": 3600, "max_entries": 64},
+)
+async def web_search(http: ToolsHttpClient, query: str):
+    client = _clients.get(http)
+    if client is None:
+        client = _clients[http] = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    return await TavilySearchTool(http, client).agent_search(query)
+
+
 if __name__ == "__main__":
-    search = TavilySearchTool()
-    results = asyncio.run(
-        search.get_answer("What's the secret to authentic Indian Food?")
-    )
-    print(results)
+
+    async def _main():
+        http = ToolsHttpClient()
+        try:
+            search = TavilySearchTool(http)
+            print(await search.get_answer("What's the secret to authentic Indian Food?"))
+        finally:
+            await http.close()
+
+    asyncio.run(_main())
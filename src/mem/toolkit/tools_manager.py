@@ -1,70 +1,241 @@
-from mem.toolkit.tools import get_location_tool, get_weather_tool
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+
+from mem.toolkit.http_client import ToolsHttpClient
+from mem.toolkit.tool_cache import ToolCache, round_coordinates
+from mem.toolkit.tool_registry import (
+    ToolSchemaCache,
+    build_spec,
+    discover_tools,
+    load_target,
+    source_signature,
+)
+from mem.toolkit.tools import BUILTIN_TOOLS
+
+logger = logging.getLogger(__name__)
+
+
+class _FrozenDict(dict):
+    """A dict that refuses changes, so a shared schema payload can't be altered by one caller."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Tool schemas are shared between requests and can't be modified.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def _deep_freeze(value):
+    if isinstance(value, dict):
+        return _FrozenDict((key, _deep_freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_deep_freeze(item) for item in value)
+    return value
 
 
 class ToolsManager:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_config=None,
+        http_config=None,
+        enabled_tools=None,
+        schema_cache_path=None,
+    ):
         """
         Manages different tools available for the application, allowing for dynamic registration and usage of tools.
+        Tools declare themselves with @tool; their schemas come from the schema cache when the module is
+        unchanged, and a tool's module is only imported the first time the model calls it.
+        Args:
+            cache_config: Optional. The [tools.cache] config table; per-tool tables override the tools' default TTLs.
+            http_config: Optional. The [tools.http] config table for the shared HTTP session.
+            enabled_tools: Optional. Names of the tools to offer; every discovered tool when not given.
+            schema_cache_path: Optional. Where generated schemas are kept between runs ([tools] schema_cache);
+                               they are only kept in memory when not given.
         """
         self.toolkit = {}
+        self.cache_config = cache_config or {}
+        self.http = ToolsHttpClient(**(http_config or {}))
+        self._payload = None
+        self._digest = None
+        self.key_normalizers = {
+            "coordinates": round_coordinates(
+                self.cache_config.get("coordinate_precision", 2)
+            ),
+        }
+        schema_cache = ToolSchemaCache(schema_cache_path)
+        for name, target in discover_tools(BUILTIN_TOOLS).items():
+            if enabled_tools is None or name in enabled_tools:
+                self.register_target(target, schema_cache)
+        schema_cache.save()
+
+    def register_target(self, target, schema_cache=None):
+        """
+        Registers the @tool function at "module:function" without importing its module when its
+        spec is already in the schema cache.
+        """
+        signature = source_signature(target)
+        spec = schema_cache.get(target, signature) if schema_cache else None
+        if spec is None:
+            try:
+                spec = build_spec(load_target(target))
+            except Exception as e:
+                logger.warning("Skipping tool %s: %s", target, e)
+                return
+            if schema_cache is not None:
+                schema_cache.set(target, signature, spec)
+        metadata = spec["metadata"]
         self.register_tool(
-            "get_weather",
-            get_weather_tool,
-            {
-                "description": "Get the current weather in a given location",
-                "parameters": {
-                    "is_forecast": {
-                        "type": "boolean",
-                        "description": "true: returns seven day forecast, false: returns today's weather.",
-                        "default": False,
-                    },
-                    "latitude": {
-                        "type": "string",
-                        "description": "The latitude of the location",
-                    },
-                    "longitude": {
-                        "type": "string",
-                        "description": "The longitude of the location",
-                    },
-                },
-                "required": ["latitude", "longitude"],
-            },
+            spec["name"],
+            self._lazy(target),
+            metadata,
+            cache=self._build_cache(
+                spec["name"],
+                metadata.get("cache"),
+                self.key_normalizers.get(metadata.get("key_normalizer")),
+            ),
+            schema=spec["schema"],
         )
-        self.register_tool(
-            "get_location",
-            get_location_tool,
-            {
-                "description": "Get the location of the user based on their IP address",
-                "parameters": {},
-            },
+
+    def _lazy(self, target):
+        """
+        Returns a coroutine function that imports the tool on its first call and binds the
+        shared resources it asks for.
+        """
+        loaded = None
+
+        async def call(**kwargs):
+            nonlocal loaded
+            if loaded is None:
+                loaded = self._bind(load_target(target))
+                logger.debug("Loaded tool %s", target)
+            return await loaded(**kwargs)
+
+        return call
+
+    def _bind(self, function):
+        if "http" in inspect.signature(function).parameters:
+            return functools.partial(function, http=self.http)
+        return function
+
+    def _build_cache(self, name, defaults=None, key_normalizer=None):
+        """
+        Builds the result cache for a tool from its declared defaults and the [tools.cache] config.
+        Returns None when caching is disabled for the tool.
+        """
+        settings = {
+            **(defaults or {}),
+            **self.cache_config.get(name, {}),
+        }
+        if not self.cache_config.get("enabled", True) or not settings.get("ttl"):
+            return None
+        disk_dir = self.cache_config.get("disk_dir")
+        return ToolCache(
+            ttl=settings["ttl"],
+            max_entries=settings.get("max_entries", 128),
+            key_normalizer=key_normalizer,
+            disk_dir=os.path.join(disk_dir, name) if disk_dir else None,
+            max_disk_entries=settings.get("max_disk_entries", 1024),
         )
 
-    def register_tool(self, name, function, metadata=None):
+    def register_tool(self, name, function, metadata=None, cache=None, schema=None):
         """
         Registers a tool with associated metadata for use within the application.
         Args:
             name: A unique name for the tool.
             function: The function associated with the tool.
             metadata: Optional metadata describing the tool, including parameters and descriptions.
+            cache: Optional. A ToolCache the tool's results are served from while they are fresh.
+            schema: Optional. The tool's OpenAI schema; built from the metadata's description,
+                    parameters and required keys when not given.
         """
-        self.toolkit[name] = {"function": function, "metadata": metadata or {}}
+        metadata = metadata or {}
+        if cache is not None:
+            function = self._cached(function, cache)
+        if schema is None:
+            schema = {
+                "type": "function",
+                "function": {
+                    "name": name,
+                    "description": metadata.get(
+                        "description", "No description available"
+                    ),
+                    "parameters": {
+                        "type": "object",
+                        "properties": metadata.get("parameters", {}),
+                        "required": metadata.get("required", []),
+                    },
+                },
+            }
+        self.toolkit[name] = {
+            "function": function,
+            "metadata": metadata,
+            "cache": cache,
+            "schema": schema,
+        }
+        self._payload = None
 
-    def available_tools(self):
+    @staticmethod
+    def _cached(function, cache):
         """
-        Returns a list of all registered tools with their metadata.
-        Useful for dynamic interfaces or API responses where tool capabilities need to be described.
-        """
-        return [
-            {
-                "name": name,
-                "description": tool["metadata"].get(
-                    "description", "No description available"
-                ),
-                "parameters": tool["metadata"].get("parameters", {}),
-                "required": tool["metadata"].get("required", []),
-            }
+        Wraps an async tool so results are looked up in the cache first.
+        Empty results and error payloads are never cached.
+        """
+
+        @functools.wraps(function)
+        async def wrapper(**kwargs):
+            key = cache.make_key(kwargs)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = await function(**kwargs)
+            if value is not None and not (isinstance(value, dict) and "error" in value):
+                cache.set(key, value)
+            return value
+
+        return wrapper
+
+    def cache_stats(self):
+        """
+        Returns the hit/miss counters of every cached tool, keyed by tool name.
+        """
+        return {
+            name: tool["cache"].stats()
             for name, tool in self.toolkit.items()
-        ]
+            if tool.get("cache") is not None
+        }
+
+    def _freeze(self):
+        """
+        Serializes the schemas of every registered tool once; the payload is reused by every
+        request until another tool is registered.
+        """
+        serialized = json.dumps(
+            [tool["schema"] for tool in self.toolkit.values()],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        self._payload = _deep_freeze(json.loads(serialized))
+        self._digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def available_tools(self):
+        """
+        Returns the schemas of all registered tools in the OpenAI `tools` format.
+        The same read-only tuple is returned on every call; changing any part of it raises TypeError.
+        """
+        if self._payload is None:
+            self._freeze()
+        return self._payload
+
+    @property
+    def tools_digest(self):
+        """A hash of the tool schemas, for cache keys that depend on the offered tools."""
+        if self._payload is None:
+            self._freeze()
+        return self._digest
 
     def execute_tool(self, tool_name, **kwargs):
         """
@@ -80,3 +251,9 @@ class ToolsManager:
             return tool(**kwargs)
         else:
             raise ValueError(f"Tool {tool_name} is not registered.")
+
+    async def aclose(self):
+        """
+        Closes the shared HTTP session used by the tools.
+        """
+        await self.http.close()
@@ -0,0 +1,148 @@
+import logging
+import os
+
+from mem.llms.backends import Backends
+from mem.llms.request import ProxyRequest
+from mem.llms.request_manager import RequestManager
+from mem.messages.messages_manager import MemoryManager
+from mem.messages.session_store import SessionStore
+from mem.toolkit.tools_manager import ToolsManager
+
+# Builders for the components described by the app config, shared by the interactive chat loop
+# and the server. Vector memory, the summarizer and the response cache pull in heavy or optional
+# dependencies, so they are imported only when the config enables them.
+
+logger = logging.getLogger(__name__)
+
+
+def build_session_store(config_manager, session_id=None):
+    """
+    Builds the SessionStore described by the [sessions] config, or None if no directory is set.
+    """
+    settings = config_manager.get_value_from_config("sessions") or {}
+    if not settings.get("dir"):
+        return None
+    return SessionStore(
+        settings["dir"],
+        session_id=session_id,
+        fsync_every=settings.get("fsync_every", 20),
+        fsync_interval=settings.get("fsync_interval", 1.0),
+        compact_ratio=settings.get("compact_ratio", 2.0),
+    )
+
+
+def build_long_term_memory(config_manager):
+    """
+    Builds the vector-backed long-term memory described by the [vector] config, if enabled.
+    """
+    settings = config_manager.get_value_from_config("vector") or {}
+    if not settings.get("enabled"):
+        return None
+    from mem.memory.embedders import build_embedder
+    from mem.memory.long_term_memory import LongTermMemory
+    from mem.memory.vector_store import VectorStore
+
+    embedder = build_embedder(settings)
+    store = VectorStore(
+        os.path.join(settings["store_dir"], settings.get("collection", "default")),
+        embedder.dim,
+    )
+    return LongTermMemory(
+        store,
+        embedder,
+        chunk_size=settings.get("chunk_size", 1000),
+        top_k=settings.get("top_k", 3),
+    )
+
+
+def build_summarizer(config_manager):
+    """
+    Builds the background summarizer when [memmory] names a summary model.
+    """
+    settings = config_manager.get_value_from_config("memmory") or {}
+    if not (settings.get("summary_model") and settings.get("summary_base_url")):
+        return None
+    from mem.messages.summarizer import Summarizer
+
+    return Summarizer(settings["summary_model"], settings["summary_base_url"])
+
+
+def build_memory_manager(
+    config_manager, messages, context_window, summarizer=None, long_term_memory=None
+):
+    """
+    Builds the MemoryManager of one conversation, with the [memmory] debounce and batch settings.
+    """
+    settings = config_manager.get_value_from_config("memmory") or {}
+    return MemoryManager(
+        messages,
+        context_window=context_window,
+        summarizer=summarizer,
+        long_term_memory=long_term_memory,
+        debounce=settings.get("summary_debounce", 2.0),
+        batch_size=settings.get("summary_batch_size", 6),
+    )
+
+
+def build_tools_manager(config_manager):
+    """
+    Builds the ToolsManager described by the [tools] config.
+    """
+    return ToolsManager(
+        cache_config=config_manager.get_value_from_config("tools.cache"),
+        http_config=config_manager.get_value_from_config("tools.http"),
+        enabled_tools=config_manager.get_value_from_config("tools.enabled"),
+        schema_cache_path=config_manager.get_value_from_config("tools.schema_cache"),
+    )
+
+
+def build_response_cache(config_manager):
+    """
+    Builds the LLM response cache described by the [response_cache] config, if enabled.
+    """
+    settings = config_manager.get_value_from_config("response_cache") or {}
+    if not settings.get("enabled"):
+        return None
+    from mem.llms.response_cache import ResponseCache
+
+    return ResponseCache(
+        settings.get("path", "~/.cache/mem/responses.sqlite3"),
+        ttl=settings.get("ttl", 86400),
+        max_entries=settings.get("max_entries", 5000),
+        max_temperature=settings.get("max_temperature"),
+    )
+
+
+def build_proxy_request(config_manager, tools_manager):
+    """
+    Builds the ProxyRequest with the configured backend and response cache.
+    """
+    return ProxyRequest(
+        tools_manager,
+        Backends.from_config(config_manager),
+        build_response_cache(config_manager),
+    )
+
+
+def build_request_manager(
+    config_manager,
+    messages,
+    tools_manager,
+    proxy_request,
+    context_window=None,
+    long_term_memory=None,
+    prompt_builder=None,
+):
+    """
+    Builds the RequestManager of one conversation, with the [tools] round and timeout limits.
+    """
+    return RequestManager(
+        messages,
+        tools_manager,
+        proxy_request,
+        max_tool_rounds=config_manager.get_value_from_config("tools.max_rounds") or 5,
+        tool_timeout=config_manager.get_value_from_config("tools.timeout") or 15.0,
+        context_window=context_window,
+        long_term_memory=long_term_memory,
+        prompt_builder=prompt_builder,
+    )
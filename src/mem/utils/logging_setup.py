@@ -1,65 +1,155 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, Optional
 
-import litellm
-from rich.logging import RichHandler
+VERBOSITY_LEVELS = {
+    "min": logging.INFO,
+    "med": logging.WARNING,
+    "max": logging.ERROR,
+    "bug": logging.DEBUG,
+}
 
+# Third-party loggers that emit a record per request; [logging.levels] can override them.
+DEFAULT_MODULE_LEVELS = {
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "openai": "WARNING",
+}
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.NOTSET,  # Capture all logs initially
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)],
+_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+_sinks = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per record: time, level, logger, message and any traceback."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+# Arguments of these types can't change between the log call and the listener formatting them.
+_IMMUTABLE_ARGS = (str, bytes, int, float, complex, type(None), BaseException)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records with their arguments unformatted. The stock QueueHandler merges msg and args
+    on the calling thread, which is the formatting cost we want off the event loop; the listener
+    runs in this process, so the record never has to be pickled. Arguments that could be mutated
+    before the listener gets to them (dicts, lists, arbitrary objects) are the exception: those
+    records are formatted right away, so the log shows the value at the time of the call.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        # A single mapping argument is the args itself, and can be mutated like any dict.
+        if args and (
+            isinstance(args, dict)
+            or not all(isinstance(value, _IMMUTABLE_ARGS) for value in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(rich: bool = True, json_path: Optional[str] = None):
+    """
+    Routes every record through a queue to a background thread that formats and writes it, so
+    a log call on the event loop only appends to the queue. Calling it again swaps the sinks.
+    Args:
+        rich: Render records to the terminal with Rich, for interactive use.
+        json_path: Optional. Also append records to this file as JSON lines.
+    """
+    global _listener, _sinks
+    if _sinks == (rich, json_path):
+        return
+    handlers = []
+    if rich:
+        from rich.logging import RichHandler
+
+        rich_handler = RichHandler(rich_tracebacks=True)
+        rich_handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+        handlers.append(rich_handler)
+    if json_path:
+        json_path = os.path.expanduser(json_path)
+        directory = os.path.dirname(json_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(json_path, encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    root = logging.getLogger()
+    if _sinks is None:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(_queue))
+        root.setLevel(logging.WARNING)
+        atexit.register(_stop_listener)
+    _stop_listener()
+    _listener = logging.handlers.QueueListener(
+        _queue, *handlers, respect_handler_level=True
     )
+    _listener.start()
+    _sinks = (rich, json_path)
 
 
-def set_logger_levels(verbosity: str = None, module_name: str = None):
-    """Adjusts the logging level and LiteLLM's verbosity based on the provided verbosity argument."""
-    # Default to suppress all logging
-    level = logging.CRITICAL + 1
-    litellm_verbose = False  # Default LiteLLM verbose mode
-
-    if verbosity == "min":
-        level = logging.INFO
-    elif verbosity == "med":
-        level = logging.WARNING
-        litellm_verbose = True
-    elif verbosity == "max":
-        level = logging.ERROR
-        litellm_verbose = True
-    elif verbosity == "bug":
-        level = logging.DEBUG
-        litellm_verbose = True
-
-    # Explicitly set the root logger level, in addition to configuring basicConfig
-    logging.getLogger().setLevel(level)  # This ensures the level is applied correctly
-    logging.basicConfig(level=level)
-    litellm.set_verbose = litellm_verbose
-
-    # Log the status of LiteLLM verbose mode and logging initialization
-    if level <= logging.INFO:  # Only log if the level is INFO or more verbose
-        logging.info(
-            f"Logging initialized with level: {logging.getLevelName(level)}, LiteLLM verbose mode: {'enabled' if litellm_verbose else 'disabled'}"
-        )
-    # If module_name is specified, adjust logging level for that module only
+def set_logger_levels(
+    verbosity: str = None,
+    module_name: str = None,
+    module_levels: Optional[Dict[str, str]] = None,
+):
+    """
+    Sets the level records are dropped below, before anything is formatted or queued.
+    Args:
+        verbosity: "min", "med", "max" or "bug"; anything else silences logging.
+        module_name: Optional. Log only this module (and its children) at the verbosity level;
+                     every other logger keeps to warnings and errors.
+        module_levels: Optional. Logger name -> level overrides, e.g. from [logging.levels],
+                       applied over DEFAULT_MODULE_LEVELS.
+    """
+    level = VERBOSITY_LEVELS.get(verbosity, logging.CRITICAL + 1)
+    litellm_verbose = verbosity in ("med", "max", "bug")
+
+    root = logging.getLogger()
     if module_name:
+        root.setLevel(max(level, logging.WARNING))
         logging.getLogger(module_name).setLevel(level)
     else:
-        # Set the logging level for all loggers
-        for logger_name in logging.root.manager.loggerDict:
-            logging.getLogger(logger_name).setLevel(level)
-
-
-# Initial setup call
-setup_logging()
-
-# if __name__ == "__main__":
-#     logger = logging
-#     set_logger_levels("min")
-#     logger.info("Logging initialized with min level")
-# set_logger_levels("min")
-# logger.info("Logging initialized")
-# set_logger_levels("med")
-# logger.warning("Logging warning initialized")
-# set_logger_levels("max")
-# logger.error("Logging max initialized")
+        root.setLevel(level)
+    # Only the gated loggers get a level of their own; everything else inherits the root's.
+    for name, module_level in {**DEFAULT_MODULE_LEVELS, **(module_levels or {})}.items():
+        if name != module_name:
+            logging.getLogger(name).setLevel(str(module_level).upper())
+
+    # Only touch LiteLLM if something already imported it; importing it here costs seconds.
+    litellm = sys.modules.get("litellm")
+    if litellm is not None:
+        litellm.set_verbose = litellm_verbose
+
+    logging.getLogger(__name__).info(
+        "Logging initialized with level: %s, LiteLLM verbose mode: %s",
+        logging.getLevelName(level),
+        "enabled" if litellm_verbose else "disabled",
+    )
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_ENV = "MEM_PROFILE_STARTUP"
+FIRST_PROMPT_MARKER = "mem-startup: first prompt at "
+
+
+def mark_first_prompt():
+    """
+    Called right before the chat loop first prompts for input. In a profiling child process
+    it reports the wall-clock time and exits, so the profile stops at the first prompt.
+    """
+    if os.environ.get(PROFILE_ENV):
+        sys.stderr.write(f"{FIRST_PROMPT_MARKER}{time.time()}\n")
+        sys.stderr.flush()
+        raise SystemExit(0)
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses `python -X importtime` output into (module, self_us, cumulative_us) tuples.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:") :].split("|", 2)
+            # One space follows the separator; deeper nesting adds two more per level.
+            imports.append((module.rstrip()[1:], int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return imports
+
+
+@dataclass
+class StartupProfile:
+    imports: List[Tuple[str, int, int]]
+    # Milliseconds from launching the child to its first prompt; None if it never got there.
+    first_prompt_ms: Optional[float]
+    elapsed_ms: float
+    returncode: int
+
+    def loaded(self, modules) -> List[str]:
+        """Returns which of the given top-level packages the child imported."""
+        names = {module.strip().split(".")[0] for module, _, _ in self.imports}
+        return [module for module in modules if module in names]
+
+
+def profile_startup(args: List[str], env: Optional[Dict[str, str]] = None) -> StartupProfile:
+    """
+    Runs the CLI in a child interpreter with `-X importtime`, stopping at the first prompt.
+    Args:
+        args: The CLI arguments to profile, without --profile-startup. Defaults to `chat`.
+        env: Optional. The child's environment; the current one when not given.
+    """
+    env = dict(os.environ if env is None else env, **{PROFILE_ENV: "1"})
+    started = time.time()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "mem.main", *(args or ["chat"])],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    finished = time.time()
+
+    first_prompt_ms = None
+    for line in child.stderr.splitlines():
+        if line.startswith(FIRST_PROMPT_MARKER):
+            first_prompt = float(line[len(FIRST_PROMPT_MARKER) :])
+            first_prompt_ms = (first_prompt - started) * 1000
+    return StartupProfile(
+        parse_importtime(child.stderr),
+        first_prompt_ms,
+        (finished - started) * 1000,
+        child.returncode,
+    )
+
+
+def run_startup_profile(args: List[str], top: int = 25, budget_ms: Optional[float] = None) -> int:
+    """
+    Profiles the CLI up to its first prompt and prints the slowest imports and the time to
+    first prompt.
+    Args:
+        args: The CLI arguments to profile, without --profile-startup. Defaults to `chat`.
+        top: Number of imports to show.
+        budget_ms: Optional. Time-to-first-prompt budget; exceeding it makes the exit code 1.
+    Returns:
+        The exit code: 0 on success, 1 when over budget or the child never reached a prompt.
+    """
+    from mem.utils.rich_setup import Table, console
+
+    profile = profile_startup(args)
+    table = Table(title="Slowest imports")
+    table.add_column("module")
+    table.add_column("self ms", justify="right")
+    table.add_column("cumulative ms", justify="right")
+    for module, self_us, cumulative_us in sorted(profile.imports, key=lambda i: -i[2])[:top]:
+        table.add_row(module, f"{self_us / 1000:.1f}", f"{cumulative_us / 1000:.1f}")
+    console.print(table)
+
+    top_level_ms = sum(i[2] for i in profile.imports if not i[0].startswith(" ")) / 1000
+    console.print(f"Total import time: {top_level_ms:.0f} ms")
+
+    if profile.first_prompt_ms is None:
+        console.print(
+            f"The child exited with {profile.returncode} before reaching a prompt "
+            f"({profile.elapsed_ms:.0f} ms)."
+        )
+        return 1
+
+    console.print(f"Time to first prompt: {profile.first_prompt_ms:.0f} ms")
+    if budget_ms is not None and profile.first_prompt_ms > budget_ms:
+        console.print(f"Over the startup budget of {budget_ms:.0f} ms.")
+        return 1
+    return 0
@@ -0,0 +1,477 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tracing is off unless configure() installs a tracer; every span() call then returns the
+# shared no-op span, so instrumented code costs one global lookup per span.
+_tracer: Optional["Tracer"] = None
+_current: contextvars.ContextVar = contextvars.ContextVar("mem_span", default=None)
+
+# The turn answering a transcript continues the speech handler's trace through this channel.
+SPEECH_CHANNEL = "speech"
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def elapsed_ms(self):
+        return 0.0
+
+    def end(self, error=None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "status",
+        "start_ns",
+        "_started",
+        "duration_ms",
+        "terminal",
+        "_token",
+        "_activate",
+    )
+
+    def __init__(
+        self, tracer, name, parent=None, follows=None, activate=True, attributes=None
+    ):
+        """
+        One timed operation. Used as a context manager it becomes the parent of spans started
+        inside it, including in tasks created meanwhile; with activate=False it is ended
+        explicitly and never becomes current, which is what async generators need.
+        Args:
+            tracer: The Tracer the span is exported through.
+            name: The operation, e.g. "llm.request".
+            parent: Optional. The parent span; the current span by default.
+            follows: Optional. A handed-off span that already ended; the new span continues
+                     its trace and ends it in its place.
+            activate: Whether entering the span makes it current.
+            attributes: Optional. Initial attributes.
+        """
+        if follows is not None:
+            parent = follows
+        elif parent is None:
+            parent = _current.get()
+        # A trace is complete once its terminal span ends: the root, or whatever followed it.
+        self.terminal = parent is None or follows is not None
+        self.tracer = tracer
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.name = name
+        self.attributes = attributes or {}
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+        self._token = None
+        self._activate = activate
+
+    def __enter__(self):
+        if self._activate:
+            self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        self.end(exc)
+        return False
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def record_error(self, error):
+        """Marks the span failed for an error that was handled instead of raised through it."""
+        self.status = "error"
+        self.attributes["error"] = repr(error)
+
+    def end(self, error=None):
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = self.elapsed_ms()
+        if error is not None:
+            cancelled = type(error).__name__ == "CancelledError"
+            self.status = "cancelled" if cancelled else "error"
+            if not cancelled:
+                self.attributes["error"] = repr(error)
+        self.tracer.finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    def __init__(self, exporters):
+        """
+        Hands finished spans to exporters, each with export(span) and close().
+        Args:
+            exporters: The exporters every finished span is passed to.
+        """
+        self.exporters = list(exporters)
+        self._handoffs: Dict[str, Span] = {}
+
+    def finish(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning("Dropping span %s: %s", span.name, e)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class JsonlExporter:
+    def __init__(self, path: str, batch_size: int = 64):
+        """
+        Appends finished spans to a JSONL file, one span per line, written in batches and
+        whenever a trace's root span ends.
+        Args:
+            path: The trace file.
+            batch_size: Spans buffered before they are written.
+        """
+        self.path = os.path.expanduser(path)
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a")
+
+    def export(self, span: Span):
+        self._buffer.append(json.dumps(span.to_dict(), default=str))
+        if span.terminal or len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def _otlp_value(value) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter:
+    def __init__(self, endpoint: str, service_name: str = "mem", batch_size: int = 64):
+        """
+        Sends spans to an OpenTelemetry collector with OTLP/HTTP JSON. Posting happens on a
+        background thread, so a slow or missing collector never blocks the event loop; spans
+        are dropped when the collector can't keep up.
+        Args:
+            endpoint: The collector's traces URL, e.g. http://localhost:4318/v1/traces.
+            service_name: The service.name resource attribute.
+            batch_size: Spans sent per request.
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(
+            target=self._run, name="mem-otlp-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, span: Span):
+        end_ns = span.start_ns + int(span.duration_ms * 1_000_000)
+        record = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span.attributes.items()
+            ],
+            "status": {"code": 2 if span.status == "error" else 1},
+        }
+        if span.parent_id:
+            record["parentSpanId"] = span.parent_id
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def _post(self, spans):
+        import urllib.request
+
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "mem"}, "spans": spans}],
+                }
+            ]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except OSError as e:
+            logger.debug("OTLP export to %s failed: %s", self.endpoint, e)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            spans = [record]
+            while len(spans) < self.batch_size:
+                try:
+                    record = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._post(spans)
+                    return
+                spans.append(record)
+            self._post(spans)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+class ConsoleReporter:
+    def __init__(self, window: int = 200, max_open_traces: int = 256):
+        """
+        Prints a waterfall of every finished trace and keeps the latest durations of each span
+        name for latency histograms.
+        Args:
+            window: Durations kept per span name.
+            max_open_traces: Unfinished traces kept before the oldest is dropped, e.g. a
+                             handed-off transcript that no turn picked up.
+        """
+        self.window = window
+        self.max_open_traces = max_open_traces
+        self._traces: Dict[str, List[Span]] = defaultdict(list)
+        self.durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def export(self, span: Span):
+        self.durations[span.name].append(span.duration_ms)
+        spans = self._traces[span.trace_id]
+        spans.append(span)
+        if span.terminal:
+            del self._traces[span.trace_id]
+            self.print_waterfall(spans)
+        elif len(self._traces) > self.max_open_traces:
+            del self._traces[next(iter(self._traces))]
+
+    @staticmethod
+    def _depths(spans: List[Span]) -> Dict[str, int]:
+        parents = {span.span_id: span.parent_id for span in spans}
+        depths = {}
+        for span in spans:
+            depth, parent = 0, span.parent_id
+            while parent in parents:
+                depth, parent = depth + 1, parents[parent]
+            depths[span.span_id] = depth
+        return depths
+
+    def print_waterfall(self, spans: List[Span], width: int = 30):
+        from mem.utils.rich_setup import Table, console
+
+        spans = sorted(spans, key=lambda span: span.start_ns)
+        start = spans[0].start_ns
+        total_ms = max(
+            (span.start_ns - start) / 1e6 + span.duration_ms for span in spans
+        ) or 1.0
+        depths = self._depths(spans)
+        table = Table(title=f"Trace {spans[0].trace_id[:8]} ({total_ms:.1f} ms)")
+        table.add_column("span")
+        table.add_column("start ms", justify="right")
+        table.add_column("ms", justify="right")
+        table.add_column("", no_wrap=True, min_width=width)
+        for span in spans:
+            offset_ms = (span.start_ns - start) / 1e6
+            lead = min(width - 1, int(offset_ms / total_ms * width))
+            bar = min(width - lead, max(1, round(span.duration_ms / total_ms * width)))
+            label = "  " * depths[span.span_id] + span.name
+            if span.status != "ok":
+                label += f" [{span.status}]"
+            table.add_row(
+                label,
+                f"{offset_ms:.1f}",
+                f"{span.duration_ms:.1f}",
+                " " * lead + "█" * bar,
+            )
+        console.print(table)
+
+    def print_histograms(
+        self, buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    ):
+        from mem.bench.stats import summarize
+        from mem.utils.rich_setup import Table, console
+
+        if not self.durations:
+            return
+        table = Table(title=f"Span latency, last {self.window} per span (ms)")
+        for column in ("span", "count", "p50", "p95", "p99", "histogram"):
+            table.add_column(column, justify="left" if column == "span" else "right")
+        for name, durations in sorted(self.durations.items()):
+            summary = summarize(durations, scale=1)
+            counts = [0] * (len(buckets) + 1)
+            for duration in durations:
+                counts[next((i for i, b in enumerate(buckets) if duration <= b), -1)] += 1
+            peak = max(counts)
+            bars = "".join(" ▁▂▃▄▅▆▇█"[round(count / peak * 8)] for count in counts)
+            table.add_row(
+                name,
+                str(summary["count"]),
+                *(f"{summary[key]:.1f}" for key in ("p50", "p95", "p99")),
+                bars,
+            )
+        console.print(table)
+        console.print(f"Histogram buckets (ms): <={', <='.join(map(str, buckets))}, more")
+
+    def close(self):
+        self.print_histograms()
+
+
+def configure(settings: Optional[Dict[str, Any]] = None, console: bool = False):
+    """
+    Installs the tracer described by the [tracing] config. Does nothing, leaving tracing
+    disabled, when neither the config enables it nor console output is asked for.
+    Args:
+        settings: Optional. The [tracing] config section.
+        console: Print a waterfall per trace and latency histograms at shutdown (`--trace`).
+    """
+    global _tracer
+    settings = settings or {}
+    exporters = []
+    if settings.get("enabled"):
+        if settings.get("path"):
+            exporters.append(JsonlExporter(settings["path"]))
+        if settings.get("otlp_endpoint"):
+            exporters.append(
+                OtlpExporter(
+                    settings["otlp_endpoint"],
+                    service_name=settings.get("service_name", "mem"),
+                )
+            )
+    if console:
+        exporters.append(ConsoleReporter())
+    _tracer = Tracer(exporters) if exporters else None
+
+
+def shutdown():
+    """Flushes and closes the exporters, and disables tracing."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(
+    name: str, parent: Optional[Span] = None, follows: Optional[Span] = None, **attributes
+):
+    """
+    Returns a span to use as a context manager, child of parent or of the current span, or
+    continuing the trace of a span taken with take_handoff().
+    Returns the no-op span when tracing is disabled.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return Span(_tracer, name, parent=parent, follows=follows, attributes=attributes)
+
+
+def start_span(name: str, parent: Optional[Span] = None, **attributes):
+    """
+    Starts a span that is ended with span.end() and never becomes the current span,
+    for work that suspends across yields, like async generators.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return Span(_tracer, name, parent=parent, activate=False, attributes=attributes)
+
+
+def current() -> Optional[Span]:
+    return _current.get() if _tracer is not None else None
+
+
+def hand_off(channel: str, span=None):
+    """
+    Leaves a span for whoever picks up the work next on the channel, when the two sides don't
+    share a task, e.g. a transcript read by the speech handler and the turn that answers it.
+    """
+    if _tracer is not None and isinstance(span, Span):
+        span.terminal = False
+        _tracer._handoffs[channel] = span
+
+
+def take_handoff(channel: str) -> Optional[Span]:
+    if _tracer is None:
+        return None
+    return _tracer._handoffs.pop(channel, None)
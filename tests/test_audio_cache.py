@@ -0,0 +1,20 @@
+import os
+
+from mem.speech.tts.audio import AudioClip
+from mem.speech.tts.audio_cache import AudioCache
+
+
+def _directory_bytes(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def test_rewriting_an_entry_counts_its_size_once(tmp_path):
+    cache = AudioCache(str(tmp_path), "model")
+    clip = AudioClip(b"\x01\x00" * 1000, 22050)
+    cache.put("Hello there.", clip)
+    cache.put("Hello  there.", clip)
+
+    assert cache.total_bytes == _directory_bytes(tmp_path)
+    assert cache.get("Hello there.").pcm.tobytes() == clip.pcm
+    assert cache.stats()["hits"] == 1
+
@@ -0,0 +1,85 @@
+import pytest
+
+from mem.llms.backends import Backends, DirectBackend
+
+LLMS = {
+    "together": {
+        "base_url": "https://api.together.xyz/v1",
+        "api_key_env": "TOGETHER_API_KEY",
+        "default_model": "t-7b",
+        "aliases": {
+            "t-7b": "together_ai/mistralai/Mistral-7B-Instruct-v0.1",
+            "plain": "gpt-4",
+        },
+    },
+    # Written by older configs, where base_url ended up under the aliases header.
+    "legacy": {"aliases": {"base_url": "http://localhost:11434/v1", "q": "ollama/qwen"}},
+    "keyless": {"aliases": {}},
+}
+
+
+class FakeConfigManager:
+    def get_llm_settings(self, llm_name):
+        return LLMS.get(llm_name)
+
+    def get_aliases_for_models(self, llm_name):
+        return LLMS[llm_name]["aliases"]
+
+    def get_value_from_config(self, key):
+        return None
+
+
+class FakePool:
+    def get(self, base_url, api_key=None):
+        return (base_url, api_key)
+
+
+def _resolve(api_service, model):
+    backend = DirectBackend(FakeConfigManager(), FakePool())
+    return backend.resolve({"api_service": api_service, "model": model})
+
+
+def test_alias_is_resolved_without_the_provider_prefix(monkeypatch):
+    monkeypatch.setenv("TOGETHER_API_KEY", "secret")
+
+    assert _resolve("together", "t-7b") == (
+        ("https://api.together.xyz/v1", "secret"),
+        "mistralai/Mistral-7B-Instruct-v0.1",
+    )
+
+
+@pytest.mark.parametrize(
+    "model, expected",
+    [
+        (None, "mistralai/Mistral-7B-Instruct-v0.1"),
+        ("plain", "gpt-4"),
+        ("meta-llama/Llama-3-8b", "meta-llama/Llama-3-8b"),
+    ],
+)
+def test_default_unprefixed_and_unknown_models(model, expected):
+    assert _resolve("together", model)[1] == expected
+
+
+def test_base_url_under_the_aliases_header_is_not_an_alias():
+    client, model = _resolve("legacy", "q")
+
+    assert client == ("http://localhost:11434/v1", None)
+    assert model == "qwen"
+    assert _resolve("legacy", "base_url")[1] == "base_url"
+
+
+@pytest.mark.parametrize("api_service", ["missing", "keyless"])
+def test_unroutable_service_raises(api_service):
+    with pytest.raises(ValueError):
+        _resolve(api_service, "m")
+
+
+def test_preset_backend_key_picks_the_direct_backend():
+    backends = Backends(FakeConfigManager(), proxy_url="http://proxy/v1")
+    backends.pool = backends.direct.pool = backends.proxy.pool = FakePool()
+    direct = {"backend": "direct", "api_service": "together", "model": "plain"}
+
+    assert backends.resolve({"model": "t-7b"}) == (("http://proxy/v1", None), "t-7b")
+    assert backends.resolve(direct)[1] == "gpt-4"
+    with pytest.raises(ValueError):
+        Backends().resolve({"backend": "direct", "model": "t-7b"})
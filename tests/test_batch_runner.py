@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import pytest
+
+from mem.batch.batch_runner import BatchRunner
+from mem.bench.stub_server import StubServer
+
+CHAT_CONFIG = {"api_service": "stub", "model": "stub", "temperature": 0}
+
+
+class FakeConfigManager:
+    """Serves config sections from a dict, so tests don't touch the app config or ~/.cache."""
+
+    def __init__(self, values=None):
+        self.values = values or {}
+
+    def get_value_from_config(self, key):
+        return self.values.get(key)
+
+
+def _runner(proxy_url="http://127.0.0.1:9/v1"):
+    config = FakeConfigManager(
+        {"backend": {"mode": "proxy", "proxy_url": proxy_url}, "tools.enabled": []}
+    )
+    return BatchRunner(config, CHAT_CONFIG, concurrency=2)
+
+
+def _results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"content": "hi", "messages": [{"role": "user"}]},
+        {"content": "hi", "messages": ["not a message"]},
+        {"messages": []},
+        {"_error": "Invalid JSON on line 1"},
+    ],
+)
+def test_malformed_item_becomes_an_error_result(item):
+    runner = _runner()
+
+    async def answer():
+        try:
+            return await runner._answer(3, item)
+        finally:
+            await runner.tools_manager.aclose()
+            await runner.proxy_request.aclose()
+
+    result = asyncio.run(answer())
+
+    assert result["index"] == 3
+    assert result["response"] is None
+    assert result["error"]
+
+
+def _run(input_path, output_path, resume=False):
+    async def run():
+        stub = StubServer(reply="ok")
+        await stub.start()
+        try:
+            runner = _runner(stub.base_url)
+            return await runner.run(str(input_path), str(output_path), resume=resume)
+        finally:
+            await stub.stop()
+
+    return asyncio.run(run())
+
+
+def test_invalid_lines_become_error_results_and_the_run_continues(tmp_path):
+    input_path = tmp_path / "prompts.jsonl"
+    input_path.write_text(
+        '"first"\n'
+        "{not json\n"
+        '{"content": "third", "messages": ["bad"]}\n'
+        "\n"
+        '{"id": "last", "content": "fourth"}\n'
+    )
+    output_path = tmp_path / "results.jsonl"
+
+    summary = _run(input_path, output_path)
+
+    results = _results(output_path)
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["response"] for result in results] == ["ok", None, None, "ok"]
+    assert "line 2" in results[1]["error"]
+    assert results[3]["id"] == "last"
+    assert (summary["completed"], summary["failed"]) == (2, 2)
+
+
+def test_resume_skips_checkpoint_lines_without_an_index(tmp_path):
+    input_path = tmp_path / "prompts.jsonl"
+    input_path.write_text('"first"\n"second"\n')
+    output_path = tmp_path / "results.jsonl"
+    output_path.write_text(
+        '{"index": 0, "id": 0, "response": "ok", "error": null}\n'
+        '{"response": "ok", "error": null}\n'
+        "[1, 2]\n"
+    )
+
+    summary = _run(input_path, output_path, resume=True)
+
+    assert (summary["skipped"], summary["completed"]) == (1, 1)
+    assert [result["index"] for result in _results(output_path)] == [0, 1]
@@ -0,0 +1,17 @@
+from mem.bench.stats import percentile, summarize
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4, 5], 99) == 5
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([7], 50) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_scales_to_milliseconds():
+    summary = summarize([0.001, 0.002, 0.003, 0.004, 0.005])
+    assert summary["count"] == 5
+    assert summary["p50"] == 3.0
+    assert summary["max"] == 5.0
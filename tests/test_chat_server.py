@@ -0,0 +1,58 @@
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from mem.server.chat_server import ChatServer
+from mem.server.session_manager import SessionManager
+
+CHAT_CONFIG = {"api_service": "stub", "model": "stub", "temperature": 0}
+
+
+class FakeConfigManager:
+    def __init__(self, values):
+        self.values = values
+
+    def get_value_from_config(self, key):
+        return self.values.get(key)
+
+
+def _requests(directory, calls):
+    """Runs calls(client, session_manager) against a server storing sessions in directory."""
+
+    async def run():
+        session_manager = SessionManager(
+            FakeConfigManager({"sessions": {"dir": str(directory)}, "tools.enabled": []}),
+            CHAT_CONFIG,
+        )
+        server = ChatServer(session_manager)
+        client = TestClient(TestServer(server.build_app()))
+        await client.start_server()
+        try:
+            return await calls(client, session_manager)
+        finally:
+            await client.close()
+            await session_manager.aclose()
+
+    return asyncio.run(run())
+
+
+def test_unknown_session_is_not_created(tmp_path):
+    async def calls(client, session_manager):
+        got = await client.get("/sessions/unknown/messages")
+        posted = await client.post("/sessions/unknown/messages", json={"content": "hi"})
+        ws = await client.get("/sessions/unknown/ws")
+        return got.status, posted.status, ws.status, dict(session_manager.sessions)
+
+    assert _requests(tmp_path, calls) == (404, 404, 404, {})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_created_session_is_found_after_eviction(tmp_path):
+    async def calls(client, session_manager):
+        created = await client.post("/sessions")
+        session_id = (await created.json())["session_id"]
+        await client.delete(f"/sessions/{session_id}")
+        got = await client.get(f"/sessions/{session_id}/messages")
+        return created.status, got.status, [m["role"] for m in (await got.json())["messages"]]
+
+    assert _requests(tmp_path, calls) == (201, 200, ["system"])
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from mem.llms.request_manager import RequestManager
+from mem.messages.messages_manager import Messages
+from mem.toolkit.tools_manager import ToolsManager
+
+DELAY = 0.3
+CALLS = 4
+
+
+async def _slow_server():
+    async def slow(request):
+        await asyncio.sleep(DELAY)
+        return web.json_response({"n": int(request.query["n"])})
+
+    app = web.Application()
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _run_tool_calls():
+    runner, port = await _slow_server()
+    tools_manager = ToolsManager(enabled_tools=[])
+
+    async def slow_lookup(n):
+        return await tools_manager.http.get_json(f"http://127.0.0.1:{port}/slow?n={n}")
+
+    tools_manager.register_tool("slow_lookup", slow_lookup)
+    messages = Messages()
+    request_manager = RequestManager(messages, tools_manager, None)
+    tool_calls = [
+        {
+            "id": f"call_{n}",
+            "type": "function",
+            "function": {"name": "slow_lookup", "arguments": json.dumps({"n": n})},
+        }
+        for n in range(CALLS)
+    ]
+    try:
+        started = time.perf_counter()
+        results = await request_manager._execute_tool_calls(
+            {"role": "assistant", "content": None, "tool_calls": tool_calls}
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        await tools_manager.aclose()
+        await runner.cleanup()
+    return elapsed, results, messages
+
+
+def test_tool_calls_of_one_turn_run_concurrently():
+    elapsed, results, messages = asyncio.run(_run_tool_calls())
+
+    assert [json.loads(result) for result in results] == [{"n": n} for n in range(CALLS)]
+    assert [message.tool_call_id for message in messages.messages[1:]] == [
+        f"call_{n}" for n in range(CALLS)
+    ]
+    # Sequential calls would take CALLS * DELAY.
+    assert elapsed < 2 * DELAY
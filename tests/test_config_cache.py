@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from mem.config import config_cache
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "snapshots"
+    monkeypatch.setattr(config_cache, "SNAPSHOT_DIR", str(directory))
+    monkeypatch.setattr(config_cache, "_cache", {})
+    return directory
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_snapshot_is_json_and_serves_the_next_process(tmp_path, snapshot_dir):
+    path = _write(tmp_path / "app.toml", '[chat]\nmodel = "m"\n[chat.limits]\nturns = 3\n')
+    config, index = config_cache.load_toml(path, snapshot=True)
+    (snapshot,) = os.listdir(snapshot_dir)
+    assert snapshot.endswith(".json")
+
+    config_cache._cache.clear()
+    original_load = config_cache.tomllib.load
+    config_cache.tomllib.load = None  # Parsing again would fail.
+    try:
+        reloaded, reindexed = config_cache.load_toml(path, snapshot=True)
+    finally:
+        config_cache.tomllib.load = original_load
+
+    assert reloaded == config
+    assert reindexed["chat.limits.turns"] == 3
+    assert reindexed["chat.limits"] is reloaded["chat"]["limits"]
+
+
+def test_unreadable_snapshot_falls_back_to_parsing(tmp_path, snapshot_dir):
+    path = _write(tmp_path / "app.toml", "[chat]\nmodel = 'm'\n")
+    config_cache.load_toml(path, snapshot=True)
+    (snapshot,) = os.listdir(snapshot_dir)
+    (snapshot_dir / snapshot).write_text("not json")
+    config_cache._cache.clear()
+
+    config, index = config_cache.load_toml(path, snapshot=True)
+
+    assert index["chat.model"] == "m"
+
+
+def test_config_with_dates_is_parsed_without_a_snapshot(tmp_path, snapshot_dir):
+    path = _write(tmp_path / "app.toml", "[chat]\nsince = 2024-01-02\n")
+    config, index = config_cache.load_toml(path, snapshot=True)
+
+    assert str(index["chat.since"]) == "2024-01-02"
+    assert not snapshot_dir.exists() or not os.listdir(snapshot_dir)
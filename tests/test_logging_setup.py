@@ -0,0 +1,33 @@
+import logging
+import queue
+
+from mem.utils.logging_setup import DeferredQueueHandler
+
+
+def _enqueue(msg, *args):
+    records = queue.SimpleQueue()
+    handler = DeferredQueueHandler(records)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    handler.emit(record)
+    return records.get_nowait()
+
+
+def test_immutable_arguments_are_left_for_the_listener():
+    record = _enqueue("took %s ms in %s", 12.5, "turn")
+    assert record.args == (12.5, "turn")
+    assert record.getMessage() == "took 12.5 ms in turn"
+
+
+def test_mutable_arguments_are_formatted_at_the_call():
+    items = ["a"]
+    record = _enqueue("items: %s", items)
+    items.append("b")
+    assert record.args is None
+    assert record.getMessage() == "items: ['a']"
+
+
+def test_mapping_arguments_are_formatted_at_the_call():
+    state = {"turns": 1}
+    record = _enqueue("turns: %(turns)s", state)
+    state["turns"] = 2
+    assert record.getMessage() == "turns: 1"
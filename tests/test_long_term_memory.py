@@ -0,0 +1,46 @@
+import asyncio
+
+import numpy as np
+
+from mem.memory.long_term_memory import LongTermMemory
+from mem.memory.vector_store import VectorStore
+from mem.messages.message import Message
+
+
+class ConstantEmbedder:
+    """Embeds every text to the same vector, so any stored chunk matches any query."""
+
+    dim = 4
+
+    async def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        vectors[:, 0] = 1.0
+        return vectors
+
+
+def test_scoped_recall_only_returns_the_sessions_own_chunks(tmp_path):
+    embedder = ConstantEmbedder()
+    shared = LongTermMemory(VectorStore(str(tmp_path), embedder.dim), embedder)
+    alice, bob = shared.scoped("alice"), shared.scoped("bob")
+
+    async def run():
+        await alice.remember([Message("user", "my card number is 1234")])
+        await bob.remember([Message("user", "I like sailing")])
+        return await bob.recall("anything", k=5), await alice.recall("anything", k=5)
+
+    bob_recalled, alice_recalled = asyncio.run(run())
+
+    assert [chunk["text"] for chunk in bob_recalled] == ["user: I like sailing"]
+    assert [chunk["text"] for chunk in alice_recalled] == ["user: my card number is 1234"]
+    assert len(asyncio.run(shared.recall("anything", k=5))) == 2
+
+
+def test_scopes_survive_reopening_the_store(tmp_path):
+    embedder = ConstantEmbedder()
+    memory = LongTermMemory(VectorStore(str(tmp_path), embedder.dim), embedder)
+    asyncio.run(memory.scoped("alice").remember([Message("user", "secret")]))
+
+    reopened = LongTermMemory(VectorStore(str(tmp_path), embedder.dim), embedder)
+
+    assert asyncio.run(reopened.scoped("bob").recall("anything")) == []
+    assert len(asyncio.run(reopened.scoped("alice").recall("anything"))) == 1
@@ -0,0 +1,86 @@
+import asyncio
+
+from mem.messages.context_window import ContextWindow
+from mem.messages.messages_manager import MemoryManager, Messages
+from mem.messages.session_store import SessionStore
+
+CHAT_CONFIG = {"model": "test", "max_tokens": 100}
+
+
+class RecordingMemory:
+    def __init__(self):
+        self.archived = []
+
+    async def remember(self, messages):
+        self.archived.extend(message.content for message in messages)
+
+
+class FixedSummarizer:
+    async def summarize(self, summary, messages):
+        return f"{len(messages)} messages"
+
+
+async def _session(directory, memory, turns, tag="first"):
+    messages = Messages(SessionStore(str(directory), "s"))
+    context_window = ContextWindow(messages, {"token_budget": 200})
+    manager = MemoryManager(
+        messages,
+        context_window=context_window,
+        summarizer=FixedSummarizer(),
+        long_term_memory=memory,
+        debounce=0,
+        batch_size=1,
+    )
+    for turn in range(turns):
+        messages.add_message("user", f"{tag} question {turn} " + "word " * 30)
+        messages.add_message("assistant", f"{tag} answer {turn} " + "word " * 30)
+        context_window.select(CHAT_CONFIG)
+        messages.add_message("user", "next")
+        await manager._task
+        messages.delete_message(len(messages.messages) - 1)
+    await manager.aclose()
+    messages.close()
+    return manager, context_window
+
+
+def test_resumed_session_does_not_archive_messages_again(tmp_path):
+    memory = RecordingMemory()
+    first, _ = asyncio.run(_session(tmp_path, memory, turns=4))
+    archived = list(memory.archived)
+    assert archived and first.summarized_upto
+
+    resumed, context_window = asyncio.run(_session(tmp_path, memory, turns=0))
+
+    assert resumed.summarized_upto == first.summarized_upto
+    assert resumed.summary == first.summary
+    assert context_window.summary == first.summary
+    assert memory.archived == archived
+
+
+def test_resumed_session_archives_only_new_messages(tmp_path):
+    memory = RecordingMemory()
+    asyncio.run(_session(tmp_path, memory, turns=4))
+    asyncio.run(_session(tmp_path, memory, turns=2, tag="second"))
+
+    assert len(memory.archived) == len(set(memory.archived))
+
+
+def test_deleting_a_summarized_message_moves_the_watermark_down(tmp_path):
+    memory = RecordingMemory()
+    first, _ = asyncio.run(_session(tmp_path, memory, turns=4))
+    upto = first.summarized_upto
+    assert upto > 2
+
+    messages = Messages(SessionStore(str(tmp_path), "s"))
+    manager = MemoryManager(messages)
+    following = messages.messages[upto]
+    messages.delete_message(1)
+    messages.delete_message(len(messages.messages) - 1)
+    messages.close()
+
+    assert manager.summarized_upto == upto - 1
+    assert messages.messages[manager.summarized_upto] is following
+    resumed = Messages(SessionStore(str(tmp_path), "s"))
+    assert resumed.saved_summary()[1] == upto - 1
+    assert resumed.messages[upto - 1].content == following.content
+    resumed.close()
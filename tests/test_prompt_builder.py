@@ -0,0 +1,65 @@
+from mem.llms.request_manager import RequestManager
+from mem.messages.messages_manager import Messages
+from mem.messages.prompt_builder import PrefixTracker, PromptBuilder
+
+
+def test_system_prompt_is_static_and_rendered_once():
+    builder = PromptBuilder({"assistant_name": "Ada", "user_name": "Sam"})
+
+    prompt = builder.system_prompt({})
+
+    assert "Ada" in prompt and "Sam" in prompt
+    assert builder.system_prompt({}) is prompt
+    assert builder.system_prompt({"system_prompt": "Talk like a pirate!"}).startswith(
+        "Talk like a pirate!"
+    )
+    assert "tools" not in builder.system_prompt({}, tools=False)
+
+
+def test_session_context_is_rendered_once_per_rounded_time():
+    builder = PromptBuilder({"time_granularity": "day"})
+
+    first, second = builder.session_context(), builder.session_context()
+
+    assert first["role"] == "system"
+    assert first["content"] is second["content"]
+    assert PromptBuilder({"time_granularity": "none"}).session_context() is None
+
+
+def test_prefix_tracker_counts_the_bytes_shared_with_the_previous_request():
+    tracker = PrefixTracker()
+    system = {"role": "system", "content": "static"}
+    user = {"role": "user", "content": "hello"}
+
+    assert tracker.observe([system, user])[0] == 0
+    reused, total = tracker.observe([system, user, {"role": "user", "content": "again"}])
+    assert reused == len(PrefixTracker._encode(system)) + len(PrefixTracker._encode(user))
+    assert total > reused
+
+    changed = {"role": "system", "content": "statics"}
+    reused, _ = tracker.observe([changed, user])
+    assert 0 < reused < len(PrefixTracker._encode(changed))
+
+
+def test_volatile_segments_follow_the_newest_user_message():
+    messages = Messages()
+    messages.add_system_message("static")
+    messages.add_message("user", "first")
+    messages.add_message("assistant", "reply")
+    messages.add_message("user", "second")
+    request_manager = RequestManager(
+        messages, None, None, prompt_builder=PromptBuilder({"time_granularity": "hour"})
+    )
+    recalled = {"role": "system", "content": "recalled"}
+
+    context = request_manager.build_context({}, recalled)
+
+    assert [message["content"] for message in context[:4]] == [
+        "static",
+        "first",
+        "reply",
+        "second",
+    ]
+    assert context[4] is recalled
+    assert context[5]["content"].startswith("The current date/time is")
+    assert request_manager.build_context({})[:4] == context[:4]
@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mem.llms.request_manager import RequestManager
+from mem.messages.messages_manager import Messages
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+    def model_dump(self, exclude_none=False):
+        return {"role": "assistant", "content": self.content}
+
+
+class FakeProxy:
+    """Answers every request with one reply ending in the given finish reason."""
+
+    def __init__(self, content, finish_reason):
+        self.content = content
+        self.finish_reason = finish_reason
+
+    async def llm_request(self, chat_config, messages, use_tools=True):
+        choice = SimpleNamespace(
+            message=FakeMessage(self.content), finish_reason=self.finish_reason
+        )
+        return SimpleNamespace(choices=[choice])
+
+    async def stream_request(self, chat_config, messages, use_tools=True):
+        for index, word in enumerate(self.content.split(" ")):
+            delta = SimpleNamespace(content=word if not index else f" {word}", tool_calls=None)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=delta, finish_reason=None)]
+            )
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=None, finish_reason=self.finish_reason)]
+        )
+
+
+def _request_manager(content, finish_reason):
+    messages = Messages()
+    return messages, RequestManager(messages, None, FakeProxy(content, finish_reason))
+
+
+async def _stream(request_manager):
+    return [delta async for delta in request_manager.stream_request({}, "hi")]
+
+
+def _history(messages):
+    return [(message.role, message.content) for message in messages.messages]
+
+
+def test_truncated_reply_is_kept_and_returned():
+    messages, request_manager = _request_manager("cut off mid", "length")
+    assert asyncio.run(request_manager.make_request({}, "hi")) == "cut off mid"
+    assert _history(messages) == [("user", "hi"), ("assistant", "cut off mid")]
+
+
+def test_truncated_streamed_reply_is_kept():
+    messages, request_manager = _request_manager("cut off mid", "length")
+    assert "".join(asyncio.run(_stream(request_manager))) == "cut off mid"
+    assert _history(messages) == [("user", "hi"), ("assistant", "cut off mid")]
+
+
+def test_filtered_streamed_reply_keeps_shown_text_and_fails():
+    messages, request_manager = _request_manager("partial text", "content_filter")
+    with pytest.raises(ValueError):
+        asyncio.run(_stream(request_manager))
+    assert _history(messages) == [("user", "hi"), ("assistant", "partial text")]
+
+
+def test_filtered_reply_is_an_error_not_an_empty_success():
+    messages, request_manager = _request_manager(None, "content_filter")
+    with pytest.raises(ValueError):
+        asyncio.run(request_manager.make_request({}, "hi"))
+    assert _history(messages) == [("user", "hi")]
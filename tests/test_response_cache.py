@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from mem.bench.stub_server import StubServer
+from mem.llms import response_cache
+from mem.llms.backends import Backends
+from mem.llms.request import ProxyRequest
+from mem.llms.response_cache import ResponseCache, canonical_key
+
+MESSAGES = [
+    {"role": "system", "content": "Be brief."},
+    {"role": "user", "content": "hi"},
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return clock
+
+
+class FakeTools:
+    tools_digest = "digest"
+
+    def __init__(self, tools=None):
+        self.tools = tools
+
+    def available_tools(self):
+        return self.tools
+
+
+def test_canonical_key_ignores_key_order_and_bookkeeping():
+    reordered = [
+        {"content": "Be brief.", "role": "system", "timestamp": 1.0},
+        {"content": "hi", "role": "user", "name": None},
+    ]
+
+    assert canonical_key("a:m", MESSAGES, 0.0) == canonical_key("a:m", reordered, 0.0)
+    assert canonical_key("a:m", MESSAGES, 0.0) != canonical_key("a:m", MESSAGES, 0.5)
+    assert canonical_key("a:m", MESSAGES, 0.0) != canonical_key("b:m", MESSAGES, 0.0)
+    assert canonical_key("a:m", MESSAGES, 0.0) != canonical_key("a:m", MESSAGES, 0.0, "x")
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=10)
+    cache.set("key", "response")
+    assert cache.get("key") == "response"
+
+    clock.now += 10
+
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert [cache.get(key) for key in ("a", "b", "c")] == ["1", None, "3"]
+    assert cache.stats()["entries"] == 2
+    cache.close()
+
+
+def test_hot_requests_bypass_the_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_temperature=0.3)
+
+    assert cache.accepts(0.3) and cache.accepts(None)
+    assert not cache.accepts(0.7)
+    assert cache.bypassed == 1
+    cache.close()
+
+
+def test_cache_key_respects_the_preset_and_the_tool_schema(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_temperature=0.3)
+    proxy_request = ProxyRequest(FakeTools(), Backends(), cache)
+    args = {"model": "m", "messages": MESSAGES, "temperature": 0.0}
+    chat_config = {"api_service": "openai", "model": "m"}
+
+    key = proxy_request._cache_key(chat_config, args)
+
+    assert key == canonical_key("openai:m", MESSAGES, 0.0)
+    assert proxy_request._cache_key(chat_config, {**args, "tools": []}) != key
+    assert proxy_request._cache_key({**chat_config, "response_cache": False}, args) is None
+    assert proxy_request._cache_key(chat_config, {**args, "temperature": 1.0}) is None
+    assert ProxyRequest(FakeTools(), Backends())._cache_key(chat_config, args) is None
+    cache.close()
+
+
+def test_identical_requests_reach_the_model_once(tmp_path):
+    async def run():
+        stub = StubServer(reply="cached")
+        await stub.start()
+        cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+        proxy_request = ProxyRequest(
+            FakeTools(), Backends(proxy_url=stub.base_url), cache
+        )
+        chat_config = {"api_service": "stub", "model": "stub", "temperature": 0}
+        try:
+            replies = [
+                await proxy_request.llm_request(chat_config, MESSAGES),
+                await proxy_request.llm_request(chat_config, MESSAGES),
+                await proxy_request.llm_request(
+                    {**chat_config, "response_cache": False}, MESSAGES
+                ),
+            ]
+        finally:
+            await proxy_request.aclose()
+            await stub.stop()
+        return [reply.choices[0].message.content for reply in replies], stub.requests
+
+    contents, requests = asyncio.run(run())
+
+    assert contents == ["cached"] * 3
+    assert requests == 2
@@ -0,0 +1,22 @@
+from mem.speech.tts.sentence_splitter import SentenceSplitter
+
+
+def test_whitespace_only_input_is_dropped():
+    splitter = SentenceSplitter()
+    assert splitter.feed("\n\n") == []
+    assert splitter.feed("   \n \n") == []
+    assert splitter.flush() is None
+
+
+def test_paragraph_breaks_split_and_keep_streaming():
+    splitter = SentenceSplitter(min_length=5)
+    sentences = splitter.feed("\n\nFirst paragraph here\n\n")
+    sentences += splitter.feed("\n\nSecond one. Third sentence")
+    assert sentences == ["First paragraph here", "Second one."]
+    assert splitter.flush() == "Third sentence"
+
+
+def test_short_sentences_and_abbreviations_are_merged():
+    splitter = SentenceSplitter(min_length=10)
+    sentences = splitter.feed("Hi. I met Dr. Smith today. ")
+    assert sentences == ["Hi. I met Dr. Smith today."]
@@ -0,0 +1,37 @@
+from mem.messages.messages_manager import Messages
+from mem.messages.session_store import SessionStore
+
+
+def _contents(directory, session_id):
+    messages = Messages(SessionStore(str(directory), session_id))
+    contents = [message.content for message in messages.messages]
+    messages.close()
+    return contents
+
+
+def test_resume_after_torn_line_keeps_appended_messages(tmp_path):
+    messages = Messages(SessionStore(str(tmp_path), "s"))
+    messages.add_message("user", "hi")
+    messages.add_message("assistant", "hello")
+    messages.close()
+    with open(tmp_path / "s.jsonl", "a") as f:
+        f.write('{"op": "add", "message": {"role": "us')
+
+    resumed = Messages(SessionStore(str(tmp_path), "s"))
+    assert [message.content for message in resumed.messages] == ["hi", "hello"]
+    resumed.add_message("user", "again")
+    resumed.add_message("assistant", "still here")
+    resumed.close()
+
+    assert _contents(tmp_path, "s") == ["hi", "hello", "again", "still here"]
+
+
+def test_resume_after_record_without_newline(tmp_path):
+    with open(tmp_path / "s.jsonl", "w") as f:
+        f.write('{"op": "add", "message": {"role": "user", "content": "hi"}}')
+
+    resumed = Messages(SessionStore(str(tmp_path), "s"))
+    resumed.add_message("assistant", "hello")
+    resumed.close()
+
+    assert _contents(tmp_path, "s") == ["hi", "hello"]
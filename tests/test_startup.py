@@ -0,0 +1,34 @@
+import os
+
+from mem.config.config_manager import TEMP_CONFIG_ENV
+from mem.utils.startup_profiler import profile_startup
+
+# Generous enough for a loaded CI machine; a regression that imports LiteLLM or Coqui TTS
+# at startup costs seconds. MEM_STARTUP_BUDGET_MS overrides it.
+BUDGET_MS = float(os.environ.get("MEM_STARTUP_BUDGET_MS", 3000))
+HEAVY_MODULES = ("litellm", "TTS", "watchdog")
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def _profile(tmp_path):
+    """Profiles `mem chat --preset text` to its first prompt, without touching the app's files."""
+    paths = [SRC, os.environ.get("PYTHONPATH")]
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(path for path in paths if path),
+        TEMP_CONFIG_ENV: str(tmp_path / "temp_config.toml"),
+        "MEM_CONFIG_SNAPSHOT_DIR": "",
+    }
+    profile = profile_startup(["chat", "--preset", "text"], env=env)
+    assert profile.first_prompt_ms is not None, f"exited with {profile.returncode}"
+    return profile
+
+
+def test_text_chat_reaches_first_prompt_under_budget(tmp_path):
+    # Best of three, so one slow run on a busy machine doesn't fail the build.
+    runs = [_profile(tmp_path) for _ in range(3)]
+    assert min(run.first_prompt_ms for run in runs) < BUDGET_MS
+
+
+def test_text_chat_skips_heavy_modules(tmp_path):
+    assert _profile(tmp_path).loaded(HEAVY_MODULES) == []
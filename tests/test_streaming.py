@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from mem.llms.streaming import StreamAccumulator
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice])
+
+
+def _tool_call(index, id=None, name=None, arguments=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+def test_content_deltas_are_concatenated():
+    accumulator = StreamAccumulator()
+    chunks = [
+        _chunk("Hel"),
+        _chunk("lo"),
+        SimpleNamespace(choices=[]),
+        _chunk(finish_reason="stop"),
+    ]
+
+    deltas = [accumulator.add_chunk(chunk) for chunk in chunks]
+
+    assert deltas == ["Hel", "lo", None, None]
+    assert accumulator.finish_reason == "stop"
+    assert accumulator.to_message() == {"role": "assistant", "content": "Hello"}
+
+
+def test_tool_call_deltas_are_merged_by_index():
+    accumulator = StreamAccumulator()
+    for chunk in (
+        _chunk(tool_calls=[_tool_call(1, id="b", name="weather", arguments="")]),
+        _chunk(tool_calls=[_tool_call(0, id="a", name="location", arguments='{"q"')]),
+        _chunk(tool_calls=[_tool_call(1, arguments='{"city": "Oslo"}')]),
+        _chunk(tool_calls=[_tool_call(0, arguments=': 1}')]),
+        _chunk(finish_reason="tool_calls"),
+    ):
+        accumulator.add_chunk(chunk)
+
+    message = accumulator.to_message()
+
+    assert message["content"] is None
+    assert accumulator.finish_reason == "tool_calls"
+    assert [call["id"] for call in message["tool_calls"]] == ["a", "b"]
+    assert [call["function"] for call in message["tool_calls"]] == [
+        {"name": "location", "arguments": '{"q": 1}'},
+        {"name": "weather", "arguments": '{"city": "Oslo"}'},
+    ]
@@ -0,0 +1,45 @@
+import os
+import time
+
+from mem.toolkit.tool_cache import ToolCache
+
+
+def _files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_disk_tier_is_capped(tmp_path):
+    cache = ToolCache(ttl=60, disk_dir=str(tmp_path), max_disk_entries=3)
+    for n in range(20):
+        cache.set(cache.make_key({"n": n}), n)
+    cache.sweep_disk()
+
+    assert len(_files(tmp_path)) == 3
+
+
+def test_expired_entries_and_stale_temp_files_are_swept(tmp_path):
+    cache = ToolCache(ttl=60, disk_dir=str(tmp_path))
+    cache.set(cache.make_key({"n": 1}), 1)
+    cache.set(cache.make_key({"n": 2}), 2)
+    stale = tmp_path / "leftover.tmp"
+    stale.write_text("{")
+    old = time.time() - 120
+    first = tmp_path / _files(tmp_path)[0]
+    for path in (first, stale):
+        os.utime(path, (old, old))
+
+    ToolCache(ttl=60, disk_dir=str(tmp_path))
+
+    assert len(_files(tmp_path)) == 1
+    assert not stale.exists() and not first.exists()
+
+
+def test_writes_leave_no_temp_files(tmp_path):
+    cache = ToolCache(ttl=60, disk_dir=str(tmp_path))
+    key = cache.make_key({"city": "Oslo"})
+    cache.set(key, {"temp": 3})
+    cache.set(key, {"temp": 4})
+    cache.clear()
+
+    assert [name for name in _files(tmp_path) if name.endswith(".tmp")] == []
+    assert cache.get(key) == (True, {"temp": 4})
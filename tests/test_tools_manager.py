@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from mem.toolkit.tools_manager import ToolsManager
+
+
+async def echo(text: str):
+    return text
+
+
+def _tools_manager():
+    tools_manager = ToolsManager(enabled_tools=[])
+    tools_manager.register_tool(
+        "echo",
+        echo,
+        {"description": "Echo", "parameters": {"text": {"type": "string"}}, "required": ["text"]},
+    )
+    return tools_manager
+
+
+def test_schema_payload_is_shared_and_read_only():
+    tools_manager = _tools_manager()
+    payload = tools_manager.available_tools()
+
+    assert tools_manager.available_tools() is payload
+    with pytest.raises(TypeError):
+        payload[0]["function"]["name"] = "changed"
+    with pytest.raises(TypeError):
+        payload[0]["function"]["parameters"]["properties"].pop("text")
+    with pytest.raises(AttributeError):
+        payload[0]["function"]["parameters"]["required"].append("extra")
+    assert json.loads(json.dumps(payload))[0]["function"]["name"] == "echo"
+
+
+def test_registering_a_tool_rebuilds_the_payload():
+    tools_manager = _tools_manager()
+    digest = tools_manager.tools_digest
+    tools_manager.register_tool("echo_again", echo, {"description": "Echo again"})
+
+    assert len(tools_manager.available_tools()) == 2
+    assert tools_manager.tools_digest != digest